@@ -0,0 +1,4 @@
+from .generators import generate, synthetic_schema
+from .runner import TRANSFORM_CASES, Measure, compare, run
+
+__all__ = ["TRANSFORM_CASES", "Measure", "compare", "generate", "run", "synthetic_schema"]
@@ -0,0 +1,50 @@
+import argparse
+import json
+from pathlib import Path
+
+from .runner import compare, run
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark magicparse.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and print their results as JSON")
+    run_parser.add_argument("--rows", type=int, default=100_000, help="rows of the generated files")
+    run_parser.add_argument("--width", type=int, default=10, help="fields of the generated schemas")
+    run_parser.add_argument("--error-ratio", type=float, default=0.0, help="share of rows holding an invalid value")
+    run_parser.add_argument("--encoding", default="utf-8", help="encoding of the generated files")
+    run_parser.add_argument("--seed", type=int, default=0, help="seed of the generated values")
+    run_parser.add_argument("--calls", type=int, default=100_000, help="applications of each transform")
+    run_parser.add_argument("--repeat", type=int, default=3, help="runs of each benchmark, the best one is kept")
+    run_parser.add_argument("--output", help="file to write to, stdout by default")
+
+    compare_parser = commands.add_parser("compare", help="compare the throughput of two results")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        results = run(
+            rows=args.rows,
+            width=args.width,
+            error_ratio=args.error_ratio,
+            encoding=args.encoding,
+            seed=args.seed,
+            calls=args.calls,
+            repeat=args.repeat,
+        )
+        output = json.dumps(results, indent=2)
+        if args.output:
+            Path(args.output).write_text(output + "\n")
+        else:
+            print(output)
+    else:
+        for result in compare(json.loads(args.baseline.read_text()), json.loads(args.current.read_text())):
+            print(
+                f"{result['name']:<40} {result['baseline']:>14,.0f} {result['current']:>14,.0f} {result['ratio']:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
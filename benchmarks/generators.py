@@ -0,0 +1,157 @@
+import random
+import string
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+type ValueGenerator = Callable[[random.Random], str]
+
+EPOCH = datetime(2024, 1, 1, tzinfo=UTC)
+INVALID_VALUE = "#invalid"
+"""Value no built-in type but `str` accepts."""
+
+SYNTHETIC_TYPES = ("str", "int", "decimal", "datetime")
+COLUMN_LENGTHS = {"str": 12, "int": 7, "decimal": 10, "datetime": 25, "time": 14}
+
+
+def random_text(generator: random.Random) -> str:
+    return "".join(generator.choices(string.ascii_uppercase, k=generator.randint(4, 12)))
+
+
+def random_int(generator: random.Random) -> str:
+    return str(generator.randint(1, 999_999))
+
+
+def random_decimal(generator: random.Random) -> str:
+    return f"{generator.randint(1, 99_999)}.{generator.randint(0, 99):02d}"
+
+
+def random_datetime(generator: random.Random) -> str:
+    return (EPOCH + timedelta(seconds=generator.randint(0, 365 * 24 * 3600))).isoformat()
+
+
+def random_time(generator: random.Random) -> str:
+    return f"{generator.randint(0, 23):02d}:{generator.randint(0, 59):02d}:00+00:00"
+
+
+VALUE_GENERATORS: dict[str, ValueGenerator] = {
+    "str": random_text,
+    "int": random_int,
+    "decimal": random_decimal,
+    "datetime": random_datetime,
+    "time": random_time,
+}
+
+
+def synthetic_schema(file_type: str = "csv", width: int = 10, **options: Any) -> dict[str, Any]:
+    """Return the options of a schema of `width` fields cycling through the common types."""
+    if file_type not in ("csv", "columnar"):
+        raise ValueError(f"no synthetic schema for file type '{file_type}'")
+    if width <= 0:
+        raise ValueError("'width' must be a positive integer")
+
+    fields = list[dict[str, Any]]()
+    column_start = 0
+    for position in range(width):
+        type = SYNTHETIC_TYPES[position % len(SYNTHETIC_TYPES)]
+        field: dict[str, Any] = {"key": f"{type}_{position}", "type": type}
+        if file_type == "csv":
+            field["column-number"] = position + 1
+        else:
+            field["column-start"] = column_start
+            field["column-length"] = COLUMN_LENGTHS[type]
+            column_start += COLUMN_LENGTHS[type]
+        fields.append(field)
+
+    return {"file_type": file_type, "fields": fields} | options
+
+
+def generate(
+    schema_options: dict[str, Any],
+    rows: int,
+    error_ratio: float = 0.0,
+    seed: int = 0,
+    value_generators: dict[str, ValueGenerator] | None = None,
+) -> bytes:
+    """Generate a file of `rows` records matching a CSV or columnar schema.
+
+    The same arguments always give the same bytes. A share `error_ratio` of
+    the records holds an invalid value in one of its non `str` fields. Values
+    of a field are drawn from `value_generators[key]` when given, otherwise
+    from its type.
+    """
+    if not 0 <= error_ratio <= 1:
+        raise ValueError("'error_ratio' must be between 0 and 1")
+
+    generator = random.Random(seed)
+    fields = [_FieldSpec(options, value_generators or {}) for options in schema_options["fields"]]
+    breakable = [field for field in fields if field.type != "str"]
+    if error_ratio and not breakable:
+        raise ValueError("'error_ratio' requires a field with a type other than 'str'")
+
+    file_type = schema_options["file_type"]
+    if file_type == "csv":
+        write_record = _csv_writer(schema_options, fields)
+    elif file_type == "columnar":
+        write_record = _columnar_writer(fields)
+    else:
+        raise ValueError(f"cannot generate records of file type '{file_type}'")
+
+    lines = list[str]()
+    if schema_options.get("has_header", False) and file_type == "csv":
+        lines.append(write_record({field.key: field.header for field in fields}))
+    for _ in range(rows):
+        values = {field.key: field.generate(generator) for field in fields}
+        if error_ratio and generator.random() < error_ratio:
+            values[generator.choice(breakable).key] = INVALID_VALUE
+        lines.append(write_record(values))
+
+    return "".join(line + "\n" for line in lines).encode(schema_options.get("encoding", "utf-8"))
+
+
+class _FieldSpec:
+    def __init__(self, options: dict[str, Any], value_generators: dict[str, ValueGenerator]) -> None:
+        self.key: str = options["key"]
+        type = options.get("type", "str")
+        self.type: str = type if isinstance(type, str) else type["key"]
+        self.header: str = options.get("column-name") or self.key
+        self.column_number: int | None = options.get("column-number")
+        self.column_start: int | None = options.get("column-start")
+        self.column_length: int | None = options.get("column-length")
+        generate = value_generators.get(self.key) or VALUE_GENERATORS.get(self.type)
+        if generate is None:
+            raise ValueError(f"no value generator for field '{self.key}' of type '{self.type}'")
+        self.generate = generate
+
+
+def _csv_writer(schema_options: dict[str, Any], fields: list[_FieldSpec]) -> Callable[[dict[str, str]], str]:
+    delimiter = schema_options.get("delimiter", ",")
+    numbered = [field for field in fields if field.column_number]
+    width = max((field.column_number or 0 for field in numbered), default=0)
+    # Fields given by name are written after the numbered columns.
+    named = [field for field in fields if not field.column_number]
+    positions = {field.key: (field.column_number or 0) - 1 for field in numbered}
+    positions |= {field.key: width + position for position, field in enumerate(named)}
+    width += len(named)
+
+    def write(values: dict[str, str]) -> str:
+        columns = [""] * width
+        for key, value in values.items():
+            columns[positions[key]] = value
+        return delimiter.join(columns)
+
+    return write
+
+
+def _columnar_writer(fields: list[_FieldSpec]) -> Callable[[dict[str, str]], str]:
+    spans = {field.key: (field.column_start or 0, field.column_length or 0) for field in fields}
+    width = max((start + length for start, length in spans.values()), default=0)
+
+    def write(values: dict[str, str]) -> str:
+        record = [" "] * width
+        for key, value in values.items():
+            start, length = spans[key]
+            record[start : start + length] = value[:length].ljust(length)
+        return "".join(record)
+
+    return write
@@ -0,0 +1,280 @@
+import gc
+import platform
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from importlib import metadata
+from statistics import quantiles
+from typing import Any
+
+from magicparse import Schema, Transform
+from magicparse.builders import Builder
+from magicparse.post_processors import PostProcessor
+from magicparse.pre_processors import PreProcessor
+from magicparse.transform import ParsingTransform
+from magicparse.type_converters import TypeConverter
+from magicparse.validators import Validator
+
+from .generators import generate, synthetic_schema
+
+
+@dataclass(frozen=True, slots=True)
+class Measure:
+    """Throughput of one benchmark, from its best run out of several."""
+
+    name: str
+    rows: int
+    seconds: float
+    rows_per_second: float
+    latency_p50_us: float
+    latency_p99_us: float
+    bytes: int | None = None
+    bytes_per_second: float | None = None
+    peak_memory: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TransformCase:
+    kind: str
+    name: str
+    build: Callable[[], ParsingTransform | Transform]
+    value: Any
+
+    def apply(self) -> Callable[[Any], Any]:
+        transform = self.build()
+        if isinstance(transform, Transform):
+            return transform.evaluate
+        return transform.apply
+
+
+# One case for every built-in transform, applied to a valid value.
+TRANSFORM_CASES = [
+    TransformCase(
+        "pre-processor", "left-pad-zeroes", lambda: PreProcessor.build(_named("left-pad-zeroes", width=10)), "123"
+    ),
+    TransformCase(
+        "pre-processor", "left-strip", lambda: PreProcessor.build(_named("left-strip", characters="0")), "00012"
+    ),
+    TransformCase("pre-processor", "map", lambda: PreProcessor.build(_named("map", values={"A": "1", "B": "2"})), "A"),
+    TransformCase(
+        "pre-processor",
+        "regex-extract",
+        lambda: PreProcessor.build(_named("regex-extract", pattern="^x(?P<value>[0-9]+)$")),
+        "x123",
+    ),
+    TransformCase(
+        "pre-processor", "replace", lambda: PreProcessor.build(_named("replace", pattern=",", replacement=".")), "1,5"
+    ),
+    TransformCase(
+        "pre-processor", "strip-whitespaces", lambda: PreProcessor.build(_named("strip-whitespaces")), " abc "
+    ),
+    TransformCase("type-converter", "str", lambda: TypeConverter.build({"type": "str"}), "abc"),
+    TransformCase("type-converter", "int", lambda: TypeConverter.build({"type": "int"}), "12345"),
+    TransformCase("type-converter", "decimal", lambda: TypeConverter.build({"type": "decimal"}), "1234.56"),
+    TransformCase(
+        "type-converter", "datetime", lambda: TypeConverter.build({"type": "datetime"}), "2024-03-01T10:12:03+00:00"
+    ),
+    TransformCase("type-converter", "time", lambda: TypeConverter.build({"type": "time"}), "10:12:03+00:00"),
+    TransformCase(
+        "validator", "greater-than", lambda: Validator.build(_named("greater-than", threshold=0)), Decimal("1.5")
+    ),
+    TransformCase("validator", "not-null-or-empty", lambda: Validator.build(_named("not-null-or-empty")), "abc"),
+    TransformCase(
+        "validator", "regex-matches", lambda: Validator.build(_named("regex-matches", pattern="^[A-Z]+$")), "ABC"
+    ),
+    TransformCase(
+        "post-processor", "divide", lambda: PostProcessor.build(_named("divide", denominator=100)), Decimal("1250")
+    ),
+    TransformCase(
+        "post-processor", "round", lambda: PostProcessor.build(_named("round", precision=2)), Decimal("1.23456")
+    ),
+    TransformCase(
+        "builder", "coalesce", lambda: Builder.build(_named("coalesce", fields=["a", "b"])), {"a": None, "b": "x"}
+    ),
+    TransformCase(
+        "builder", "concat", lambda: Builder.build(_named("concat", fields=["a", "b"])), {"a": "x", "b": "y"}
+    ),
+    TransformCase(
+        "builder",
+        "divide",
+        lambda: Builder.build(_named("divide", numerator="a", denominator="b")),
+        {"a": Decimal(3), "b": Decimal(2)},
+    ),
+    TransformCase(
+        "builder",
+        "multiply",
+        lambda: Builder.build(_named("multiply", x_factor="a", y_factor="b")),
+        {"a": Decimal(3), "b": Decimal(2)},
+    ),
+    TransformCase("jsonata", "arithmetic", lambda: Transform("price * quantity"), {"price": 2.5, "quantity": 4}),
+    TransformCase("jsonata", "to_decimal", lambda: Transform("$to_decimal(price)"), {"price": "12,5"}),
+]
+
+
+def _named(name: str, **parameters: Any) -> dict[str, Any]:
+    return {"name": name, "parameters": parameters} if parameters else {"name": name}
+
+
+def _best_time(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(function: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _latencies(rows: Iterable[Any]) -> tuple[float, float]:
+    """Return the median and 99th percentile of the time taken to yield each row, in microseconds."""
+    latencies = list[int]()
+    last = time.perf_counter_ns()
+    for _ in rows:
+        now = time.perf_counter_ns()
+        latencies.append(now - last)
+        last = now
+    if len(latencies) < 2:
+        latency = latencies[0] / 1000 if latencies else 0.0
+        return latency, latency
+    percentiles = quantiles(latencies, n=100)
+    return percentiles[49] / 1000, percentiles[98] / 1000
+
+
+def measure_parse(name: str, schema_options: dict[str, Any], data: bytes, rows: int, repeat: int = 3) -> Measure:
+    """Measure `Schema.parse`, and `Schema.stream_parse` for the per-row latency."""
+    schema = Schema.build(schema_options)
+    seconds = _best_time(lambda: schema.parse(data), repeat)
+    p50, p99 = _latencies(schema.stream_parse(data))
+    return Measure(
+        name=name,
+        rows=rows,
+        seconds=seconds,
+        rows_per_second=rows / seconds,
+        latency_p50_us=p50,
+        latency_p99_us=p99,
+        bytes=len(data),
+        bytes_per_second=len(data) / seconds,
+        peak_memory=_peak_memory(lambda: schema.parse(data)),
+    )
+
+
+def measure_stream_parse(name: str, schema_options: dict[str, Any], data: bytes, rows: int, repeat: int = 3) -> Measure:
+    """Measure consuming `Schema.stream_parse` without keeping its rows."""
+    schema = Schema.build(schema_options)
+
+    def consume() -> None:
+        for _ in schema.stream_parse(data):
+            pass
+
+    seconds = _best_time(consume, repeat)
+    p50, p99 = _latencies(schema.stream_parse(data))
+    return Measure(
+        name=name,
+        rows=rows,
+        seconds=seconds,
+        rows_per_second=rows / seconds,
+        latency_p50_us=p50,
+        latency_p99_us=p99,
+        bytes=len(data),
+        bytes_per_second=len(data) / seconds,
+        peak_memory=_peak_memory(consume),
+    )
+
+
+def measure_transform(case: TransformCase, calls: int, repeat: int = 3) -> Measure:
+    """Measure `calls` applications of a transform to its sample value."""
+    apply = case.apply()
+    values = [case.value] * calls
+
+    def run() -> None:
+        for value in values:
+            apply(value)
+
+    seconds = _best_time(run, repeat)
+    latency = seconds / calls * 1_000_000
+    return Measure(
+        name=f"{case.kind}/{case.name}",
+        rows=calls,
+        seconds=seconds,
+        rows_per_second=calls / seconds,
+        latency_p50_us=latency,
+        latency_p99_us=latency,
+    )
+
+
+def run(
+    rows: int = 100_000,
+    width: int = 10,
+    error_ratio: float = 0.0,
+    encoding: str = "utf-8",
+    seed: int = 0,
+    calls: int = 100_000,
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Run the whole suite and return its results, ready to be dumped as JSON."""
+    results = list[Measure]()
+    for file_type in ("csv", "columnar"):
+        schema_options = synthetic_schema(file_type, width, encoding=encoding)
+        data = generate(schema_options, rows, error_ratio, seed)
+        for compiled in (False, True):
+            options = schema_options | {"compile": compiled}
+            suffix = "/compiled" if compiled else ""
+            results.append(measure_parse(f"parse/{file_type}{suffix}", options, data, rows, repeat))
+            results.append(measure_stream_parse(f"stream_parse/{file_type}{suffix}", options, data, rows, repeat))
+
+    for case in TRANSFORM_CASES:
+        results.append(measure_transform(case, calls, repeat))
+
+    return {
+        "metadata": {
+            "magicparse": _version(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "rows": rows,
+            "width": width,
+            "error_ratio": error_ratio,
+            "encoding": encoding,
+            "seed": seed,
+            "calls": calls,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return the throughput ratio of each benchmark found in both results, above 1 when faster."""
+    previous = {result["name"]: result for result in baseline["results"]}
+    comparison = list[dict[str, Any]]()
+    for result in current["results"]:
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+        comparison.append(
+            {
+                "name": result["name"],
+                "baseline": before["rows_per_second"],
+                "current": result["rows_per_second"],
+                "ratio": result["rows_per_second"] / before["rows_per_second"],
+            }
+        )
+    return comparison
+
+
+def _version() -> str:
+    try:
+        return metadata.version("magicparse")
+    except metadata.PackageNotFoundError:
+        return "unknown"
@@ -1,7 +1,9 @@
-from collections.abc import Iterable, Sequence
-from io import BytesIO
+from collections.abc import Iterable, Iterator, Sequence
+from os import PathLike
 
 from .schema import (
+    DEFAULT_ARRAY_BATCH_SIZE,
+    DEFAULT_CHUNK_SIZE,
     RowParsed,
     RowFailed,
     RowSkipped,
@@ -14,36 +16,150 @@ from .builders import (
     Builder,
     builtins as builtins_composite_processors,
 )
-from .transform import ParsingTransform, Transform, TransformError
+from .cache import CacheInfo, SchemaCache
+from .profiling import Profiler
+from .index import RowIndex
+from .records import Checkpoint
+from .sinks import CsvSink, NdjsonSink, ParquetSink, Sink, WrittenRows
+from .streams import Source
+from .transform import Failure, ParsingTransform, Transform, TransformError
 from .type_converters import TypeConverter, builtins as builtins_type_converters
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from .validators import Validator, builtins as builtins_validators
 
+if TYPE_CHECKING:
+    from .arrays import ColumnBatch
+    from .arrow import RejectedHandler
+
 
 __all__ = [
+    "CacheInfo",
+    "Checkpoint",
+    "convert",
+    "CsvSink",
+    "Failure",
+    "NdjsonSink",
+    "ParquetSink",
+    "SchemaCache",
+    "schema_cache",
     "TypeConverter",
     "parse",
     "stream_parse",
+    "stream_parse_arrays",
+    "stream_parse_batches",
+    "write_parquet",
+    "parallel_parse",
     "PostProcessor",
     "PreProcessor",
+    "Profiler",
     "Schema",
+    "Sink",
+    "Source",
     "RowParsed",
     "RowSkipped",
     "RowFailed",
+    "RowIndex",
     "Transform",
     "TransformError",
     "Validator",
+    "WrittenRows",
 ]
 
 
-def parse(data: bytes | BytesIO, schema_options: dict[str, Any]) -> list[RowParsed | RowSkipped | RowFailed]:
-    schema_definition = Schema.build(schema_options)
-    return schema_definition.parse(data)
+schema_cache = SchemaCache()
+
+
+def parse(
+    data: Source,
+    schema_options: dict[str, Any],
+    profiler: Profiler | None = None,
+    select: Sequence[str] | None = None,
+    start_row: int | None = None,
+    stop_row: int | None = None,
+    limit: int | None = None,
+) -> list[RowParsed | RowSkipped | RowFailed]:
+    schema_definition = schema_cache.get(schema_options)
+    return schema_definition.parse(data, profiler, select, start_row, stop_row, limit)
+
+
+def stream_parse(
+    data: Source,
+    schema_options: dict[str, Any],
+    resume_from: Checkpoint | None = None,
+    with_offsets: bool = False,
+    profiler: Profiler | None = None,
+    select: Sequence[str] | None = None,
+    start_row: int | None = None,
+    stop_row: int | None = None,
+    limit: int | None = None,
+    index: RowIndex | None = None,
+) -> Iterable[RowParsed | RowSkipped | RowFailed]:
+    schema_definition = schema_cache.get(schema_options)
+    return schema_definition.stream_parse(
+        data, resume_from, with_offsets, profiler, select, start_row, stop_row, limit, index
+    )
+
+
+def stream_parse_arrays(
+    data: Source,
+    schema_options: dict[str, Any],
+    batch_size: int = DEFAULT_ARRAY_BATCH_SIZE,
+    select: Sequence[str] | None = None,
+    exact_decimals: bool = False,
+) -> Iterator["ColumnBatch"]:
+    schema_definition = schema_cache.get(schema_options)
+    return schema_definition.stream_parse_arrays(data, batch_size, select, exact_decimals)
 
 
-def stream_parse(data: bytes | BytesIO, schema_options: dict[str, Any]) -> Iterable[RowParsed | RowSkipped | RowFailed]:
-    schema_definition = Schema.build(schema_options)
-    return schema_definition.stream_parse(data)
+def stream_parse_batches(
+    data: Source,
+    schema_options: dict[str, Any],
+    batch_size: int = DEFAULT_ARRAY_BATCH_SIZE,
+    on_rejected: "RejectedHandler | None" = None,
+    select: Sequence[str] | None = None,
+    types: dict[str, Any] | None = None,
+    timezone: str = "UTC",
+) -> Iterator[Any]:
+    schema_definition = schema_cache.get(schema_options)
+    return schema_definition.stream_parse_batches(data, batch_size, on_rejected, select, types, timezone)
+
+
+def write_parquet(
+    data: Source,
+    schema_options: dict[str, Any],
+    path: str | PathLike[str],
+    batch_size: int = DEFAULT_ARRAY_BATCH_SIZE,
+    on_rejected: "RejectedHandler | None" = None,
+    select: Sequence[str] | None = None,
+    types: dict[str, Any] | None = None,
+    timezone: str = "UTC",
+    **options: Any,
+) -> int:
+    schema_definition = schema_cache.get(schema_options)
+    return schema_definition.write_parquet(data, path, batch_size, on_rejected, select, types, timezone, **options)
+
+
+def convert(
+    data: Source,
+    schema_options: dict[str, Any],
+    parsed: Sink | None = None,
+    failed: Sink | None = None,
+    skipped: Sink | None = None,
+    select: Sequence[str] | None = None,
+) -> WrittenRows:
+    schema_definition = schema_cache.get(schema_options)
+    return schema_definition.convert(data, parsed, failed, skipped, select)
+
+
+def parallel_parse(
+    data: Source,
+    schema_options: dict[str, Any],
+    parallel: int | None = None,
+    ordered: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[RowParsed | RowSkipped | RowFailed]:
+    schema_definition = schema_cache.get(schema_options)
+    return schema_definition.parallel_parse(data, parallel, ordered, chunk_size)
 
 
 Registrable = type[Schema] | type[ParsingTransform]
@@ -69,6 +185,9 @@ def register(items: Registrable | Sequence[Registrable]) -> None:
         else:
             raise ValueError("transforms must be a subclass of Transform (or a list of it)")
 
+    # Cached schemas hold instances of the previously registered classes.
+    schema_cache.invalidate()
+
 
 register(builtins_schemas)
 register(builtins_pre_processors)
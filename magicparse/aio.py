@@ -0,0 +1,66 @@
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator
+from concurrent.futures import Executor
+
+from .records import RecordBuffer
+from .rows import RowFailed, RowParsed, RowSkipped
+from .schema import Schema
+
+type Row = RowParsed | RowSkipped | RowFailed
+type AsyncSource = AsyncIterable[bytes] | asyncio.StreamReader
+
+
+async def iter_source(source: AsyncSource, read_size: int) -> AsyncIterator[bytes]:
+    if isinstance(source, asyncio.StreamReader):
+        while chunk := await source.read(read_size):
+            yield chunk
+        return
+
+    async for chunk in source:
+        yield chunk
+
+
+async def astream_parse(
+    schema: Schema, source: AsyncSource, batch_size: int, executor: Executor | None, read_size: int
+) -> AsyncIterator[Row]:
+    if batch_size <= 0:
+        raise ValueError("'batch_size' must be a positive integer")
+
+    loop = asyncio.get_running_loop()
+    buffer = RecordBuffer(schema.record_splitter(), schema.has_header)
+    bound = None if schema.has_header else schema
+    batch = list[bytes]()
+    batch_row_number = 0
+    batch_records = 0
+
+    async def parse_batch() -> list[Row]:
+        nonlocal batch, batch_records, bound
+        if bound is None:
+            bound = schema.bind(schema.read_record(buffer.header or b""))
+        chunk = b"".join(batch)
+        batch = []
+        batch_records = 0
+        return await loop.run_in_executor(executor, bound.parse_chunk, chunk, batch_row_number)
+
+    # The source is only read again once the current batch is parsed and its
+    # rows consumed, so a slow consumer slows the reading down.
+    async for chunk in iter_source(source, read_size):
+        records, row_number, count = buffer.push(chunk)
+        if not count:
+            continue
+        if not batch:
+            batch_row_number = row_number
+        batch.append(records)
+        batch_records += count
+        if batch_records >= batch_size:
+            for row in await parse_batch():
+                yield row
+
+    records, row_number, count = buffer.flush()
+    if count:
+        if not batch:
+            batch_row_number = row_number
+        batch.append(records)
+    if batch:
+        for row in await parse_batch():
+            yield row
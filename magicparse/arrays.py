@@ -0,0 +1,361 @@
+"""Column-oriented parsing of rows into NumPy arrays."""
+
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any
+
+try:
+    import numpy as np
+    from numpy.typing import NDArray
+except ImportError as error:  # pragma: no cover
+    raise ImportError("column batches require numpy, install magicparse with the 'numpy' extra") from error
+
+from .fields import ColumnarField, CsvField, Field, IndexedField
+from .post_processors import Divide, Round
+from .rows import PendingFailure, RowFailed, RowParsed, RowSkipped
+from .schema import DEFAULT_ARRAY_BATCH_SIZE, Schema
+from .transform import Failure, Ok, OnError, ParsingTransform, SkipRow
+from .type_converters import DecimalConverter, IntConverter, StrConverter
+from .validators import GreaterThan
+
+MAX_DIGITS = 18
+"""Most digits of a number the kernel converts, so that it fits an int64."""
+
+_POW10 = 10 ** np.arange(MAX_DIGITS + 1, dtype=np.int64)
+_FLOAT_POW10 = _POW10.astype(np.float64)
+_INT64_LIMIT = 2**63
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnBatch:
+    """A batch of rows: one array per field for the parsed rows, and the rows which could not be parsed.
+
+    `row_numbers[i]` is the row number of the `i`-th value of every column.
+    Numeric columns are `int64` or `float64` arrays, the others `object` arrays, as are
+    integer columns holding values beyond the `int64` range.
+    """
+
+    row_numbers: NDArray[np.int64]
+    columns: dict[str, NDArray[Any]]
+    rejected: list[RowSkipped | RowFailed]
+
+    def __len__(self) -> int:
+        return len(self.row_numbers)
+
+
+def parse_arrays(
+    schema: Schema,
+    reader: Iterator[Any],
+    row_number: int = 0,
+    batch_size: int = DEFAULT_ARRAY_BATCH_SIZE,
+    exact_decimals: bool = False,
+) -> Iterator[ColumnBatch]:
+    """Process the rows of `reader` by batches of `batch_size`, numbering them from `row_number + 1`.
+
+    With `exact_decimals`, `decimal` fields are parsed value by value into `Decimal`s.
+    """
+    if batch_size <= 0:
+        raise ValueError("'batch_size' must be a positive integer")
+
+    processor = _BatchProcessor(schema, exact_decimals)
+    rows = list[Any]()
+    row_numbers = list[int]()
+    for row in reader:
+        row_number += 1
+        if not any(row):
+            continue
+
+        rows.append(row)
+        row_numbers.append(row_number)
+        if len(rows) == batch_size:
+            yield processor.process(rows, row_numbers)
+            rows = []
+            row_numbers = []
+
+    if rows:
+        yield processor.process(rows, row_numbers)
+
+
+class _Failures:
+    """Failures of the rows of a batch, by position in the batch."""
+
+    def __init__(self) -> None:
+        self.by_row = dict[int, list[PendingFailure]]()
+        self.skipped = set[int]()
+
+    def add(self, index: int, field: Field, reason: Failure | Exception, skip: bool = False) -> None:
+        self.by_row.setdefault(index, []).append((field, reason))
+        if skip:
+            self.skipped.add(index)
+
+    def add_result(self, index: int, field: Field, result: Any) -> Any:
+        """Record the failure of `result`, a `Field` check result, and return its value (`None` on failure)."""
+        if result.__class__ is Ok:
+            return result.value
+        if result.__class__ is SkipRow:
+            self.add(index, field, result.exception, skip=True)
+        else:
+            self.add(index, field, result)
+        return None
+
+
+class _BatchProcessor:
+    def __init__(self, schema: Schema, exact_decimals: bool = False) -> None:
+        self.schema = schema
+        self.fields = list(schema.row_fields)
+        self.numeric = {
+            id(field): _NumericField(field) for field in self.fields if _NumericField.supports(field, exact_decimals)
+        }
+
+    def process(self, rows: list[Any], row_numbers: list[int]) -> ColumnBatch:
+        failures = _Failures()
+        columns = dict[str, NDArray[Any]]()
+        for field in self.fields:
+            raw_values = _raw_values(field, rows, failures)
+            numeric = self.numeric.get(id(field))
+            if numeric is not None:
+                columns[field.key] = numeric.process(raw_values, failures)
+            else:
+                columns[field.key] = _process_scalars(field, raw_values, failures)
+
+        rejected: list[RowSkipped | RowFailed] = [
+            (RowSkipped if index in failures.skipped else RowFailed).from_failures(row_numbers[index], reasons)
+            for index, reasons in failures.by_row.items()
+        ]
+        keep = np.ones(len(rows), dtype=np.bool_)
+        keep[list(failures.by_row)] = False
+        if self.schema.computed_fields:
+            rejected += self.process_computed_fields(columns, row_numbers, keep)
+
+        rejected.sort(key=lambda row: row.row_number)
+        for key in self.schema.hidden_keys:
+            del columns[key]
+        return ColumnBatch(
+            row_numbers=np.array(row_numbers, dtype=np.int64)[keep],
+            columns={key: column[keep] for key, column in columns.items()},
+            rejected=rejected,
+        )
+
+    def process_computed_fields(
+        self, columns: dict[str, NDArray[Any]], row_numbers: list[int], keep: NDArray[np.bool_]
+    ) -> list[RowSkipped | RowFailed]:
+        """Compute the computed fields of the rows to keep, row by row, and add their columns to `columns`."""
+        schema = self.schema
+        keys = list(columns)
+        values_by_key = [columns[key].tolist() for key in keys]
+        computed = {field.key: np.full(len(row_numbers), None, dtype=object) for field in schema.computed_fields}
+        rejected = list[RowSkipped | RowFailed]()
+        for index in np.flatnonzero(keep).tolist():
+            values = {key: values[index] for key, values in zip(keys, values_by_key)}
+            row = schema.process_fields(schema.computed_fields, values, row_numbers[index], values)
+            if isinstance(row, RowParsed):
+                for key, column in computed.items():
+                    column[index] = values[key]
+            else:
+                rejected.append(row)
+                keep[index] = False
+
+        columns.update(computed)
+        return rejected
+
+
+def _raw_values(field: Field, rows: list[Any], failures: _Failures) -> list[Any]:
+    if type(field) is ColumnarField:
+        start, end = field.column_start, field.column_end
+        return [row[start:end] for row in rows]
+    if type(field) is IndexedField:
+        get = itemgetter(field.index)
+    elif type(field) is CsvField and field.column_number is not None:
+        get = itemgetter(field.column_number - 1)
+    else:
+        get = field._read_raw_value  # pyright: ignore[reportPrivateUsage]
+
+    try:
+        return list(map(get, rows))
+    except Exception:
+        pass
+
+    # Some rows cannot be read, such as CSV rows missing the field's column.
+    raw_values = list[Any]()
+    for index, row in enumerate(rows):
+        try:
+            raw_values.append(get(row))
+        except Exception as exc:
+            failures.add(index, field, exc)
+            raw_values.append(None)
+    return raw_values
+
+
+def _process_scalars(field: Field, raw_values: list[Any], failures: _Failures) -> NDArray[Any]:
+    if field.memo is None and [type(transform) for transform in field.transforms] == [StrConverter]:
+        return _process_strings(field, raw_values, failures)
+
+    check = _checker(field)
+    values = list[Any]()
+    for index, raw_value in enumerate(raw_values):
+        if raw_value is None:
+            values.append(None)
+            continue
+        try:
+            values.append(failures.add_result(index, field, check(raw_value)))
+        except Exception as exc:
+            failures.add(index, field, exc)
+            values.append(None)
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _process_strings(field: Field, raw_values: list[Any], failures: _Failures) -> NDArray[Any]:
+    """Process a field without transforms besides its `str` type: only empty values need a check."""
+    values = np.fromiter(raw_values, dtype=object, count=len(raw_values))
+    if all(raw_values):
+        return values
+
+    check = _checker(field)
+    for index, raw_value in enumerate(raw_values):
+        if not raw_value and raw_value is not None:
+            values[index] = failures.add_result(index, field, check(raw_value))
+    return values
+
+
+def _checker(field: Field) -> Callable[[Any], Any]:
+    if field.memo is not None:
+        return field.memo.lookup
+    return field._check_raw_value  # pyright: ignore[reportPrivateUsage]
+
+
+class _NumericField:
+    """An `int` or `decimal` field converted with array operations.
+
+    Its validators and post-processors are applied to the whole array. Values
+    the kernel does not handle, such as `1e3` or invalid ones, go through the
+    field's regular transforms, which report the same errors as row parsing.
+    """
+
+    def __init__(self, field: Field) -> None:
+        self.field = field
+        converter, *transforms = field.transforms
+        self.decimal = type(converter) is DecimalConverter
+        self.transforms = transforms
+        self.check = _checker(field)
+        self.float = self.decimal or any(type(transform) is Divide for transform in transforms)
+
+    @staticmethod
+    def supports(field: Field, exact_decimals: bool = False) -> bool:
+        if type(field) not in (CsvField, ColumnarField, IndexedField) or field.optional or not field.transforms:
+            return False
+
+        converter, *transforms = field.transforms
+        converters = (IntConverter,) if exact_decimals else (IntConverter, DecimalConverter)
+        return type(converter) in converters and all(
+            type(transform) in (GreaterThan, Divide, Round) for transform in transforms
+        )
+
+    def process(self, raw_values: list[Any], failures: _Failures) -> NDArray[Any]:
+        units, scales, valid = parse_numbers(raw_values, self.decimal)
+        values: NDArray[Any] = units / _FLOAT_POW10[scales] if self.decimal else units
+        fallback = np.flatnonzero(~valid).tolist()
+        for transform in self.transforms:
+            values = self.apply(transform, values, valid, failures)
+
+        values = values.astype(np.float64 if self.float else np.int64, copy=False)
+        for index in fallback:
+            raw_value = raw_values[index]
+            if raw_value is None:
+                continue
+            try:
+                value = failures.add_result(index, self.field, self.check(raw_value))
+                if value is not None:
+                    if self.float:
+                        values[index] = value
+                    elif -_INT64_LIMIT <= value < _INT64_LIMIT:
+                        values[index] = value
+                    else:
+                        # Integers beyond int64 are kept exact in an object array.
+                        values = values.astype(object)
+                        values[index] = value
+            except Exception as exc:
+                failures.add(index, self.field, exc)
+        return values
+
+    def apply(
+        self, transform: ParsingTransform, values: NDArray[Any], valid: NDArray[np.bool_], failures: _Failures
+    ) -> NDArray[Any]:
+        if isinstance(transform, GreaterThan):
+            rejected = valid & ~(values > float(transform.threshold))
+            skip = transform.on_error == OnError.SKIP_ROW.value
+            for index in np.flatnonzero(rejected).tolist():
+                failure = transform.check(values[index].item())
+                if isinstance(failure, Failure):
+                    failures.add(index, self.field, failure, skip)
+            valid &= ~rejected
+            return values
+        if isinstance(transform, Divide):
+            return values / transform.denominator
+        if isinstance(transform, Round):
+            return np.round(values, transform.precision)
+        raise AssertionError(f"transform '{transform.key()}' cannot be applied to arrays")
+
+
+def parse_numbers(
+    raw_values: Sequence[str | None], decimal: bool
+) -> tuple[NDArray[np.int64], NDArray[np.intp], NDArray[np.bool_]]:
+    """Convert numbers written in plain notation, such as ` -12.50`, with array operations.
+
+    Return the digits of each value as an integer, the number of digits after
+    its decimal point, and whether the kernel could convert it. Values with
+    surrounding spaces, a sign or, if `decimal`, a decimal point are handled;
+    anything else, such as exponents, underscores or more than 18 digits, is
+    left to the caller.
+    """
+    codes = _code_matrix(raw_values)
+    count, width = codes.shape
+    if width == 0:
+        return np.zeros(count, np.int64), np.zeros(count, np.intp), np.zeros(count, np.bool_)
+
+    digits = codes.astype(np.int64) - 48
+    is_digit = (digits >= 0) & (digits <= 9)
+    if is_digit.all() and width <= MAX_DIGITS:
+        # Fixed-width, zero-padded numbers such as amounts in cents.
+        return digits @ _POW10[width - 1 :: -1], np.zeros(count, np.intp), np.ones(count, np.bool_)
+
+    is_point = codes == 46
+    is_sign = (codes == 43) | (codes == 45)
+    core = (codes != 32) & (codes != 0)
+    valid = ~(core & ~(is_digit | is_point | is_sign)).any(axis=1)
+
+    digit_count = is_digit.sum(axis=1)
+    valid &= (digit_count > 0) & (digit_count <= MAX_DIGITS)
+    valid &= is_point.sum(axis=1) <= (1 if decimal else 0)
+
+    # Spaces are only allowed around the number, and the sign before it.
+    positions = np.arange(width, dtype=np.intp)
+    first = np.where(core, positions, width).min(axis=1)
+    last = np.where(core, positions, -1).max(axis=1)
+    valid &= core.sum(axis=1) == last - first + 1
+    sign_count = is_sign.sum(axis=1)
+    first_is_sign = is_sign[np.arange(count), np.minimum(first, width - 1)]
+    valid &= (sign_count == 0) | ((sign_count == 1) & first_is_sign)
+
+    digits_after = np.cumsum(is_digit[:, ::-1], axis=1)[:, ::-1] - is_digit
+    weights = _POW10[np.minimum(digits_after, MAX_DIGITS)]
+    units = (np.where(is_digit, digits, 0) * weights).sum(axis=1)
+    units = np.where((codes == 45).any(axis=1), -units, units)
+    scales = (is_digit & (np.cumsum(is_point, axis=1) > 0)).sum(axis=1)
+    return units, np.where(valid, scales, 0), valid
+
+
+def _code_matrix(raw_values: Sequence[str | None]) -> NDArray[np.unsignedinteger[Any]]:
+    """The characters of `raw_values` as a matrix of code points, one row per value, padded with zeros."""
+    count = len(raw_values)
+    values = [value or "" for value in raw_values]
+    width = len(values[0]) if values else 0
+    joined = "".join(values)
+    if len(joined) == count * width and all(len(value) == width for value in values):
+        try:
+            return np.frombuffer(joined.encode("ascii"), dtype=np.uint8).reshape(count, width)
+        except UnicodeEncodeError:
+            pass
+
+    array = np.array(values, dtype=np.str_)
+    return array.view(np.uint32).reshape(count, array.dtype.itemsize // 4)
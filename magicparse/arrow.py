@@ -0,0 +1,246 @@
+"""Apache Arrow output: parsed rows as `pyarrow.RecordBatch`es, and Parquet files."""
+
+# pyarrow has no type annotations.
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+
+from collections.abc import Callable, Iterator, Sequence
+from datetime import UTC, date, datetime, time
+from decimal import Decimal
+from importlib.util import find_spec
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+try:
+    import pyarrow as pa  # pyright: ignore[reportMissingTypeStubs]
+    import pyarrow.parquet as pq  # pyright: ignore[reportMissingTypeStubs]
+except ImportError as error:  # pragma: no cover
+    raise ImportError("Arrow output requires pyarrow, install magicparse with the 'arrow' extra") from error
+
+from .fields import Field
+from .post_processors import Divide, Round
+from .rows import RowParsed, RowFailed, RowSkipped
+from .schema import DEFAULT_ARRAY_BATCH_SIZE, Schema
+from .streams import Source
+from .type_converters import DateTimeConverter, DecimalConverter, IntConverter, StrConverter, TimeConverter
+
+DECIMAL_PRECISION = 38
+DEFAULT_DECIMAL_SCALE = 9
+"""Scale of `decimal` fields not ending with a `round` post-processor."""
+
+type RejectedHandler = Callable[[RowSkipped | RowFailed], None]
+
+
+def arrow_type(field: Field, timezone: str = "UTC") -> Any:
+    """The Arrow type of the values of `field`, derived from its `type` and post-processors.
+
+    Decimals get the precision of their last `round`, integers divided by
+    `divide` become doubles, times are normalized to UTC and datetimes stored
+    as timestamps in `timezone`.
+    """
+    converter = next((transform for transform in field.transforms if type(transform) in _CONVERTERS), None)
+    if converter is None:
+        raise ValueError(f"field '{field.key}' has no Arrow type, give it in 'types'")
+
+    post_processors = field.transforms[field.transforms.index(converter) + 1 :]
+    match converter:
+        case StrConverter():
+            return pa.string()
+        case IntConverter() if any(type(transform) is Divide for transform in post_processors):
+            return pa.float64()
+        case IntConverter():
+            return pa.int64()
+        case DecimalConverter():
+            last = post_processors[-1] if post_processors else None
+            scale = last.precision if isinstance(last, Round) else DEFAULT_DECIMAL_SCALE
+            return pa.decimal128(DECIMAL_PRECISION, scale)
+        case DateTimeConverter():
+            return pa.timestamp("us", tz=timezone)
+        case _:
+            return pa.time64("us")
+
+
+_CONVERTERS = (StrConverter, IntConverter, DecimalConverter, DateTimeConverter, TimeConverter)
+
+
+def arrow_schema(schema: Schema, types: dict[str, Any] | None = None, timezone: str = "UTC") -> Any:
+    """The Arrow schema of the rows of `schema`, with the Arrow `types` of some fields overridden."""
+    types = types or {}
+    hidden = set(schema.hidden_keys)
+    return pa.schema(
+        [
+            pa.field(field.key, types[field.key] if field.key in types else arrow_type(field, timezone))
+            for field in [*schema.fields, *schema.computed_fields]
+            if field.key not in hidden
+        ]
+    )
+
+
+def stream_parse_batches(
+    schema: Schema,
+    data: Source,
+    batch_size: int = DEFAULT_ARRAY_BATCH_SIZE,
+    on_rejected: RejectedHandler | None = None,
+    select: Sequence[str] | None = None,
+    types: dict[str, Any] | None = None,
+    timezone: str = "UTC",
+) -> Iterator[Any]:
+    """Parse `data` into record batches of up to `batch_size` rows, giving rejected rows to `on_rejected`."""
+    schema = schema.select(select)
+    return _record_batches(schema, data, batch_size, on_rejected, arrow_schema(schema, types, timezone))
+
+
+def write_parquet(
+    schema: Schema,
+    data: Source,
+    path: str | PathLike[str],
+    batch_size: int = DEFAULT_ARRAY_BATCH_SIZE,
+    on_rejected: RejectedHandler | None = None,
+    select: Sequence[str] | None = None,
+    types: dict[str, Any] | None = None,
+    timezone: str = "UTC",
+    **options: Any,
+) -> int:
+    """Parse `data` into the Parquet file at `path`, return the number of rows written.
+
+    `options` are given to `pyarrow.parquet.ParquetWriter`, such as its `compression`.
+    """
+    schema = schema.select(select)
+    target = arrow_schema(schema, types, timezone)
+    written = 0
+    with pq.ParquetWriter(path, target, **options) as writer:
+        for batch in _record_batches(schema, data, batch_size, on_rejected, target):
+            writer.write_batch(batch)
+            written += batch.num_rows
+    return written
+
+
+def _record_batches(
+    schema: Schema, data: Source, batch_size: int, on_rejected: RejectedHandler | None, target: Any
+) -> Iterator[Any]:
+    if batch_size <= 0:
+        raise ValueError("'batch_size' must be a positive integer")
+
+    converters = [_column_converter(column.type) for column in target]
+    if _by_columns(schema):
+        for columns in schema.stream_parse_arrays(data, batch_size, exact_decimals=True):
+            if on_rejected is not None:
+                for row in columns.rejected:
+                    on_rejected(row)
+            if len(columns):
+                yield pa.RecordBatch.from_arrays(
+                    [
+                        _column_array(columns.columns[column.name], column.type, convert)
+                        for column, convert in zip(target, converters)
+                    ],
+                    schema=target,
+                )
+        return
+
+    rows = list[Any]()
+    for row in schema.stream_parse(data):
+        if not isinstance(row, RowParsed):
+            if on_rejected is not None:
+                on_rejected(row)
+            continue
+
+        rows.append(row.values)
+        if len(rows) == batch_size:
+            yield _record_batch(target, converters, rows)
+            rows = []
+
+    if rows:
+        yield _record_batch(target, converters, rows)
+
+
+def _by_columns(schema: Schema) -> bool:
+    """Whether batches can be built from column batches: numpy is installed and rows are processed field by field."""
+    return type(schema).process_row is Schema.process_row and find_spec("numpy") is not None
+
+
+REJECTED_ROWS_SCHEMA = pa.schema([pa.field("row_number", pa.int64()), pa.field("errors", pa.string())])
+"""Arrow schema of failed and skipped rows: their row number and their errors as JSON."""
+
+
+class ParquetBatchWriter:
+    """Write batches of row values to successive Parquet files sharing the Arrow schema of `schema`.
+
+    Without a `schema`, records are failed and skipped rows, see `REJECTED_ROWS_SCHEMA`.
+    """
+
+    def __init__(
+        self, schema: Schema | None, types: dict[str, Any] | None, timezone: str, options: dict[str, Any]
+    ) -> None:
+        self.rejected = schema is None
+        self.target = REJECTED_ROWS_SCHEMA if schema is None else arrow_schema(schema, types, timezone)
+        self.converters = [_column_converter(column.type) for column in self.target]
+        self.options = options
+        self.path: Path | None = None
+        self.writer: Any = None
+
+    def open(self, path: Path) -> None:
+        self.writer = pq.ParquetWriter(path, self.target, **self.options)
+        self.path = path
+
+    def write(self, records: Sequence[Any]) -> None:
+        self.writer.write_batch(_record_batch(self.target, self.converters, records))
+
+    def size(self) -> int:
+        assert self.path is not None
+        return self.path.stat().st_size
+
+    def close(self) -> None:
+        self.writer.close()
+        self.writer = None
+
+
+def _record_batch(target: Any, converters: list[Callable[[list[Any]], list[Any]] | None], rows: Sequence[Any]) -> Any:
+    columns = list[Any]()
+    for column, convert in zip(target, converters):
+        key = column.name
+        values = [row[key] for row in rows]
+        if convert is not None:
+            values = convert(values)
+        columns.append(_array(values, column.type))
+    return pa.RecordBatch.from_arrays(columns, schema=target)
+
+
+def _column_array(values: Any, type: Any, convert: Callable[[list[Any]], list[Any]] | None) -> Any:
+    """The Arrow array of a NumPy column: numeric columns are converted as a whole, `object` ones value by value."""
+    if convert is None and values.dtype != object:
+        try:
+            return pa.array(values, type=type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+
+    values = values.tolist()
+    return _array(values if convert is None else convert(values), type)
+
+
+def _array(values: list[Any], type: Any) -> Any:
+    try:
+        return pa.array(values, type=type)
+    except pa.ArrowInvalid:
+        if not pa.types.is_decimal(type):
+            raise
+
+    # Decimals with more digits than the column's scale are rounded to it.
+    exponent = Decimal(1).scaleb(-type.scale)
+    return pa.array([None if value is None else value.quantize(exponent) for value in values], type=type)
+
+
+def _column_converter(type: Any) -> Callable[[list[Any]], list[Any]] | None:
+    if pa.types.is_time(type):
+        return _utc_times
+    return None
+
+
+def _utc_times(values: list[Any]) -> list[Any]:
+    """Normalize aware times to UTC, Arrow times having no time zone."""
+    return [_utc_time(value) if isinstance(value, time) else value for value in values]
+
+
+def _utc_time(value: time) -> time:
+    if value.tzinfo is None:
+        return value
+    return datetime.combine(date(2000, 1, 1), value).astimezone(UTC).time()
@@ -1,4 +1,5 @@
 from abc import ABC
+from collections.abc import Sequence
 from decimal import Decimal
 from typing import Any, cast
 
@@ -26,6 +27,10 @@ class Builder(ParsingTransform, ABC):
         else:
             return builder(on_error=on_error)
 
+    def dependencies(self) -> Sequence[str] | None:
+        """Keys of the values read by `apply`, `None` when unknown."""
+        return None
+
 
 class Concat(Builder):
     def __init__(self, on_error: OnError, fields: Any) -> None:
@@ -43,6 +48,9 @@ class Concat(Builder):
     def apply(self, value: dict[str, Any]) -> str:
         return "".join(value[field] for field in self.fields)
 
+    def dependencies(self) -> Sequence[str]:
+        return self.fields
+
     @staticmethod
     def key() -> str:
         return "concat"
@@ -61,6 +69,9 @@ class Divide(Builder):
     def apply(self, value: dict[str, Any]) -> Decimal:
         return value[self.numerator] / value[self.denominator]
 
+    def dependencies(self) -> Sequence[str]:
+        return [self.numerator, self.denominator]
+
     @staticmethod
     def key() -> str:
         return "divide"
@@ -79,6 +90,9 @@ class Multiply(Builder):
     def apply(self, value: dict[str, Any]):
         return value[self.x_factor] * value[self.y_factor]
 
+    def dependencies(self) -> Sequence[str]:
+        return [self.x_factor, self.y_factor]
+
     @staticmethod
     def key() -> str:
         return "multiply"
@@ -100,6 +114,9 @@ class Coalesce(Builder):
                 return value[field]
         return None
 
+    def dependencies(self) -> Sequence[str]:
+        return self.fields
+
     @staticmethod
     def key() -> str:
         return "coalesce"
@@ -0,0 +1,117 @@
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, cast
+
+from .schema import Schema
+
+
+@dataclass(frozen=True, slots=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class SchemaCache:
+    """Process-wide LRU cache of built schemas keyed by a canonical hash of their options."""
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize <= 0:
+            raise ValueError("schema cache 'maxsize' must be a positive integer")
+
+        self.maxsize = maxsize
+        self._schemas = OrderedDict[str, Schema]()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(options: dict[str, Any]) -> str | None:
+        """Hash of `options`, or `None` when they hold values JSON would not tell apart, such as non-str keys."""
+        if not _is_json(options):
+            return None
+        try:
+            canonical = json.dumps(options, sort_keys=True, separators=(",", ":"))
+        except ValueError:
+            return None
+
+        return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, options: dict[str, Any]) -> Schema:
+        key = self.key(options)
+        if key is None:
+            # Options that cannot be canonicalized are never cached.
+            return Schema.build(copy.deepcopy(options))
+
+        with self._lock:
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self._schemas.move_to_end(key)
+                self._hits += 1
+                return schema
+            self._misses += 1
+
+        # Builders mutate nested options (e.g. `type.pop("key")`), so build from a copy
+        # to keep the caller's dict, and therefore its key, stable across calls.
+        schema = Schema.build(copy.deepcopy(options))
+
+        with self._lock:
+            self._schemas[key] = schema
+            self._schemas.move_to_end(key)
+            while len(self._schemas) > self.maxsize:
+                self._schemas.popitem(last=False)
+
+        return schema
+
+    def invalidate(self, options: dict[str, Any] | None = None) -> None:
+        with self._lock:
+            if options is None:
+                self._schemas.clear()
+                return
+
+            key = self.key(options)
+            if key is not None:
+                self._schemas.pop(key, None)
+
+    def resize(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError("schema cache 'maxsize' must be a positive integer")
+
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._schemas) > self.maxsize:
+                self._schemas.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                maxsize=self.maxsize,
+                currsize=len(self._schemas),
+            )
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+
+def _is_json(value: Any) -> bool:
+    """Whether `value` is made of JSON types only, so its JSON dump identifies it."""
+    # Subclasses of scalars, such as enums, are dumped like their base type.
+    if value is None or type(value) in (bool, int, float, str):
+        return True
+    match value:
+        case list():
+            return all(_is_json(item) for item in cast(list[Any], value))
+        case dict():
+            items = cast(dict[Any, Any], value).items()
+            return all(isinstance(key, str) and _is_json(item) for key, item in items)
+        case _:
+            return False
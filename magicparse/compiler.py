@@ -0,0 +1,240 @@
+import hashlib
+import linecache
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from .fields import ColumnarField, CsvField, Field, IndexedField
+from .post_processors import Divide, Round
+from .pre_processors import LeftPadZeroes, LeftStrip, Map, RegexExtract, Replace, StripWhitespaces
+from .rows import CompactValues, RowFailed, RowParsed, RowSkipped
+from .transform import Failure, Ok, OnError, ParsingTransform, SkipRow
+from .type_converters import DecimalConverter, IntConverter, StrConverter
+from .validators import GreaterThan, NotNullOrEmpty, RegexMatches
+
+type Row = RowParsed | RowSkipped | RowFailed
+type RowFunction = Callable[[Any, int], Row]
+
+
+class _SkippedField(Exception):
+    def __init__(self, exception: Exception) -> None:
+        super().__init__(exception)
+        self.exception = exception
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRow:
+    """A whole-row function generated from a schema's fields.
+
+    Built-in readers and transforms are inlined; any other field or transform
+    is called through its regular `parse`/`apply` method.
+    """
+
+    source: str
+    function: RowFunction
+
+    @classmethod
+    def build(
+        cls,
+        fields: Sequence[Field],
+        process_computed_fields: Callable[[dict[str, Any], int], Row],
+        key_index: dict[str, int] | None = None,
+    ) -> "CompiledRow":
+        """Generate the function processing rows with `fields`.
+
+        With a `key_index`, and no computed fields, values are stored straight
+        into a `CompactValues` tuple instead of a dict.
+        """
+        generator = _RowFunctionGenerator(fields, key_index)
+        source = generator.generate()
+        namespace: dict[str, Any] = generator.namespace | {
+            "_CompactValues": CompactValues,
+            "_Failure": Failure,
+            "_Ok": Ok,
+            "_SkipRow": SkipRow,
+            "_RowParsed": RowParsed,
+            "_RowSkipped": RowSkipped,
+            "_RowFailed": RowFailed,
+            "_SkippedField": _SkippedField,
+            "_process_computed_fields": process_computed_fields,
+        }
+
+        filename = f"<magicparse-row-{hashlib.blake2b(source.encode(), digest_size=8).hexdigest()}>"
+        # Keep the generated source reachable for tracebacks and debuggers.
+        linecache.cache[filename] = (len(source), None, source.splitlines(keepends=True), filename)
+        exec(compile(source, filename, "exec"), namespace)
+        function: RowFunction = namespace["process_row"]
+        return cls(source=source, function=function)
+
+
+class _RowFunctionGenerator:
+    def __init__(self, fields: Sequence[Field], key_index: dict[str, int] | None) -> None:
+        self.fields = fields
+        self.key_index = key_index
+        self.namespace = dict[str, Any]()
+        self.lines = list[str]()
+
+    def bind(self, name: str, value: Any) -> str:
+        self.namespace[name] = value
+        return name
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def generate(self) -> str:
+        self.emit(0, "def process_row(row, row_number):")
+        if self.key_index is None:
+            self.emit(1, "values = {}")
+        self.emit(1, "failures = []")
+        self.emit(1, "skip_row = False")
+        for index, field in enumerate(self.fields):
+            self.generate_field(index, field)
+
+        self.emit(1, "if failures:")
+        self.emit(2, "if skip_row:")
+        self.emit(3, "return _RowSkipped.from_failures(row_number, failures)")
+        self.emit(2, "return _RowFailed.from_failures(row_number, failures)")
+        if self.key_index is None:
+            self.emit(1, "return _process_computed_fields(values, row_number)")
+        else:
+            # Every slot is set once no field failed.
+            key_index = self.bind("_key_index", self.key_index)
+            slots = "".join(f"s{position}, " for position in range(len(self.key_index)))
+            self.emit(1, f"return _RowParsed(row_number, _CompactValues({key_index}, ({slots})))")
+        return "\n".join(self.lines) + "\n"
+
+    def generate_field(self, index: int, field: Field) -> None:
+        name = self.bind(f"_f{index}", field)
+        self.emit(1, f"# {field.key!r}")
+        self.emit(1, "failure = None")
+        self.emit(1, "try:")
+        if type(field) is CsvField and field.column_number is not None:
+            self.emit(2, f"value = row[{field.column_number - 1}]")
+        elif type(field) is ColumnarField:
+            self.emit(2, f"value = row[{field.column_start}:{field.column_end}]")
+        elif type(field) is IndexedField:
+            self.emit(2, f"value = row[{field.index}]")
+        else:
+            self.emit(2, f"value = {name}._read_raw_value(row)")
+
+        if field.memo is None:
+            self.generate_checks(index, field)
+        else:
+            self.generate_memo_lookup(index, field)
+
+        self.emit(1, "except _SkippedField as skipped:")
+        self.emit(2, "skip_row = True")
+        self.emit(2, f"failures.append(({name}, skipped.exception))")
+        self.emit(1, "except Exception as exc:")
+        self.emit(2, f"failures.append(({name}, exc))")
+        self.emit(1, "else:")
+        self.emit(2, "if failure is not None:")
+        self.emit(3, f"failures.append(({name}, failure))")
+        self.emit(2, "else:")
+        if self.key_index is None:
+            self.emit(3, f"values[{field.key!r}] = value")
+        else:
+            self.emit(3, f"s{self.key_index[field.key]} = value")
+
+    def generate_checks(self, index: int, field: Field) -> None:
+        self.emit(2, "if not value:")
+        if field.optional:
+            self.emit(3, "value = None")
+        else:
+            required = Failure("required", "{key} field is required but the value was empty", {"key": field.key})
+            self.emit(3, f"failure = {self.bind(f'_f{index}_required', required)}")
+        self.emit(2, "else:")
+        self.emit(3, "pass")
+        # Each transform is only applied while no failure was reported.
+        for position, (transform, check) in enumerate(zip(field.transforms, field.checks)):
+            self.generate_transform(f"_t{index}_{position}", transform, check)
+
+    def generate_memo_lookup(self, index: int, field: Field) -> None:
+        """Get the result of the whole transform chain from the field's memo, keyed on the raw value."""
+        assert field.memo is not None
+        lookup = self.bind(f"_f{index}_lookup", field.memo.lookup)
+        self.emit(2, f"result = {lookup}(value)")
+        self.emit(2, "if result.__class__ is _Ok:")
+        self.emit(3, "value = result.value")
+        self.emit(2, "elif result.__class__ is _SkipRow:")
+        self.emit(3, "skip_row = True")
+        self.emit(3, "failure = result.exception")
+        self.emit(2, "else:")
+        self.emit(3, "failure = result")
+
+    def generate_transform(self, name: str, transform: ParsingTransform, check: Callable[[Any], Any]) -> None:
+        checked = check != transform.apply
+        lines = self.inline(name, transform, self.bind(f"{name}_check", check))
+        if checked:
+            # A built-in check returns its failure instead of raising it.
+            lines += ["if value.__class__ is _Failure:", "    failure = value"]
+            if transform.on_error == OnError.SKIP_ROW.value:
+                lines.append("    skip_row = True")
+
+        self.emit(3, "if failure is None:")
+        if transform.on_error != OnError.SKIP_ROW.value:
+            for line in lines:
+                self.emit(4, line)
+            return
+
+        self.emit(4, "try:")
+        for line in lines:
+            self.emit(5, line)
+        self.emit(4, "except Exception as exc:")
+        self.emit(5, "raise _SkippedField(exc)")
+
+    def inline(self, name: str, transform: ParsingTransform, check: str) -> list[str]:
+        """Return the statements applying `transform` to `value`.
+
+        Inlined checks only cover the success path: on failure they call the
+        transform's `check` (or its `apply`), which reports its usual error.
+        """
+        apply = check
+        match transform:
+            case StripWhitespaces() if type(transform) is StripWhitespaces:
+                return ["value = value.strip()"]
+            case LeftStrip() if type(transform) is LeftStrip:
+                return [f"value = value.lstrip({self.bind(f'{name}_characters', transform.characters)})"]
+            case Replace() if type(transform) is Replace:
+                pattern = self.bind(f"{name}_pattern", transform.pattern)
+                replacement = self.bind(f"{name}_replacement", transform.replacement)
+                return [f"value = value.replace({pattern}, {replacement})"]
+            case LeftPadZeroes() if type(transform) is LeftPadZeroes:
+                return [f"value = value.zfill({self.bind(f'{name}_width', transform.width)})"]
+            case Map() if type(transform) is Map:
+                values = self.bind(f"{name}_values", transform.values)
+                return ["try:", f"    value = {values}[value]", "except Exception:", f"    value = {apply}(value)"]
+            case RegexExtract() if type(transform) is RegexExtract:
+                match = self.bind(f"{name}_match", transform.pattern.match)
+                return [
+                    f"match = {match}(value)",
+                    "if match is None:",
+                    f"    value = {apply}(value)",
+                    "else:",
+                    '    value = match.group("value")',
+                ]
+            case StrConverter() if type(transform) is StrConverter:
+                return ["if value is None:", f"    value = {apply}(value)"]
+            case IntConverter() if type(transform) is IntConverter:
+                return self.inline_call(name, int, apply)
+            case DecimalConverter() if type(transform) is DecimalConverter:
+                return self.inline_call(name, Decimal, apply)
+            case RegexMatches() if type(transform) is RegexMatches:
+                match = self.bind(f"{name}_match", transform.pattern.match)
+                return [f"if {match}(value) is None:", f"    value = {apply}(value)"]
+            case GreaterThan() if type(transform) is GreaterThan:
+                threshold = self.bind(f"{name}_threshold", transform.threshold)
+                return [f"if not value > {threshold}:", f"    value = {apply}(value)"]
+            case NotNullOrEmpty() if type(transform) is NotNullOrEmpty:
+                return ["if not value:", f"    value = {apply}(value)"]
+            case Divide() if type(transform) is Divide:
+                return [f"value = value / {self.bind(f'{name}_denominator', transform.denominator)}"]
+            case Round() if type(transform) is Round:
+                return [f"value = round(value, {self.bind(f'{name}_precision', transform.precision)})"]
+            case _:
+                return [f"value = {apply}(value)"]
+
+    def inline_call(self, name: str, function: Callable[[Any], Any], apply: str) -> list[str]:
+        call = self.bind(f"{name}_convert", function)
+        return ["try:", f"    value = {call}(value)", "except Exception:", f"    value = {apply}(value)"]
@@ -1,12 +1,20 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from typing import Any
 
+from . import post_processors, pre_processors, type_converters, validators
 from .builders import Builder
+from .memo import Memo
 from .type_converters import TypeConverter
 from .post_processors import PostProcessor
 from .pre_processors import PreProcessor
 from .validators import Validator
-from .transform import Ok, OnError, Result, SkipRow
+from .transform import Failure, Ok, OnError, Result, SkipRow, checker
+
+# Transforms whose result only depends on their input value.
+DETERMINISTIC_TRANSFORMS = frozenset(
+    [*pre_processors.builtins, *type_converters.builtins, *validators.builtins, *post_processors.builtins]
+)
 
 
 class Field(ABC):
@@ -20,21 +28,44 @@ class Field(ABC):
         self.optional = options.get("optional", False)
 
         self.transforms = pre_processors + [type_converter] + validators + post_processors
+        self.checks = [checker(transform) for transform in self.transforms]
+
+        self.memo = Memo.build(options.get("memoize", False), self._check_raw_value)
+        if self.memo is not None and not all(
+            type(transform) in DETERMINISTIC_TRANSFORMS for transform in self.transforms
+        ):
+            raise ValueError(f"field '{key}' cannot be memoized: only built-in transforms can be")
 
     def _process_raw_value(self, raw_value: str) -> Result:
+        if self.memo is not None:
+            result = self.memo.lookup(raw_value)
+        else:
+            result = self._check_raw_value(raw_value)
+        if isinstance(result, Failure):
+            raise result.exception()
+        if isinstance(result, SkipRow) and isinstance(result.exception, Failure):
+            return SkipRow(exception=result.exception.exception())
+        return result
+
+    def _check_raw_value(self, raw_value: str) -> Result | Failure:
         if not raw_value:
             if self.optional:
                 return Ok(value=None)
             else:
-                raise ValueError(f"{self.key} field is required but the value was empty")
-        for transform in self.transforms:
+                return Failure("required", "{key} field is required but the value was empty", {"key": self.key})
+        value: Any = raw_value
+        for transform, check in zip(self.transforms, self.checks):
             try:
-                raw_value = transform.apply(raw_value)
+                value = check(value)
             except Exception as exc:
                 if transform.on_error == OnError.SKIP_ROW.value:
                     return SkipRow(exception=exc)
                 raise
-        return Ok(value=raw_value)
+            if isinstance(value, Failure):
+                if transform.on_error == OnError.SKIP_ROW.value:
+                    return SkipRow(exception=value)
+                return value
+        return Ok(value=value)
 
     @abstractmethod
     def _read_raw_value(self, row: Any) -> str:
@@ -44,6 +75,17 @@ class Field(ABC):
         raw_value = self._read_raw_value(row)
         return self._process_raw_value(raw_value)
 
+    def try_parse(self, row: str | list[str] | dict[str, Any]) -> Result | Failure:
+        """Like `parse`, but return a `Failure` instead of raising when a built-in transform rejects the value.
+
+        Other transforms may still raise.
+        """
+        raw_value = self._read_raw_value(row)
+        if self.memo is not None:
+            # Failures are cached as well, the same raw value being rejected the same way.
+            return self.memo.lookup(raw_value)
+        return self._check_raw_value(raw_value)
+
     @abstractmethod
     def error(self, exception: Exception) -> dict[str, Any]:
         pass
@@ -56,7 +98,8 @@ class Field(ABC):
             raise ValueError("key is required in field definition")
 
         column_number = options.get("column-number")
-        if column_number:
+        column_name = options.get("column-name")
+        if column_number or column_name:
             return CsvField(key, options)
 
         column_start = options.get("column-start")
@@ -68,14 +111,28 @@ class Field(ABC):
 
 
 class CsvField(Field):
+    """A field read from a CSV column, given by its number or by its name in the header.
+
+    Named columns are resolved against each file's header by `CsvSchema.bind`.
+    """
+
     def __init__(self, key: str, options: dict[str, Any]) -> None:
         super().__init__(key, options)
-        self.column_number = int(options["column-number"])
+        self.column_name: str | None = options.get("column-name")
+        self.column_number = None if self.column_name else int(options["column-number"])
 
     def _read_raw_value(self, row: list[str]) -> str:
+        if self.column_number is None:
+            raise ValueError(f"column '{self.column_name}' is not bound to a header")
         return row[self.column_number - 1]
 
     def error(self, exception: Exception) -> dict[str, Any]:
+        if self.column_name:
+            return {
+                "column-name": self.column_name,
+                "field-key": self.key,
+                "error": exception.args[0],
+            }
         return {
             "column-number": self.column_number,
             "field-key": self.key,
@@ -102,6 +159,46 @@ class ColumnarField(Field):
         }
 
 
+class IndexedField(Field):
+    """A field reading its raw value at a fixed position of an already split row.
+
+    It shares the transforms of the wrapped `field` and reports errors the same way.
+    """
+
+    def __init__(self, field: Field, index: int) -> None:
+        self.field = field
+        self.key = field.key
+        self.optional = field.optional
+        self.transforms = field.transforms
+        self.checks = field.checks
+        self.memo = field.memo
+        self.index = index
+
+    def _read_raw_value(self, row: Sequence[str]) -> str:
+        return row[self.index]
+
+    def error(self, exception: Exception) -> dict[str, Any]:
+        return self.field.error(exception)
+
+
+class MissingField(Field):
+    """An optional field whose column is missing from the file: its value is always empty."""
+
+    def __init__(self, field: Field) -> None:
+        self.field = field
+        self.key = field.key
+        self.optional = field.optional
+        self.transforms = field.transforms
+        self.checks = field.checks
+        self.memo = field.memo
+
+    def _read_raw_value(self, row: Any) -> str:
+        return ""
+
+    def error(self, exception: Exception) -> dict[str, Any]:
+        return self.field.error(exception)
+
+
 class ComputedField(Field):
     def __init__(self, key: str, options: dict[str, Any]) -> None:
         super().__init__(key, options)
@@ -0,0 +1,48 @@
+from .records import RecordBuffer
+from .rows import RowFailed, RowParsed, RowSkipped
+from .schema import Schema
+
+type Row = RowParsed | RowSkipped | RowFailed
+
+
+class IncrementalParser:
+    """Push-style parser fed with chunks of raw bytes.
+
+    Chunks can be cut anywhere, including inside a multi-byte character or a
+    quoted CSV field spanning several lines: only whole records are parsed,
+    the remainder is kept until the next chunk.
+    """
+
+    def __init__(self, schema: Schema) -> None:
+        self.schema = schema
+        self.buffer = RecordBuffer(schema.record_splitter(), schema.has_header)
+        self.bound = None if schema.has_header else schema
+        self.closed = False
+
+    def feed(self, chunk: bytes) -> list[Row]:
+        """Add `chunk` and return the rows of the records it completes."""
+        if self.closed:
+            raise ValueError("cannot feed a closed parser")
+
+        records, row_number, count = self.buffer.push(chunk)
+        return self.parse(records, row_number) if count else []
+
+    def close(self) -> list[Row]:
+        """Return the rows of the last record, not followed by a record terminator."""
+        if self.closed:
+            return []
+
+        self.closed = True
+        records, row_number, count = self.buffer.flush()
+        return self.parse(records, row_number) if count else []
+
+    def parse(self, records: bytes, row_number: int) -> list[Row]:
+        if self.bound is None:
+            # Records are only released once the header is read.
+            self.bound = self.schema.bind(self.schema.read_record(self.buffer.header or b""))
+        return self.bound.parse_chunk(records, row_number)
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes not yet parsed."""
+        return len(self.buffer.pending)
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from typing import BinaryIO
+
+from .records import DEFAULT_BLOCK_SIZE, Checkpoint, RecordSplitter, skip_records
+from .streams import is_decompressed
+
+DEFAULT_INDEX_STEP = 1024
+HEAD_SIZE = 64 * 1024
+"""Bytes at the start of a file whose digest is kept in its index."""
+
+_MAGIC = b"MPIX"
+_VERSION = 2
+_HEADER = struct.Struct("<4sB3xQQQ16s")
+
+
+class RowIndex:
+    """Byte offsets of every `step`-th record of a file, to seek to any row without scanning from its start.
+
+    `offsets[i]` is the offset of the record numbered `i * step + 1`, records
+    being numbered like rows, the header included. With a `step` of 1 every
+    record is indexed. `size` is the size of the indexed file and `head` the
+    digest of its first `HEAD_SIZE` bytes, both checked before the index is used.
+    """
+
+    def __init__(self, step: int, offsets: array[int], records: int, size: int, head: bytes) -> None:
+        if step <= 0:
+            raise ValueError("index 'step' must be a positive integer")
+        self.step = step
+        self.offsets = offsets
+        self.records = records
+        self.size = size
+        self.head = head
+
+    @classmethod
+    def build(
+        cls,
+        stream: BinaryIO,
+        splitter: RecordSplitter,
+        step: int = DEFAULT_INDEX_STEP,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> "RowIndex":
+        """Index the records of `stream` in a single pass."""
+        if step <= 0:
+            raise ValueError("index 'step' must be a positive integer")
+
+        head = _digest(stream)
+        stream.seek(0)
+        offsets = array("Q", [0])
+        records = 0
+        offset = 0
+        pending = b""
+        while block := stream.read(block_size):
+            data = pending + block if pending else block
+            start = 0
+            for end in splitter.boundaries(data):
+                records += 1
+                if records % step == 0:
+                    offsets.append(offset + end)
+                start = end
+            offset += start
+            pending = data[start:]
+
+        size = offset + len(pending)
+        if pending:
+            records += 1
+        elif len(offsets) > 1 and offsets[-1] == size:
+            # The last record was terminated: no record starts at the end of the file.
+            offsets.pop()
+        return cls(step, offsets, records, size, head)
+
+    def check(self, stream: BinaryIO) -> None:
+        """Refuse `stream` if it is not the indexed file, once per opened stream.
+
+        The size of decompressed content is only known once fully decompressed:
+        only the first bytes of compressed files are compared.
+        """
+        if not is_decompressed(stream):
+            end = stream.seek(0, os.SEEK_END)
+            if end != self.size:
+                raise ValueError(f"the index was built for a file of {self.size} bytes, not {end}")
+        if _digest(stream) != self.head:
+            raise ValueError("the index was built for a file starting with other content")
+
+    def checkpoint(self, stream: BinaryIO, splitter: RecordSplitter, row_number: int) -> Checkpoint:
+        """Return the checkpoint of the row numbered `row_number`, from the closest indexed record before it.
+
+        `stream` is expected to have been `check`ed.
+        """
+        position = min((row_number - 1) // self.step, len(self.offsets) - 1)
+        stream.seek(self.offsets[position])
+        _, offset = skip_records(stream, splitter, row_number - 1 - position * self.step)
+        return Checkpoint(offset=offset, row_number=row_number)
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Write the index to a sidecar file."""
+        offsets = self.offsets
+        if sys.byteorder == "big":
+            offsets = array("Q", offsets)
+            offsets.byteswap()
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, self.step, self.records, self.size, self.head))
+            offsets.tofile(file)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> "RowIndex":
+        """Read an index written by `save`."""
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"'{os.fspath(path)}' is not a row index")
+            magic, version, step, records, size, head = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"'{os.fspath(path)}' is not a row index")
+            if version != _VERSION:
+                raise ValueError(f"unsupported row index version {version}, build it again")
+            offsets = array("Q")
+            offsets.frombytes(file.read())
+
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        return cls(step, offsets, records, size, head)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RowIndex):
+            return NotImplemented
+        return (self.step, self.offsets, self.records, self.size, self.head) == (
+            other.step,
+            other.offsets,
+            other.records,
+            other.size,
+            other.head,
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+def _digest(stream: BinaryIO) -> bytes:
+    stream.seek(0)
+    return hashlib.blake2b(stream.read(HEAD_SIZE), digest_size=16).digest()
@@ -0,0 +1,78 @@
+import codecs
+import struct
+from functools import cache
+
+from .fields import ColumnarField, IndexedField
+
+
+@cache
+def is_single_byte_encoding(encoding: str) -> bool:
+    """Whether every byte of `encoding` decodes on its own into exactly one character."""
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        return all(len(decoder.decode(bytes([byte]))) == 1 for byte in range(256))
+    except Exception:
+        return False
+
+
+# Multi-byte encodings only made of bytes above the ASCII range, besides ASCII characters themselves.
+_ASCII_TRANSPARENT_ENCODINGS = frozenset(
+    {"utf-8", "utf-8-sig", "euc_jp", "euc_jis_2004", "euc_jisx0213", "euc_kr", "gb2312"}
+)
+
+
+@cache
+def is_byte_splittable_encoding(encoding: str) -> bool:
+    """Whether a single-byte character of `encoding` never occurs inside another character.
+
+    Multi-byte encodings such as Shift-JIS, Big5 or GBK use bytes of the ASCII
+    range as the second byte of their characters: `|` may be half of `−`.
+    """
+    if is_single_byte_encoding(encoding):
+        return True
+    try:
+        return codecs.lookup(encoding).name in _ASCII_TRANSPARENT_ENCODINGS
+    except LookupError:
+        return False
+
+
+class ColumnarLayout:
+    """Byte layout of the columns read by fixed-width fields in a single-byte encoding.
+
+    Records are unpacked in one call into the declared columns only, filler
+    bytes between them are never decoded. Each unpacked row ends with the raw
+    record so blank records are still recognized as such.
+    """
+
+    def __init__(self, fields: list[ColumnarField], encoding: str) -> None:
+        self.encoding = encoding
+        spans = sorted({(field.column_start, field.column_end) for field in fields})
+        overlapping = any(end > next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
+        if overlapping or any(start < 0 or end < start for start, end in spans):
+            # struct can only unpack ordered, non overlapping columns.
+            self.struct = None
+        else:
+            self.struct = self._build_struct(spans)
+
+        self.spans = spans
+        self.fields = [IndexedField(field, spans.index((field.column_start, field.column_end))) for field in fields]
+
+    @staticmethod
+    def _build_struct(spans: list[tuple[int, int]]) -> struct.Struct:
+        format = "="
+        position = 0
+        for start, end in spans:
+            if start > position:
+                format += f"{start - position}x"
+            format += f"{end - start}s"
+            position = end
+        return struct.Struct(format)
+
+    def unpack(self, record: bytes) -> tuple[str | bytes, ...]:
+        encoding = self.encoding
+        if self.struct is not None and len(record) >= self.struct.size:
+            columns = self.struct.unpack_from(record)
+        else:
+            # Short records are sliced like their decoded line would be.
+            columns = [record[start:end] for start, end in self.spans]
+        return (*[column.decode(encoding) for column in columns], record)
@@ -0,0 +1,99 @@
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, cast
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_MIN_HIT_RATE = 0.5
+MIN_REVIEW_INTERVAL = 4096
+
+
+class Memo:
+    """Bounded LRU cache of the results of `compute`, a field's transform chain, keyed on raw values.
+
+    Only str raw values are cached: values of computed fields, such as
+    `Decimal("1")` and `Decimal("1.00")`, may be equal but transformed
+    differently, or not be hashable. Other values are computed each time.
+
+    Every `review_interval` lookups, the hit rate over the interval is checked:
+    below `min_hit_rate` the column is deemed not repetitive enough, the cache
+    is emptied and `lookup` calls `compute` directly from then on.
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[Any], Any],
+        max_size: int = DEFAULT_MAX_SIZE,
+        min_hit_rate: float = DEFAULT_MIN_HIT_RATE,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("memoize 'max-size' must be a positive integer")
+        if not 0 <= min_hit_rate <= 1:
+            raise ValueError("memoize 'min-hit-rate' must be between 0 and 1")
+
+        self.compute = compute
+        self.max_size = max_size
+        self.min_hit_rate = min_hit_rate
+        self.review_interval = max(MIN_REVIEW_INTERVAL, 4 * max_size)
+        self.enabled = True
+        self.cached = lru_cache(maxsize=max_size, typed=True)(compute)
+        self.lookup = self._lookup_function()
+
+    @classmethod
+    def build(cls, options: Any, compute: Callable[[Any], Any]) -> "Memo | None":
+        """Build the memo of a field's `memoize` option: `true`, or a dict of `max-size` and `min-hit-rate`."""
+        if options is False:
+            return None
+        if options is True:
+            return cls(compute)
+        if not isinstance(options, dict):
+            raise ValueError("'memoize' must be a boolean or a dict")
+
+        parameters = cast(dict[str, Any], options)
+        unknown = parameters.keys() - {"max-size", "min-hit-rate"}
+        if unknown:
+            raise ValueError(f"unknown memoize options: {', '.join(sorted(unknown))}")
+        return cls(
+            compute,
+            parameters.get("max-size", DEFAULT_MAX_SIZE),
+            parameters.get("min-hit-rate", DEFAULT_MIN_HIT_RATE),
+        )
+
+    @property
+    def hits(self) -> int:
+        return self.cached.cache_info().hits
+
+    @property
+    def misses(self) -> int:
+        return self.cached.cache_info().misses
+
+    def _lookup_function(self) -> Callable[[Any], Any]:
+        # A closure rather than a method: it is called for every value of the field.
+        call: Callable[[Any], Any] = self.cached
+        compute = self.compute
+        countdown = self.review_interval
+        reviewed_hits = 0
+        reviewed_misses = 0
+
+        def lookup(raw_value: Any) -> Any:
+            nonlocal call, countdown, reviewed_hits, reviewed_misses
+            if raw_value.__class__ is not str:
+                return compute(raw_value)
+            countdown -= 1
+            if countdown == 0:
+                hits, misses, _, _ = self.cached.cache_info()
+                interval_hits = hits - reviewed_hits
+                if interval_hits < self.min_hit_rate * (interval_hits + misses - reviewed_misses):
+                    self.enabled = False
+                    self.cached.cache_clear()
+                    call = self.compute
+                    countdown = -1
+                else:
+                    countdown = self.review_interval
+                    reviewed_hits, reviewed_misses = hits, misses
+            return call(raw_value)
+
+        return lookup
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Cached functions cannot be pickled, the cache starts empty again on load.
+        return (Memo, (self.compute, self.max_size, self.min_hit_rate))
@@ -0,0 +1,111 @@
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import BinaryIO
+
+from .records import RecordBuffer
+from .rows import RowFailed, RowParsed, RowSkipped
+from .schema import Schema
+from .streams import Source, open_stream
+
+type Row = RowParsed | RowSkipped | RowFailed
+type Chunk = tuple[bytes, int, int]
+type Pending = deque[tuple[Future[list[Row]], Chunk]]
+
+_worker_schema: Schema | None = None
+
+
+def _initialize_worker(schema: Schema) -> None:
+    global _worker_schema
+    _worker_schema = schema
+
+
+def _parse_chunk(chunk: bytes, row_number: int, header: bytes | None) -> list[Row]:
+    assert _worker_schema is not None
+    schema = _worker_schema
+    if header is not None:
+        schema = schema.bind(schema.read_record(header))
+    return schema.parse_chunk(chunk, row_number)
+
+
+def iter_chunks(stream: BinaryIO, buffer: RecordBuffer, chunk_size: int) -> Iterator[Chunk]:
+    """Split `stream` into `(data, row_number, records)` chunks ending at record boundaries.
+
+    `row_number` is the number of records preceding the chunk, header included.
+    """
+    while block := stream.read(chunk_size):
+        chunk = buffer.push(block)
+        if chunk[2]:
+            yield chunk
+
+    chunk = buffer.flush()
+    if chunk[2]:
+        yield chunk
+
+
+def _chunk_rows(schema: Schema, future: Future[list[Row]], chunk: Chunk, header: bytes | None) -> list[Row]:
+    if future.exception() is None:
+        return future.result()
+
+    # The worker could not parse the chunk: parse it again here, record by
+    # record if need be, so that only the records which cannot be parsed fail.
+    data, row_number, _ = chunk
+    if header is not None:
+        schema = schema.bind(schema.read_record(header))
+    try:
+        return schema.parse_chunk(data, row_number)
+    except Exception:
+        pass
+
+    rows = list[Row]()
+    start = 0
+    for end in [*schema.record_splitter().boundaries(data), len(data)]:
+        if end == start:
+            continue
+        try:
+            rows += schema.parse_chunk(data[start:end], row_number)
+        except Exception as exc:
+            rows.append(RowFailed(row_number + 1, [{"error": f"cannot parse the record: {exc}"}]))
+        row_number += 1
+        start = end
+    return rows
+
+
+def parallel_parse(schema: Schema, data: Source, parallel: int | None, ordered: bool, chunk_size: int) -> Iterator[Row]:
+    if chunk_size <= 0:
+        raise ValueError("'chunk_size' must be a positive integer")
+
+    parallel = parallel or os.cpu_count() or 1
+    # Bound the chunks read ahead so memory stays proportional to the number of workers.
+    max_pending = 2 * parallel
+
+    with (
+        open_stream(data, schema.background_decompression) as stream,
+        ProcessPoolExecutor(max_workers=parallel, initializer=_initialize_worker, initargs=(schema,)) as executor,
+    ):
+        buffer = RecordBuffer(schema.record_splitter(), schema.has_header)
+        pending: Pending = deque()
+        for chunk in iter_chunks(stream, buffer, chunk_size):
+            # Workers bind the schema to the header, needed by fields given by column name.
+            future = executor.submit(_parse_chunk, chunk[0], chunk[1], buffer.header)
+            pending.append((future, chunk))
+            while len(pending) >= max_pending:
+                yield from _collect(schema, pending, ordered, buffer.header)
+
+        while pending:
+            yield from _collect(schema, pending, ordered, buffer.header)
+
+
+def _collect(schema: Schema, pending: Pending, ordered: bool, header: bytes | None) -> Iterator[Row]:
+    if ordered:
+        future, chunk = pending.popleft()
+        wait([future])
+        yield from _chunk_rows(schema, future, chunk, header)
+        return
+
+    done, _ = wait([future for future, _ in pending], return_when=FIRST_COMPLETED)
+    for item in list(pending):
+        if item[0] in done:
+            pending.remove(item)
+            yield from _chunk_rows(schema, item[0], item[1], header)
@@ -1,6 +1,6 @@
 import re
 from typing import Any
-from .transform import ParsingTransform, OnError
+from .transform import Failure, ParsingTransform, OnError, unwrap
 
 
 class PreProcessor(ParsingTransform):
@@ -45,10 +45,17 @@ class Map(PreProcessor):
         self._keys = ", ".join(f"'{key}'" for key in self.values.keys())
 
     def apply(self, value: str) -> str:
+        return unwrap(self.check(value))
+
+    def check(self, value: str) -> str | Failure:
         try:
             return self.values[value]
         except:
-            raise ValueError(f"value '{value}' does not map to any values in [{self._keys}]")
+            return Failure(
+                "unmapped-value",
+                "value '{value}' does not map to any values in [{keys}]",
+                {"value": value, "keys": self._keys},
+            )
 
     @staticmethod
     def key() -> str:
@@ -101,9 +108,16 @@ class RegexExtract(PreProcessor):
         self.pattern = _pattern
 
     def apply(self, value: str) -> str:
-        match = re.match(self.pattern, value)
+        return unwrap(self.check(value))
+
+    def check(self, value: str) -> str | Failure:
+        match = self.pattern.match(value)
         if not match:
-            raise ValueError(f"cannot extract value from pattern '{self.pattern.pattern}'")
+            return Failure(
+                "regex-extract-mismatch",
+                "cannot extract value from pattern '{pattern}'",
+                {"pattern": self.pattern.pattern},
+            )
 
         return match.group("value")
 
@@ -0,0 +1,219 @@
+import copy
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any
+
+from .fields import ComputedField, Field
+from .rows import Row, RowParsed
+from .transform import Failure, OnError, ParsingTransform, Result, SkipRow
+
+if TYPE_CHECKING:
+    from .schema import Schema
+
+
+@dataclass(slots=True)
+class TransformStats:
+    """Cumulative time and outcomes of one transform of a field.
+
+    A call ending the row with `on-error: skip-row` counts as a skip, other
+    rejected values as failures.
+    """
+
+    name: str
+    time_ns: int = 0
+    calls: int = 0
+    failures: int = 0
+    skips: int = 0
+
+    @property
+    def seconds(self) -> float:
+        return self.time_ns / 1e9
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "seconds": self.seconds,
+            "calls": self.calls,
+            "failures": self.failures,
+            "skips": self.skips,
+        }
+
+
+@dataclass(slots=True)
+class FieldStats(TransformStats):
+    """Cumulative time and outcomes of a field, reading its raw value included, and of each of its transforms."""
+
+    transforms: list[TransformStats] = field(default_factory=list[TransformStats])
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "key": self.name,
+            "seconds": self.seconds,
+            "calls": self.calls,
+            "failures": self.failures,
+            "skips": self.skips,
+            "transforms": [transform.report() for transform in self.transforms],
+        }
+
+
+class Profiler:
+    """Records where the time of a parse goes, when given to `stream_parse` or `parse`.
+
+    Statistics are kept per field key and per transform of the field, plus the
+    time spent reading and decoding rows. They accumulate over every parse
+    the profiler is given to. A compiled schema is profiled through its
+    interpreted path.
+    """
+
+    def __init__(self) -> None:
+        self.reader = TransformStats("reader")
+        self.fields = dict[str, FieldStats]()
+        self.rows = 0
+
+    def report(self) -> dict[str, Any]:
+        """Return the statistics recorded so far, ready to be dumped as JSON."""
+        return {
+            "rows": self.rows,
+            "reader": self.reader.report(),
+            "fields": [stats.report() for stats in self.fields.values()],
+        }
+
+    def field_stats(self, field: Field) -> FieldStats:
+        stats = self.fields.get(field.key)
+        if stats is None:
+            names = [transform.key() for transform in field.transforms]
+            if isinstance(field, ComputedField):
+                names.insert(0, field.builder.key())
+            stats = FieldStats(field.key, transforms=[TransformStats(name) for name in names])
+            self.fields[field.key] = stats
+        return stats
+
+    def read(self, rows: Iterable[Any]) -> Iterator[Any]:
+        """Yield the rows of a reader, recording the time taken to read each of them."""
+        stats = self.reader
+        rows = iter(rows)
+        while True:
+            start = perf_counter_ns()
+            try:
+                row = next(rows)
+            except StopIteration:
+                stats.time_ns += perf_counter_ns() - start
+                return
+            stats.time_ns += perf_counter_ns() - start
+            stats.calls += 1
+            yield row
+
+    def timed_read(self, read: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Wrap `read`, a function reading one raw record, to record its time as reader time."""
+        stats = self.reader
+
+        def timed(record: Any) -> Any:
+            start = perf_counter_ns()
+            row = read(record)
+            stats.time_ns += perf_counter_ns() - start
+            return row
+
+        return timed
+
+    def processor(self, schema: "Schema") -> Callable[[Any, int], Row]:
+        """Return a function processing a row of `schema` like `process_row`, recording the time of each field."""
+        profiled = copy.copy(schema)
+        profiled.compiled = None
+        row_fields = [ProfiledField(field, self.field_stats(field)) for field in schema.row_fields]
+        profiled.computed_fields = [ProfiledField(field, self.field_stats(field)) for field in schema.computed_fields]
+
+        def process_row(row: Any, row_number: int) -> Row:
+            self.rows += 1
+            values = dict[str, Any]()
+            fields = profiled.process_fields(row_fields, row, row_number, values)
+            if not isinstance(fields, RowParsed):
+                return fields
+            return profiled.process_computed_fields(values, row_number)
+
+        return process_row
+
+
+class ProfiledField(Field):
+    """A field recording the time and outcome of parsing it, and of each of its transforms, into `stats`."""
+
+    def __init__(self, field: Field, stats: FieldStats) -> None:
+        self.field = field
+        self.key = field.key
+        self.optional = field.optional
+        self.transforms = field.transforms
+        self.memo = field.memo
+        self.stats = stats
+
+        transform_stats = stats.transforms
+        read_stats = None
+        if isinstance(field, ComputedField):
+            read_stats, *transform_stats = transform_stats
+        self.read_stats = read_stats
+        self.checks = [
+            self.timed(transform, check, transform_stats)
+            for transform, check, transform_stats in zip(field.transforms, field.checks, transform_stats)
+        ]
+
+    @staticmethod
+    def timed(transform: ParsingTransform, check: Callable[[Any], Any], stats: TransformStats) -> Callable[[Any], Any]:
+        skip = transform.on_error == OnError.SKIP_ROW.value
+
+        def timed(value: Any) -> Any:
+            start = perf_counter_ns()
+            try:
+                result = check(value)
+            except Exception:
+                stats.time_ns += perf_counter_ns() - start
+                stats.calls += 1
+                if skip:
+                    stats.skips += 1
+                else:
+                    stats.failures += 1
+                raise
+            stats.time_ns += perf_counter_ns() - start
+            stats.calls += 1
+            if result.__class__ is Failure:
+                if skip:
+                    stats.skips += 1
+                else:
+                    stats.failures += 1
+            return result
+
+        return timed
+
+    def _read_raw_value(self, row: Any) -> str:
+        stats = self.read_stats
+        if stats is None:
+            return self.field._read_raw_value(row)  # pyright: ignore[reportPrivateUsage]
+
+        start = perf_counter_ns()
+        try:
+            return self.field._read_raw_value(row)  # pyright: ignore[reportPrivateUsage]
+        except Exception:
+            stats.failures += 1
+            raise
+        finally:
+            stats.time_ns += perf_counter_ns() - start
+            stats.calls += 1
+
+    def try_parse(self, row: Any) -> Result | Failure:
+        stats = self.stats
+        start = perf_counter_ns()
+        try:
+            result = super().try_parse(row)
+        except Exception:
+            stats.time_ns += perf_counter_ns() - start
+            stats.calls += 1
+            stats.failures += 1
+            raise
+        stats.time_ns += perf_counter_ns() - start
+        stats.calls += 1
+        if isinstance(result, SkipRow):
+            stats.skips += 1
+        elif isinstance(result, Failure):
+            stats.failures += 1
+        return result
+
+    def error(self, exception: Exception) -> dict[str, Any]:
+        return self.field.error(exception)
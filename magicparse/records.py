@@ -0,0 +1,488 @@
+import codecs
+import json
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from typing import BinaryIO, cast
+
+from .rows import Row
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+
+class RecordSplitter:
+    """Locate record boundaries in raw bytes.
+
+    A record ends with `terminator`. When `quotechar` is set, terminators
+    found inside quoted fields (CSV fields spanning several lines) are not
+    boundaries, fields being separated by `delimiter`. Scans always start at
+    the beginning of a record.
+    """
+
+    def __init__(self, terminator: bytes = b"\n", quotechar: bytes | None = None, delimiter: bytes = b",") -> None:
+        if not terminator:
+            raise ValueError("record terminator must not be empty")
+        self.terminator = terminator
+        self.quotechar = quotechar
+        self.delimiter = delimiter
+
+    def terminators(self, data: bytes, start: int, end: int) -> Iterator[int]:
+        """Yield the offset following each terminator in `data[start:end]`, quoted or not."""
+        terminator = self.terminator
+        position = start
+        while (found := data.find(terminator, position, end)) >= 0:
+            position = found + len(terminator)
+            yield position
+
+    def boundaries(self, data: bytes, start: int = 0, end: int | None = None) -> Iterator[int]:
+        """Yield the offset following each record terminator in `data[start:end]`."""
+        end = len(data) if end is None else end
+        quotechar = self.quotechar
+        if quotechar is None or data.find(quotechar, start, end) < 0:
+            yield from self.terminators(data, start, end)
+            return
+
+        quoted = False
+        position = start
+        for line_end in self.terminators(data, start, end):
+            quoted = ends_quoted(data, self.delimiter, quotechar, quoted, position, line_end)
+            position = line_end
+            if not quoted:
+                yield position
+
+    def countable(self, data: bytes, start: int, end: int) -> bool:
+        """Whether every terminator in `data[start:end]` ends a record, so records can be counted at once."""
+        return self.quotechar is None or data.find(self.quotechar, start, end) < 0
+
+    def scan(self, data: bytes, start: int = 0, end: int | None = None) -> tuple[int, int]:
+        """Return the number of complete records in `data[start:end]` and the offset following the last one."""
+        end = len(data) if end is None else end
+        if self.countable(data, start, end):
+            count = data.count(self.terminator, start, end)
+            last = data.rfind(self.terminator, start, end)
+            return count, (last + len(self.terminator) if last >= 0 else start)
+
+        count = 0
+        last = start
+        for last in self.boundaries(data, start, end):
+            count += 1
+        return count, last
+
+    def count(self, data: bytes) -> int:
+        """Return the number of records in `data`, counting a trailing unterminated record."""
+        count, last = self.scan(data)
+        return count + 1 if last < len(data) else count
+
+    def skip(self, data: bytes, records: int, start: int = 0) -> tuple[int, int]:
+        """Skip at most `records` records from `start`.
+
+        Return the number of records skipped and the offset following the last of them.
+        """
+        if records <= 0:
+            return 0, start
+        if self.countable(data, start, len(data)):
+            count, end = self.scan(data, start)
+            if count <= records:
+                return count, end
+
+        skipped = 0
+        position = start
+        for position in self.boundaries(data, start):
+            skipped += 1
+            if skipped == records:
+                break
+        return skipped, position
+
+
+class LineSplitter(RecordSplitter):
+    """Locate the boundaries of lines ending with a line feed, a carriage return or both.
+
+    `line_ends` holds the encoded carriage return and line feed, then any
+    other byte ending lines, as `split_lines` does. A carriage return ending
+    the scanned data is not a boundary yet, as a line feed may follow it.
+    """
+
+    def __init__(self, line_ends: bytes = b"\r\n", quotechar: bytes | None = None, delimiter: bytes = b",") -> None:
+        super().__init__(line_ends[1:2], quotechar, delimiter)
+        self.line_ends = line_ends
+        self.line = _line_regex(line_ends)
+
+    def regular(self, data: bytes, start: int, end: int) -> bool:
+        """Whether lines in `data[start:end]` only end with line feeds, possibly preceded by carriage returns."""
+        carriage_return = self.line_ends[:1]
+        carriage_returns = data.count(carriage_return, start, end)
+        if carriage_returns and carriage_returns != data.count(self.line_ends[:2], start, end):
+            return False
+        return all(
+            data.find(self.line_ends[index : index + 1], start, end) < 0 for index in range(2, len(self.line_ends))
+        )
+
+    def terminators(self, data: bytes, start: int, end: int) -> Iterator[int]:
+        if self.regular(data, start, end):
+            yield from super().terminators(data, start, end)
+            return
+
+        if data.endswith(self.line_ends[:1], start, end):
+            end -= 1
+        for line in self.line.finditer(data, start, end):
+            yield line.end()
+
+    def countable(self, data: bytes, start: int, end: int) -> bool:
+        return super().countable(data, start, end) and self.regular(data, start, end)
+
+
+class FixedLengthSplitter(RecordSplitter):
+    """Locate the boundaries of records of exactly `length` bytes, without terminator."""
+
+    def __init__(self, length: int) -> None:
+        if length <= 0:
+            raise ValueError("record length must be a positive integer")
+        self.length = length
+
+    def boundaries(self, data: bytes, start: int = 0, end: int | None = None) -> Iterator[int]:
+        end = len(data) if end is None else end
+        return iter(range(start + self.length, end + 1, self.length))
+
+    def scan(self, data: bytes, start: int = 0, end: int | None = None) -> tuple[int, int]:
+        end = len(data) if end is None else end
+        count = max(end - start, 0) // self.length
+        return count, start + count * self.length
+
+    def count(self, data: bytes) -> int:
+        return -(-len(data) // self.length)
+
+    def skip(self, data: bytes, records: int, start: int = 0) -> tuple[int, int]:
+        count, _ = self.scan(data, start)
+        skipped = min(max(records, 0), count)
+        return skipped, start + skipped * self.length
+
+
+class RecordBuffer:
+    """Accumulate raw chunks and release them as whole records.
+
+    Records are numbered like `Schema.stream_parse` numbers rows: the header,
+    when there is one, is record 1 and is never released but kept in `header`.
+    """
+
+    def __init__(self, splitter: RecordSplitter, has_header: bool = False) -> None:
+        self.splitter = splitter
+        self.pending = b""
+        self.row_number = 0
+        self.skip_header = has_header
+        self.header: bytes | None = None
+
+    def push(self, chunk: bytes) -> tuple[bytes, int, int]:
+        """Add `chunk` and return the records it completes.
+
+        Return the records' bytes, the number of records preceding them and
+        their count.
+        """
+        data = self.pending + chunk if self.pending else chunk
+        start = 0
+        if self.skip_header:
+            skipped, start = self.splitter.skip(data, 1)
+            if not skipped:
+                self.pending = data
+                return b"", self.row_number, 0
+            self.skip_header = False
+            self.header = data[:start]
+            self.row_number += 1
+
+        records, end = self.splitter.scan(data, start)
+        self.pending = data[end:] if records else data[start:]
+        return self._release(data[start:end] if records else b"", records)
+
+    def flush(self) -> tuple[bytes, int, int]:
+        """Return the last, unterminated, record."""
+        data, self.pending = self.pending, b""
+        if not data or self.skip_header:
+            return b"", self.row_number, 0
+        return self._release(data, self.splitter.count(data))
+
+    def _release(self, data: bytes, records: int) -> tuple[bytes, int, int]:
+        row_number = self.row_number
+        self.row_number += records
+        return data, row_number, records
+
+
+def line_ends(encoding: str) -> str:
+    """The characters ending lines of `encoding`, as `split_lines` expects them: NEL is one for EBCDIC codecs."""
+    if "\n".encode(encoding) == b"\x25":
+        return "\r\n\x85"
+    return "\r\n"
+
+
+def strip_line_end(record: bytes, line_ends: bytes = b"\r\n") -> bytes:
+    """Remove the line end of a record, `line_ends` being encoded as `split_lines` expects them."""
+    if record.endswith(line_ends[1:2]):
+        return record[:-1].removesuffix(line_ends[:1])
+    if record and record[-1:] in line_ends:
+        return record[:-1]
+    return record
+
+
+def read_blocks(stream: BinaryIO, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[bytes]:
+    """Read `stream` by blocks of `block_size` bytes."""
+    while block := stream.read(block_size):
+        yield block
+
+
+def decode_blocks(stream: BinaryIO, encoding: str, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[str]:
+    """Decode `stream` by blocks of `block_size` bytes, multi-byte characters possibly spanning two blocks."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for block in read_blocks(stream, block_size):
+        if text := decoder.decode(block):
+            yield text
+    if text := decoder.decode(b"", True):
+        yield text
+
+
+def read_fixed_length_records(
+    stream: BinaryIO, length: int, strict: bool = False, block_size: int = DEFAULT_BLOCK_SIZE
+) -> Iterator[bytes]:
+    """Read records of exactly `length` bytes, by blocks holding a whole number of them.
+
+    A shorter last record is yielded too, unless `strict`, in which case the
+    content must be a whole number of records.
+    """
+    size = max(block_size // length, 1) * length
+    pending = b""
+    while block := stream.read(size):
+        data = pending + block if pending else block
+        end = len(data) - len(data) % length
+        yield from [data[start : start + length] for start in range(0, end, length)]
+        pending = data[end:]
+
+    if pending:
+        if strict:
+            raise ValueError(f"the last record is {len(pending)} bytes long, records are {length} bytes long")
+        yield pending
+
+
+def split_records[T: (bytes, str)](
+    blocks: Iterable[T],
+    terminator: T,
+    quotechar: T | None = None,
+    strip: T | None = None,
+    delimiter: T | None = None,
+) -> Iterator[T]:
+    """Split the content of `blocks` into records, without their terminator.
+
+    When `quotechar` is set, terminators inside quoted fields do not end
+    records, as `RecordSplitter` does, fields being separated by `delimiter`,
+    a comma by default. A trailing `strip`, such as the `\r` of `\r\n` line
+    ends, is removed from each record.
+    """
+    pending: T | None = None
+    for block in blocks:
+        data = pending + block if pending else block
+        # Methods of bytes and str are typed separately, their results are of type T.
+        records = cast(list[T], data.split(terminator))
+        pending = records.pop()
+        if quotechar is not None and data.find(quotechar) >= 0:
+            if delimiter is None:
+                delimiter = cast(T, b"," if isinstance(terminator, bytes) else ",")
+            records, unclosed = _join_quoted(records, terminator, quotechar, delimiter)
+            if unclosed is not None:
+                pending = unclosed + terminator + pending
+        if strip is not None and data.find(strip) >= 0:
+            records = [cast(T, record.removesuffix(strip)) for record in records]
+        yield from records
+
+    if pending:
+        yield cast(T, pending.removesuffix(strip)) if strip is not None else pending
+
+
+def _join_quoted[T: (bytes, str)](
+    lines: list[T], terminator: T, quotechar: T, delimiter: T
+) -> tuple[list[T], T | None]:
+    """Join the lines of records spanning several of them: those ending inside a quoted field.
+
+    Return the records and the start of the last one when its quotes are not closed yet.
+    """
+    records = list[T]()
+    unclosed: T | None = None
+    for line in lines:
+        quoted = ends_quoted(line, delimiter, quotechar, unclosed is not None)
+        if unclosed is not None:
+            line = unclosed + terminator + line
+        if quoted:
+            unclosed = line
+        else:
+            records.append(line)
+            unclosed = None
+    return records, unclosed
+
+
+def ends_quoted[T: (bytes, str)](
+    line: T, delimiter: T, quotechar: T, quoted: bool = False, start: int = 0, end: int | None = None
+) -> bool:
+    """Whether `line[start:end]` ends inside a quoted field, starting inside one when `quoted`.
+
+    Like `csv`, a quote only opens a quoted field at the start of a field, and
+    a doubled quote inside a quoted field does not close it.
+    """
+    end = len(line) if end is None else end
+    position = start
+    while True:
+        if quoted:
+            closing = line.find(quotechar, position, end)
+            if closing < 0:
+                return True
+            position = closing + len(quotechar)
+            if line.startswith(quotechar, position, end):
+                position += len(quotechar)
+                continue
+            quoted = False
+        elif line.startswith(quotechar, position, end):
+            quoted = True
+            position += len(quotechar)
+            continue
+
+        separator = line.find(delimiter, position, end)
+        if separator < 0:
+            return False
+        position = separator + len(delimiter)
+
+
+def split_lines[T: (bytes, str)](blocks: Iterable[T], line_ends: T, keepends: bool = False) -> Iterator[T]:
+    """Split the content of `blocks` into lines, like files opened with `newline=''`.
+
+    `line_ends` holds the carriage return and the line feed, then any other
+    character ending lines: a line ends with a line feed, a carriage return
+    or both. With `keepends`, lines keep their end, as `csv` expects them.
+    """
+    carriage_return, line_feed, other_ends = cast(tuple[T, T, T], (line_ends[:1], line_ends[1:2], line_ends[2:]))
+    others = _any_of(other_ends)
+    # `splitlines` ends lines with ASCII carriage returns and line feeds, and text lines with a few more characters.
+    ascii_ends = line_ends[:2] == "\r\n" or line_ends[:2] == b"\r\n"
+    if isinstance(other_ends, str):
+        irregular = _any_of(cast(T, "".join(sorted({*_SPLITLINES_ENDS} ^ {*other_ends}))))
+    else:
+        irregular = others
+    line = _line_regex(line_ends)
+    pending: T | None = None
+    for block in blocks:
+        data = pending + block if pending else block
+        if not keepends and data.find(carriage_return) < 0 and (others is None or others.search(data) is None):
+            lines = cast(list[T], data.split(line_feed))
+            pending = lines.pop()
+            yield from lines
+            continue
+
+        if ascii_ends and (irregular is None or irregular.search(data) is None):
+            lines = cast(list[T], data.splitlines(keepends))
+            if data.endswith(carriage_return):
+                # A carriage return ending the block may be followed by a line feed in the next one.
+                pending = lines.pop() if keepends else lines.pop() + carriage_return
+            elif data[-1:] in line_ends:
+                pending = None
+            else:
+                pending = lines.pop()
+            yield from lines
+            continue
+
+        end = len(data) - 1 if data.endswith(carriage_return) else len(data)
+        lines = line.findall(data, 0, end)
+        pending = data[sum(map(len, lines)) :]
+        yield from lines if keepends else [cast(T, record.rstrip(line_ends)) for record in lines]
+
+    if pending:
+        yield pending if keepends else cast(T, pending.rstrip(line_ends))
+
+
+# Characters `str.splitlines` ends lines with, besides `\r` and `\n`.
+_SPLITLINES_ENDS = "\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+def _any_of[T: (bytes, str)](characters: T) -> re.Pattern[T] | None:
+    """Match any of `characters`, single bytes in bytes, or `None` without any."""
+    if not characters:
+        return None
+    # Single bytes are mapped by latin-1 to the same code points.
+    text = characters.decode("latin-1") if isinstance(characters, bytes) else characters
+    pattern = f"[{re.escape(text)}]"
+    return cast(re.Pattern[T], re.compile(pattern.encode("latin-1") if isinstance(characters, bytes) else pattern))
+
+
+def _line_regex[T: (bytes, str)](line_ends: T) -> re.Pattern[T]:
+    """Match a line and its end, a carriage return followed by a line feed being a single end."""
+    # Line ends of byte records are single bytes, which latin-1 maps to the same code points.
+    ends = line_ends.decode("latin-1") if isinstance(line_ends, bytes) else line_ends
+    carriage_return, line_feed, others = re.escape(ends[:1]), re.escape(ends[1:2]), re.escape(ends[2:])
+    pattern = f"[^{carriage_return}{line_feed}{others}]*(?:{carriage_return}{line_feed}?|{line_feed}"
+    pattern += f"|[{others}])" if others else ")"
+    if isinstance(line_ends, bytes):
+        return cast(re.Pattern[T], re.compile(pattern.encode("latin-1")))
+    return cast(re.Pattern[T], re.compile(pattern))
+
+
+@dataclass(frozen=True, slots=True)
+class Checkpoint:
+    """Position of a record to resume parsing from: its byte offset and its row number."""
+
+    offset: int
+    row_number: int
+
+    @classmethod
+    def at(cls, row: Row) -> "Checkpoint":
+        """Checkpoint resuming at `row`, which must come from `stream_parse(..., with_offsets=True)`."""
+        if row.offset is None:
+            raise ValueError("row has no offset, parse with 'with_offsets=True'")
+        return cls(offset=row.offset, row_number=row.row_number)
+
+    def dumps(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def loads(cls, data: str | bytes) -> "Checkpoint":
+        return cls(**json.loads(data))
+
+
+def skip_records(
+    stream: BinaryIO, splitter: RecordSplitter, records: int, block_size: int = DEFAULT_BLOCK_SIZE
+) -> tuple[int, int]:
+    """Skip `records` records from the current position of `stream`, only looking for their boundaries.
+
+    Return the number of records skipped and the offset following the last of
+    them, the end of the stream when it holds fewer records.
+    """
+    offset = stream.tell()
+    skipped = 0
+    pending = b""
+    while skipped < records:
+        block = stream.read(block_size)
+        if not block:
+            if pending:
+                # The last record has no terminator.
+                skipped += 1
+                offset += len(pending)
+            break
+
+        data = pending + block if pending else block
+        count, end = splitter.skip(data, records - skipped)
+        skipped += count
+        offset += end
+        pending = data[end:]
+    return skipped, offset
+
+
+def iter_records(
+    stream: BinaryIO, splitter: RecordSplitter, offset: int = 0, block_size: int = DEFAULT_BLOCK_SIZE
+) -> Iterator[tuple[int, bytes]]:
+    """Yield each record of `stream`, terminator included, with its byte offset.
+
+    `offset` is the position of the stream when called.
+    """
+    pending = b""
+    while block := stream.read(block_size):
+        data = pending + block if pending else block
+        start = 0
+        for end in splitter.boundaries(data):
+            yield offset + start, data[start:end]
+            start = end
+        offset += start
+        pending = data[start:]
+
+    if pending:
+        yield offset, pending
@@ -0,0 +1,137 @@
+import dataclasses
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Self, cast
+
+from .transform import Failure
+
+if TYPE_CHECKING:
+    from .fields import Field
+
+
+class CompactValues(Mapping[str, Any]):
+    """Read-only values of a row stored as a tuple.
+
+    The `key_index`, mapping each key to its position, is shared by every row
+    of a schema, so a row only holds its values. It compares equal to a dict
+    holding the same items.
+    """
+
+    __slots__ = ("key_index", "data")
+
+    def __init__(self, key_index: dict[str, int], data: tuple[Any, ...]) -> None:
+        self.key_index = key_index
+        self.data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[self.key_index[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.key_index)
+
+    def __len__(self) -> int:
+        return len(self.key_index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.key_index
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactValues) and other.key_index is self.key_index:
+            return self.data == other.data
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (CompactValues, (self.key_index, self.data))
+
+
+@dataclass(frozen=True, slots=True)
+class RowParsed:
+    row_number: int
+    values: dict[str, Any] | CompactValues
+    offset: int | None = field(default=None, compare=False, repr=False)
+
+
+@dataclass(frozen=True, slots=True)
+class FieldFailure:
+    """Why a field could not be parsed: a `Failure` of a built-in transform or a raised exception."""
+
+    field: "Field"
+    reason: Failure | Exception
+
+    @property
+    def code(self) -> str:
+        return self.reason.code if isinstance(self.reason, Failure) else "error"
+
+    @property
+    def params(self) -> Mapping[str, Any]:
+        return self.reason.params if isinstance(self.reason, Failure) else {"message": str(self.reason)}
+
+    def error(self) -> dict[str, Any]:
+        reason = self.reason
+        return self.field.error(reason.exception() if isinstance(reason, Failure) else reason)
+
+
+type PendingFailure = tuple["Field", Failure | Exception]
+
+
+@dataclass(frozen=True, slots=True)
+class _RowWithErrors:
+    """A row which could not be parsed.
+
+    When built `from_failures`, its `errors` are only formatted when first read.
+    """
+
+    row_number: int
+    errors: list[dict[str, Any]]
+    offset: int | None = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_failures(cls, row_number: int, failures: Sequence[PendingFailure]) -> Self:
+        """Row failing because of `failures`, pairs of a field and the reason it could not be parsed."""
+        row = cls(row_number, cast(list[dict[str, Any]], None))
+        object.__setattr__(row, "_failures", failures)
+        return row
+
+    @property
+    def failures(self) -> list[FieldFailure]:
+        """The structured failures of a parsed row, empty when the row was given its `errors`."""
+        return [FieldFailure(field, reason) for field, reason in getattr(self, "_failures", ())]
+
+    def __replace__(self, **changes: Any) -> Self:
+        # Errors left to format are kept so.
+        if "errors" in changes or _ERRORS.__get__(self) is not None:
+            return dataclasses.replace(self, **changes)
+        fields: dict[str, Any] = {"row_number": self.row_number, "errors": None, "offset": self.offset}
+        row = type(self)(**(fields | changes))
+        object.__setattr__(row, "_failures", getattr(self, "_failures"))
+        return row
+
+
+_ERRORS: Any = _RowWithErrors.__dict__["errors"]
+
+
+def _errors(row: _RowWithErrors) -> list[dict[str, Any]]:
+    errors = _ERRORS.__get__(row)
+    if errors is None:
+        errors = [failure.error() for failure in row.failures]
+        _ERRORS.__set__(row, errors)
+    return errors
+
+
+# The `errors` slot is read through a property formatting them on first read.
+setattr(_RowWithErrors, "errors", property(_errors, _ERRORS.__set__))
+
+
+class RowSkipped(_RowWithErrors):
+    # The failures whose errors are not formatted yet, only set by `from_failures`.
+    __slots__ = ("_failures",)
+
+
+class RowFailed(_RowWithErrors):
+    __slots__ = ("_failures",)
+
+
+type Row = RowParsed | RowSkipped | RowFailed
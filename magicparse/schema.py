@@ -1,31 +1,53 @@
-import codecs
+import copy
 from abc import ABC, abstractmethod
-from collections.abc import Iterable, Iterator
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Executor
 import csv
-from dataclasses import dataclass
-
-from magicparse.transform import SkipRow
-from .fields import Field, ComputedField
+from itertools import islice, takewhile
+
+from .transform import Ok, SkipRow
+from .compiler import CompiledRow
+from .index import DEFAULT_INDEX_STEP, RowIndex
+from .fields import ColumnarField, ComputedField, CsvField, Field, IndexedField, MissingField
+from .layouts import ColumnarLayout, is_byte_splittable_encoding, is_single_byte_encoding
+from .records import (
+    Checkpoint,
+    FixedLengthSplitter,
+    LineSplitter,
+    RecordSplitter,
+    decode_blocks,
+    iter_records,
+    line_ends,
+    read_blocks,
+    read_fixed_length_records,
+    skip_records,
+    split_lines,
+    split_records,
+    strip_line_end,
+)
+from .rows import CompactValues, PendingFailure, RowFailed, RowParsed, RowSkipped
+from .streams import Source, open_stream
 from io import BytesIO
-from typing import Any
-
-
-@dataclass(frozen=True, slots=True)
-class RowParsed:
-    row_number: int
-    values: dict[str, Any]
-
-
-@dataclass(frozen=True, slots=True)
-class RowSkipped:
-    row_number: int
-    errors: list[dict[str, Any]]
-
-
-@dataclass(frozen=True, slots=True)
-class RowFailed:
-    row_number: int
-    errors: list[dict[str, Any]]
+from os import PathLike
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from .arrays import ColumnBatch
+    from .arrow import RejectedHandler
+    from .incremental import IncrementalParser
+    from .profiling import Profiler
+    from .sinks import Sink, WrittenRows
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_ARRAY_BATCH_SIZE = 8192
+DEFAULT_READ_SIZE = 64 * 1024
+HEADER_BLOCK_SIZE = 4 * 1024
+ROW_FORMATS = ("dict", "compact")
+DEFAULT_RECORD_TYPE_KEY = "record-type"
+MAX_BOUND_SCHEMAS = 16
+"""Schemas bound to distinct header layouts kept per CSV schema."""
 
 
 class Schema(ABC):
@@ -35,15 +57,78 @@ class Schema(ABC):
 
     def __init__(self, options: dict[str, Any]) -> None:
         self.fields = [Field.build(item) for item in options["fields"]]
-        self.computed_fields = [ComputedField.build(item) for item in options.get("computed-fields", [])]
+        self.computed_fields: list[Field] = [ComputedField.build(item) for item in options.get("computed-fields", [])]
 
         self.has_header = options.get("has_header", False)
         self.encoding = options.get("encoding", "utf-8")
+        self.record_terminator: str = options.get("record-terminator", "\n")
+        if not self.record_terminator:
+            raise ValueError("'record-terminator' must not be empty")
+        self.background_decompression: bool = options.get("background-decompression", False)
+
+        row_format = options.get("row-format", "dict")
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"unknown row format '{row_format}', expected one of {', '.join(ROW_FORMATS)}")
+        self.key_index: dict[str, int] | None = None
+        if row_format == "compact":
+            keys = dict.fromkeys(field.key for field in [*self.fields, *self.computed_fields])
+            self.key_index = {key: position for position, key in enumerate(keys)}
+
+        self.hidden_keys = tuple[str, ...]()
+        self.selections = dict[tuple[str, ...], "Schema"]()
+        self.compiled: CompiledRow | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Generated functions cannot be pickled, they are generated again on load.
+        state = self.__dict__.copy()
+        state["compiled"] = state["compiled"] is not None
+        state["selections"] = {}
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        compiled = state.pop("compiled")
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.compiled = None
+        if compiled:
+            self.compile()
+
+    @property
+    def row_fields(self) -> Sequence[Field]:
+        """Fields processing the rows yielded by `get_reader`."""
+        return self.fields
 
     @abstractmethod
     def get_reader(self, stream: BytesIO) -> Iterator[list[str] | str]:
         pass
 
+    def record_splitter(self) -> RecordSplitter:
+        """Return the splitter locating record boundaries in this schema's raw bytes."""
+        terminators = line_ends(self.encoding) if self.record_terminator == "\n" else self.record_terminator
+        encoded = terminators.encode(self.encoding)
+        if len(encoded) != len(terminators) or not is_byte_splittable_encoding(self.encoding):
+            raise ValueError(f"encoding '{self.encoding}' cannot be split into records at the byte level")
+        if self.record_terminator == "\n":
+            return LineSplitter(encoded)
+        return RecordSplitter(encoded)
+
+    def decode_records(self, stream: BytesIO) -> Iterator[str]:
+        """Decode `stream` by large blocks and split it into records, without their terminator.
+
+        The default `\n` terminator ends records with `\n`, `\r\n` or `\r`,
+        and with NEL in EBCDIC.
+        """
+        blocks = decode_blocks(stream, self.encoding)
+        if self.record_terminator == "\n":
+            return split_lines(blocks, line_ends(self.encoding))
+        return split_records(blocks, self.record_terminator)
+
+    def strip_terminator(self, record: bytes) -> bytes:
+        """Remove the terminator ending a raw record, if any."""
+        if self.record_terminator == "\n":
+            return strip_line_end(record, line_ends(self.encoding).encode(self.encoding))
+        return record.removesuffix(self.record_terminator.encode(self.encoding))
+
     @staticmethod
     @abstractmethod
     def key() -> str:
@@ -53,10 +138,13 @@ class Schema(ABC):
     def build(cls, options: dict[str, Any]) -> "Schema":
         file_type = options["file_type"]
         schema = cls.registry.get(file_type)
-        if schema:
-            return schema(options)
+        if not schema:
+            raise ValueError("unknown file type")
 
-        raise ValueError("unknown file type")
+        built = schema(options)
+        if options.get("compile", False):
+            built.compile()
+        return built
 
     @classmethod
     def register(cls, schema: type["Schema"]) -> None:
@@ -65,67 +153,454 @@ class Schema(ABC):
 
         cls.registry[schema.key()] = schema
 
-    def parse(self, data: bytes | BytesIO) -> list[RowParsed | RowSkipped | RowFailed]:
-        return list(self.stream_parse(data))
-
-    def stream_parse(self, data: bytes | BytesIO) -> Iterable[RowParsed | RowSkipped | RowFailed]:
-        if isinstance(data, bytes):
-            stream = BytesIO(data)
-        else:
-            stream = data
-
-        reader = self.get_reader(stream)
+    def parse(
+        self,
+        data: Source,
+        profiler: "Profiler | None" = None,
+        select: Sequence[str] | None = None,
+        start_row: int | None = None,
+        stop_row: int | None = None,
+        limit: int | None = None,
+    ) -> list[RowParsed | RowSkipped | RowFailed]:
+        return list(
+            self.stream_parse(
+                data, profiler=profiler, select=select, start_row=start_row, stop_row=stop_row, limit=limit
+            )
+        )
 
+    def stream_parse(
+        self,
+        data: Source,
+        resume_from: Checkpoint | None = None,
+        with_offsets: bool = False,
+        profiler: "Profiler | None" = None,
+        select: Sequence[str] | None = None,
+        start_row: int | None = None,
+        stop_row: int | None = None,
+        limit: int | None = None,
+        index: RowIndex | None = None,
+    ) -> Iterable[RowParsed | RowSkipped | RowFailed]:
+        """Parse rows lazily from raw bytes, a binary stream, a file path or a file descriptor.
+
+        With `with_offsets`, each row carries the byte offset of its record, from
+        which a `Checkpoint` can be taken. Parsing `resume_from` a checkpoint seeks
+        straight to its record and numbers rows from there. A `profiler` records
+        the time spent reading rows and in each field and transform. With
+        `select`, rows only hold the given keys, see `select()`.
+
+        Only rows numbered from `start_row` up to, but not including, `stop_row`
+        are parsed, at most `limit` of them. Records before `start_row` are
+        skipped by looking for their boundaries only, from the closest record
+        of `index` when given, see `find_row()`.
+        """
+        if select is not None:
+            yield from self.select(select).stream_parse(
+                data, resume_from, with_offsets, profiler, None, start_row, stop_row, limit, index
+            )
+            return
+
+        if start_row is not None and start_row < 1:
+            raise ValueError("'start_row' must be a positive integer")
+        if stop_row is not None and stop_row < 1:
+            raise ValueError("'stop_row' must be a positive integer")
+        if limit is not None and limit < 0:
+            raise ValueError("'limit' must be a positive integer or zero")
+
+        with open_stream(data, self.background_decompression) as stream:
+            if start_row is not None:
+                if resume_from is not None:
+                    raise ValueError("'start_row' and 'resume_from' cannot be combined")
+                resume_from = self.find_row(stream, start_row, index)
+
+            rows = self.parse_stream(stream, resume_from, with_offsets, profiler)
+            if stop_row is not None:
+                rows = takewhile(lambda row: row.row_number < stop_row, rows)
+            if limit is not None:
+                rows = islice(rows, limit)
+            yield from rows
+
+    def parse_stream(
+        self,
+        stream: BytesIO,
+        resume_from: Checkpoint | None = None,
+        with_offsets: bool = False,
+        profiler: "Profiler | None" = None,
+    ) -> Iterator[RowParsed | RowSkipped | RowFailed]:
+        """Parse the rows of an open `stream`, see `stream_parse()`."""
+        schema = self
+        offset = 0
         row_number = 0
-        if self.has_header:
-            next(reader)
+        if resume_from is not None and resume_from.offset > 0:
+            if self.has_header:
+                schema = self.bind(self.read_header(stream))
+            offset = resume_from.offset
+            row_number = resume_from.row_number - 1
+            stream.seek(offset)
+        skip_header = self.has_header and offset == 0
+
+        if with_offsets:
+            yield from schema.parse_records(stream, offset, row_number, skip_header, profiler)
+            return
+
+        reader = schema.get_reader(stream)
+        if profiler is not None:
+            reader = profiler.read(reader)
+        if skip_header:
+            schema = self.bind(next(reader, None))
             row_number += 1
 
+        yield from schema.parse_rows(reader, row_number, profiler)
+
+    def find_row(self, stream: BytesIO, row_number: int, index: RowIndex | None = None) -> Checkpoint:
+        """Return the checkpoint of the row numbered `row_number` in `stream`.
+
+        Preceding records are neither decoded nor parsed: only their boundaries
+        are looked for, taking quoted fields spanning several lines into account.
+        With an `index` of the stream, they are looked for from the closest
+        indexed record.
+        """
+        if index is not None:
+            index.check(stream)
+            return index.checkpoint(stream, self.record_splitter(), row_number)
+
+        stream.seek(0)
+        _, offset = skip_records(stream, self.record_splitter(), row_number - 1)
+        return Checkpoint(offset=offset, row_number=row_number)
+
+    def build_index(self, data: Source, step: int = DEFAULT_INDEX_STEP) -> RowIndex:
+        """Index the byte offset of every `step`-th record of `data`, see `RowIndex`."""
+        with open_stream(data, self.background_decompression) as stream:
+            return RowIndex.build(stream, self.record_splitter(), step)
+
+    def fetch_rows(
+        self, data: Source, row_numbers: Iterable[int], index: RowIndex | None = None
+    ) -> list[RowParsed | RowSkipped | RowFailed]:
+        """Parse the rows numbered `row_numbers`, in increasing order, seeking to each run of consecutive rows.
+
+        Numbers of blank rows, of the header or past the end of `data` are ignored.
+        """
+        wanted = sorted(set(row_numbers))
+        if wanted and wanted[0] < 1:
+            raise ValueError("row numbers must be positive integers")
+
+        rows = list[RowParsed | RowSkipped | RowFailed]()
+        with open_stream(data, self.background_decompression) as stream:
+            if index is not None:
+                index.check(stream)
+            position = 0
+            while position < len(wanted):
+                first = last = wanted[position]
+                while position + 1 < len(wanted) and wanted[position + 1] == last + 1:
+                    position += 1
+                    last = wanted[position]
+                position += 1
+
+                if index is not None:
+                    checkpoint = index.checkpoint(stream, self.record_splitter(), first)
+                else:
+                    checkpoint = self.find_row(stream, first)
+                for row in self.parse_stream(stream, checkpoint):
+                    if row.row_number > last:
+                        break
+                    rows.append(row)
+        return rows
+
+    def stream_parse_arrays(
+        self,
+        data: Source,
+        batch_size: int = DEFAULT_ARRAY_BATCH_SIZE,
+        select: Sequence[str] | None = None,
+        exact_decimals: bool = False,
+    ) -> Iterator["ColumnBatch"]:
+        """Parse `data` into column-oriented batches of `batch_size` rows, one NumPy array per field.
+
+        `int` and `decimal` fields only checked by `greater-than` and post-processed
+        by `divide` and `round` are converted with array operations, into `int64`
+        or `float64` arrays: decimals lose their exact representation, unless
+        `exact_decimals` keeps them `Decimal`s. Rows which could not be parsed are
+        reported in each batch's `rejected`. Requires numpy.
+        """
+        from .arrays import parse_arrays
+
+        schema = self.select(select)
+        with open_stream(data, self.background_decompression) as stream:
+            reader = schema.get_reader(stream)
+            row_number = 0
+            if schema.has_header:
+                schema = schema.bind(next(reader, None))
+                row_number += 1
+
+            yield from parse_arrays(schema, reader, row_number, batch_size, exact_decimals)
+
+    def stream_parse_batches(
+        self,
+        data: Source,
+        batch_size: int = DEFAULT_ARRAY_BATCH_SIZE,
+        on_rejected: "RejectedHandler | None" = None,
+        select: Sequence[str] | None = None,
+        types: dict[str, Any] | None = None,
+        timezone: str = "UTC",
+    ) -> Iterator[Any]:
+        """Parse `data` into `pyarrow.RecordBatch`es of up to `batch_size` rows.
+
+        The Arrow schema is derived from the fields' `type`, see `arrow.arrow_type`,
+        unless given in `types` by key. Skipped and failed rows are not part of
+        the batches: they are passed to `on_rejected`. Requires pyarrow.
+        """
+        from .arrow import stream_parse_batches
+
+        return stream_parse_batches(self, data, batch_size, on_rejected, select, types, timezone)
+
+    def write_parquet(
+        self,
+        data: Source,
+        path: str | PathLike[str],
+        batch_size: int = DEFAULT_ARRAY_BATCH_SIZE,
+        on_rejected: "RejectedHandler | None" = None,
+        select: Sequence[str] | None = None,
+        types: dict[str, Any] | None = None,
+        timezone: str = "UTC",
+        **options: Any,
+    ) -> int:
+        """Parse `data` into the Parquet file at `path`, see `stream_parse_batches`, return the rows written."""
+        from .arrow import write_parquet
+
+        return write_parquet(self, data, path, batch_size, on_rejected, select, types, timezone, **options)
+
+    def convert(
+        self,
+        data: Source,
+        parsed: "Sink | None" = None,
+        failed: "Sink | None" = None,
+        skipped: "Sink | None" = None,
+        select: Sequence[str] | None = None,
+    ) -> "WrittenRows":
+        """Parse `data` and write its parsed, failed and skipped rows to their sink as they come.
+
+        Rows are never all held in memory. Rows of a kind without a sink are
+        dropped; the sinks are flushed but left open.
+        """
+        from .sinks import write_rows
+
+        return write_rows(self.stream_parse(data, select=select), parsed, failed, skipped)
+
+    def parallel_parse(
+        self,
+        data: Source,
+        parallel: int | None = None,
+        ordered: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[RowParsed | RowSkipped | RowFailed]:
+        """Parse `data` in `parallel` worker processes.
+
+        The input is split into chunks of about `chunk_size` bytes at record
+        boundaries. Rows keep the `row_number` they would have with
+        `stream_parse`; with `ordered=False` they are emitted as soon as their
+        chunk is parsed.
+        """
+        from .parallel import parallel_parse
+
+        return parallel_parse(self, data, parallel, ordered, chunk_size)
+
+    def astream_parse(
+        self,
+        source: AsyncIterable[bytes],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        executor: Executor | None = None,
+        read_size: int = DEFAULT_READ_SIZE,
+    ) -> AsyncIterator[RowParsed | RowSkipped | RowFailed]:
+        """Parse rows from an async byte source, such as an `asyncio.StreamReader`, as they arrive.
+
+        Records are gathered in batches of at least `batch_size` rows, each
+        parsed in `executor` (the event loop's default one when `None`) so the
+        event loop is not blocked.
+        """
+        from .aio import astream_parse
+
+        return astream_parse(self, source, batch_size, executor, read_size)
+
+    def incremental_parser(self) -> "IncrementalParser":
+        """Return a push-style parser: `feed()` it chunks of bytes, then `close()` it."""
+        from .incremental import IncrementalParser
+
+        return IncrementalParser(self)
+
+    def parse_chunk(self, chunk: bytes, row_number: int = 0) -> list[RowParsed | RowSkipped | RowFailed]:
+        """Parse `chunk`, made of whole records without header, numbering rows from `row_number + 1`."""
+        return list(self.parse_rows(self.get_reader(BytesIO(chunk)), row_number))
+
+    def parse_rows(
+        self, reader: Iterator[list[str] | str], row_number: int = 0, profiler: "Profiler | None" = None
+    ) -> Iterator[RowParsed | RowSkipped | RowFailed]:
+        """Process the rows of `reader`, numbering them from `row_number + 1`."""
+        process_row = self.row_processor(profiler)
         for row in reader:
             row_number += 1
             if not any(row):
                 continue
 
-            fields = self.process_fields(self.fields, row, row_number)
-            if not isinstance(fields, RowParsed):
-                yield fields
-                continue
+            yield process_row(row, row_number)
+
+    def parse_records(
+        self,
+        stream: BytesIO,
+        offset: int,
+        row_number: int,
+        skip_header: bool,
+        profiler: "Profiler | None" = None,
+    ) -> Iterator[RowParsed | RowSkipped | RowFailed]:
+        """Process the records of `stream` one by one, tagging rows with their byte offset."""
+        records = iter_records(stream, self.record_splitter(), offset)
+        if profiler is not None:
+            records = profiler.read(records)
+        schema = self
+        if skip_header:
+            header = next(records, None)
+            schema = self.bind(self.read_record(header[1]) if header else None)
+            row_number += 1
 
-            computed_fields = self.process_fields(self.computed_fields, fields.values, row_number)
-            if not isinstance(computed_fields, RowParsed):
-                yield computed_fields
+        process_row = schema.row_processor(profiler)
+        read_record = schema.read_record if profiler is None else profiler.timed_read(schema.read_record)
+        for offset, record in records:
+            row_number += 1
+            row = read_record(record)
+            if not any(row):
                 continue
 
-            yield RowParsed(row_number, {**fields.values, **computed_fields.values})
+            yield copy.replace(process_row(row, row_number), offset=offset)
+
+    def row_processor(
+        self, profiler: "Profiler | None" = None
+    ) -> Callable[[Any, int], RowParsed | RowSkipped | RowFailed]:
+        """Return the function processing each row: the compiled one when there is, a profiled one with `profiler`."""
+        if profiler is not None:
+            return profiler.processor(self)
+        return self.compiled.function if self.compiled else self.process_row
+
+    def read_record(self, record: bytes) -> Any:
+        """Read the row of a single raw record."""
+        return next(self.get_reader(BytesIO(record)), list[Any]())
+
+    def read_header(self, stream: BytesIO) -> Any:
+        """Read the header row at the start of `stream`, the stream position is not restored."""
+        stream.seek(0)
+        for _, record in iter_records(stream, self.record_splitter(), block_size=HEADER_BLOCK_SIZE):
+            return self.read_record(record)
+        return None
+
+    def bind(self, header: Any) -> "Schema":
+        """Return the schema parsing the rows following `header`, the header row of a file."""
+        return self
+
+    def select(self, keys: Sequence[str] | None) -> "Schema":
+        """Return the schema only parsing the fields and computed fields `keys`.
+
+        Fields the selected computed fields depend on, as told by their builder's
+        `dependencies()`, are parsed as well but left out of the rows; a builder
+        with unknown dependencies requires every field. The selection is
+        resolved once per distinct `keys`.
+        """
+        if keys is None:
+            return self
+
+        keys = tuple(keys)
+        selected = self.selections.get(keys)
+        if selected is None:
+            selected = self.project(keys)
+            if self.compiled is not None:
+                selected.compile()
+            self.selections[keys] = selected
+        return selected
+
+    def project(self, keys: tuple[str, ...]) -> "Schema":
+        """Return an uncompiled copy of this schema restricted to `keys`, see `select()`."""
+        declared = [field.key for field in [*self.fields, *self.computed_fields]]
+        unknown = [key for key in keys if key not in declared]
+        if unknown:
+            raise ValueError(f"cannot select unknown fields: {', '.join(unknown)}")
+
+        required = set(keys)
+        # A computed field only reads the fields and the computed fields declared before it.
+        for field in reversed(self.computed_fields):
+            if field.key in required and isinstance(field, ComputedField):
+                dependencies = field.builder.dependencies()
+                required.update(declared if dependencies is None else dependencies)
+
+        projected = copy.copy(self)
+        projected.fields = [field for field in self.fields if field.key in required]
+        projected.computed_fields = [field for field in self.computed_fields if field.key in required]
+        projected.hidden_keys = tuple(dict.fromkeys(key for key in declared if key in required and key not in keys))
+        if self.key_index is not None:
+            selected = dict.fromkeys(key for key in declared if key in keys)
+            projected.key_index = {key: position for position, key in enumerate(selected)}
+        projected.selections = {}
+        projected.compiled = None
+        return projected
+
+    def process_row(self, row: Any, row_number: int) -> RowParsed | RowSkipped | RowFailed:
+        values = dict[str, Any]()
+        fields = self.process_fields(self.row_fields, row, row_number, values)
+        if not isinstance(fields, RowParsed):
+            return fields
+
+        return self.process_computed_fields(values, row_number)
+
+    def process_computed_fields(self, values: dict[str, Any], row_number: int) -> RowParsed | RowSkipped | RowFailed:
+        if self.computed_fields:
+            # Each computed field reads the values parsed and computed so far, and adds its own.
+            row = self.process_fields(self.computed_fields, values, row_number, values)
+            if not isinstance(row, RowParsed):
+                return row
+            for key in self.hidden_keys:
+                del values[key]
+            if self.key_index is None:
+                return row
+        elif self.key_index is None:
+            return RowParsed(row_number, values)
+
+        return RowParsed(row_number, CompactValues(self.key_index, tuple(values.values())))
+
+    def compile(self) -> CompiledRow:
+        """Generate a single specialized function processing a whole row for this schema.
+
+        Once compiled, `stream_parse` uses the generated function instead of
+        looping over fields and transforms.
+        """
+        if self.compiled is None:
+            # Compact values are only built directly when no computed field needs a dict to read.
+            key_index = None if self.computed_fields else self.key_index
+            self.compiled = CompiledRow.build(self.row_fields, self.process_computed_fields, key_index)
+        return self.compiled
 
     def process_fields(
-        self, fields: list[Field] | list[ComputedField], row: str | list[str] | dict[str, Any], row_number: int
+        self, fields: Sequence[Field], row: Any, row_number: int, values: dict[str, Any] | None = None
     ) -> RowParsed | RowSkipped | RowFailed:
-        item = dict[str, Any]()
-        errors = list[dict[str, Any]]()
+        """Parse `fields` from `row` and store their values into `values`, a new dict by default."""
+        values = {} if values is None else values
+        failures = list[PendingFailure]()
         skip_row = False
         for field in fields:
             try:
-                if isinstance(row, dict):
-                    source = row | item
-                else:
-                    source = row
-                parsed_value = field.parse(source)
+                parsed_value = field.try_parse(row)
             except Exception as exc:
-                errors.append(field.error(exc))
+                failures.append((field, exc))
                 continue
 
-            if isinstance(parsed_value, SkipRow):
+            if isinstance(parsed_value, Ok):
+                values[field.key] = parsed_value.value
+            elif isinstance(parsed_value, SkipRow):
                 skip_row = True
-                errors.append(field.error(parsed_value.exception))
-                continue
-
-            item[field.key] = parsed_value.value
+                failures.append((field, parsed_value.exception))
+            else:
+                failures.append((field, parsed_value))
 
-        if errors:
-            return RowSkipped(row_number, errors) if skip_row else RowFailed(row_number, errors)
+        if failures:
+            # Error messages are only formatted when the row's errors are read.
+            if skip_row:
+                return RowSkipped.from_failures(row_number, failures)
+            return RowFailed.from_failures(row_number, failures)
 
-        return RowParsed(row_number, item)
+        return RowParsed(row_number, values)
 
 
 class CsvSchema(Schema):
@@ -134,14 +609,115 @@ class CsvSchema(Schema):
         self.delimiter = options.get("delimiter", ",")
         self.quotechar = options.get("quotechar", None)
 
+        self.named_fields = any(isinstance(field, CsvField) and field.column_name for field in self.fields)
+        if self.named_fields and not self.has_header:
+            raise ValueError("fields with a 'column-name' require 'has_header'")
+        self.bound_schemas: OrderedDict[tuple[int | None, ...], CsvSchema] = OrderedDict()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = super().__getstate__()
+        state["bound_schemas"] = OrderedDict()
+        return state
+
+    def bind(self, header: Sequence[str] | None) -> "CsvSchema":
+        """Resolve the fields given by column name against `header`.
+
+        The returned schema reads every field at a plain column index. It is
+        built once per distinct column layout, the `MAX_BOUND_SCHEMAS` most
+        recently used being kept.
+        """
+        if not self.named_fields or header is None:
+            return self
+
+        fields = [self.bind_field(field, tuple(header)) for field in self.fields]
+        columns = tuple(field.index if isinstance(field, IndexedField) else None for field in fields)
+        bound = self.bound_schemas.pop(columns, None)
+        if bound is None:
+            bound = copy.copy(self)
+            bound.fields = fields
+            bound.named_fields = False
+            bound.bound_schemas = OrderedDict()
+            bound.selections = {}
+            bound.compiled = None
+            if self.compiled is not None:
+                bound.compile()
+            if len(self.bound_schemas) >= MAX_BOUND_SCHEMAS:
+                self.bound_schemas.popitem(last=False)
+        self.bound_schemas[columns] = bound
+        return bound
+
+    def project(self, keys: tuple[str, ...]) -> "CsvSchema":
+        projected = cast(CsvSchema, super().project(keys))
+        projected.named_fields = any(isinstance(field, CsvField) and field.column_name for field in projected.fields)
+        projected.bound_schemas = OrderedDict()
+        return projected
+
+    @staticmethod
+    def bind_field(field: Field, header: tuple[str, ...]) -> Field:
+        if not isinstance(field, CsvField) or not field.column_name:
+            return field
+        if field.column_name in header:
+            return IndexedField(field, header.index(field.column_name))
+        if field.optional:
+            return MissingField(field)
+        raise ValueError(f"column '{field.column_name}' of field '{field.key}' is missing from the header")
+
+    def record_splitter(self) -> RecordSplitter:
+        splitter = super().record_splitter()
+        if self.quotechar:
+            splitter.quotechar = self.quotechar.encode(self.encoding)
+            splitter.delimiter = self.delimiter.encode(self.encoding)
+        return splitter
+
     def get_reader(self, stream: BytesIO) -> Iterator[list[str]]:
-        stream_reader = codecs.getreader(self.encoding)
-        stream_content = stream_reader(stream)
+        blocks = decode_blocks(stream, self.encoding)
+        if self.record_terminator == "\n":
+            # Lines keep their end for csv to read quoted fields spanning several of them.
+            lines = split_lines(blocks, line_ends(self.encoding), keepends=True)
+            if line_ends(self.encoding) != "\r\n":
+                # csv does not know NEL.
+                lines = (line[:-1] + "\n" if line.endswith("\x85") else line for line in lines)
+            return self.csv_reader(lines)
+        return self.csv_records(
+            split_records(blocks, self.record_terminator, self.quotechar or None, None, self.delimiter)
+        )
+
+    def read_record(self, record: bytes) -> list[str]:
+        text = self.strip_terminator(record).decode(self.encoding)
+        if self.record_terminator == "\n":
+            return next(self.csv_reader([text]), list[str]())
+        return next(self.csv_records([text]), list[str]())
+
+    def csv_records(self, records: Iterable[str]) -> Iterator[list[str]]:
+        """Read the fields of `records`, split on a custom terminator, whose fields may hold unquoted line ends.
+
+        csv refuses line ends outside quoted fields: they are swapped for
+        characters absent from the record, then restored in its fields.
+        """
+        swapped = list[str]()
+
+        def lines() -> Iterator[str]:
+            for record in records:
+                if "\n" in record or "\r" in record:
+                    swapped[:] = _absent_characters(record, 2)
+                    yield record.replace("\r", swapped[0]).replace("\n", swapped[1])
+                else:
+                    swapped.clear()
+                    yield record
+
+        # csv reads a single line per row, so `swapped` is the one of the row read.
+        for row in self.csv_reader(lines()):
+            if swapped:
+                cr, lf = swapped
+                row = [field.replace(cr, "\r").replace(lf, "\n") for field in row]
+            yield row
+
+    def csv_reader(self, lines: Iterable[str]) -> Iterator[list[str]]:
         csv_quoting = csv.QUOTE_NONE
         if self.quotechar:
             csv_quoting = csv.QUOTE_MINIMAL
         return csv.reader(
-            stream_content,
+            lines,
             delimiter=self.delimiter,
             quoting=csv_quoting,
             quotechar=self.quotechar,
@@ -152,19 +728,245 @@ class CsvSchema(Schema):
         return "csv"
 
 
+def _absent_characters(text: str, count: int) -> list[str]:
+    """`count` private use characters which `text` does not contain."""
+    return list(islice((char for char in map(chr, range(0xE000, 0xF900)) if char not in text), count))
+
+
 class ColumnarSchema(Schema):
-    def get_reader(self, stream: BytesIO) -> Iterator[str]:
-        stream_reader_factory = codecs.getreader(self.encoding)
-        stream_reader = stream_reader_factory(stream)
-        while True:
-            line = stream_reader.readline(None, False)
-            if not line:
-                break
-            yield line
+    def __init__(self, options: dict[str, Any]) -> None:
+        super().__init__(options)
+        self.layout = self.build_layout(options.get("byte-records", True))
+
+        self.record_length: int | None = options.get("record-length")
+        if self.record_length is not None:
+            if type(self.record_length) is not int or self.record_length <= 0:
+                raise ValueError("'record-length' must be a positive integer")
+            if "record-terminator" in options:
+                raise ValueError("'record-length' and 'record-terminator' cannot be combined")
+        self.strict_record_length: bool = options.get("strict-record-length", False)
+
+    def build_layout(self, enabled: bool) -> ColumnarLayout | None:
+        """Layout unpacking raw records when every column can be read at the byte level."""
+        if not enabled or not is_single_byte_encoding(self.encoding):
+            return None
+
+        fields = [field for field in self.fields if type(field) is ColumnarField]
+        if len(fields) != len(self.fields):
+            return None
+
+        return ColumnarLayout(fields, self.encoding)
+
+    def project(self, keys: tuple[str, ...]) -> "ColumnarSchema":
+        projected = cast(ColumnarSchema, super().project(keys))
+        # Columns of the fields left out are not even unpacked.
+        projected.layout = projected.build_layout(self.layout is not None)
+        return projected
+
+    @property
+    def row_fields(self) -> Sequence[Field]:
+        if self.layout is None:
+            return self.fields
+        return self.layout.fields
+
+    def get_reader(self, stream: BytesIO) -> Iterator[Any]:
+        if self.layout is not None:
+            return map(self.layout.unpack, self.byte_records(stream))
+        return self.text_records(stream)
+
+    def byte_records(self, stream: BytesIO) -> Iterator[bytes]:
+        """Split `stream` into raw records, without their terminator."""
+        if self.record_length is not None:
+            return read_fixed_length_records(stream, self.record_length, self.strict_record_length)
+        if self.record_terminator == "\n":
+            return split_lines(read_blocks(stream), line_ends(self.encoding).encode(self.encoding))
+        return split_records(read_blocks(stream), self.record_terminator.encode(self.encoding))
+
+    def text_records(self, stream: BytesIO) -> Iterator[str]:
+        """Split `stream` into decoded records, without their terminator."""
+        if self.record_length is not None:
+            return (record.decode(self.encoding) for record in self.byte_records(stream))
+        return self.decode_records(stream)
+
+    def record_splitter(self) -> RecordSplitter:
+        if self.record_length is not None:
+            return FixedLengthSplitter(self.record_length)
+        return super().record_splitter()
+
+    def read_record(self, record: bytes) -> Any:
+        if self.record_length is None:
+            record = self.strip_terminator(record)
+        if self.layout is not None:
+            return self.layout.unpack(record)
+        return record.decode(self.encoding)
 
     @staticmethod
     def key() -> str:
         return "columnar"
 
 
-builtins = [ColumnarSchema, CsvSchema]
+class MultiRecordSchema(ColumnarSchema):
+    """Columnar files interleaving several types of records, each with its own fields.
+
+    The type of a record is read from the `discriminator` columns and looks up
+    its schema in `record_schemas`, so a single pass parses every type. The
+    type is kept in the rows, under the discriminator's `key`.
+    """
+
+    def __init__(self, options: dict[str, Any]) -> None:
+        super().__init__(options | {"fields": [], "computed-fields": []})
+        discriminator = options["discriminator"]
+        # Each record type parses the discriminator as a field, which tags its rows.
+        tag = {
+            "key": discriminator.get("key", DEFAULT_RECORD_TYPE_KEY),
+            "type": "str",
+            "column-start": discriminator["column-start"],
+            "column-length": discriminator["column-length"],
+        }
+        self.discriminator = ColumnarField(tag["key"], tag)
+        self.layout = None
+        # Single-byte records are dispatched on their raw bytes, then unpacked by the layout of their type.
+        self.raw_records = options.get("byte-records", True) and is_single_byte_encoding(self.encoding)
+
+        record_types: dict[str, dict[str, Any]] = options["record-types"]
+        if not record_types:
+            raise ValueError("'record-types' must declare at least one record type")
+        self.record_schemas = dict[str, ColumnarSchema]()
+        for record_type, record_options in record_types.items():
+            if len(record_type) != self.discriminator.column_length:
+                raise ValueError(
+                    f"record type '{record_type}' is not {self.discriminator.column_length} characters long"
+                )
+            self.record_schemas[record_type] = ColumnarSchema(
+                {
+                    "encoding": self.encoding,
+                    "row-format": options.get("row-format", "dict"),
+                    "byte-records": options.get("byte-records", True),
+                    "fields": [tag, *record_options["fields"]],
+                    "computed-fields": record_options.get("computed-fields", []),
+                }
+            )
+        self.process_record = self.row_processor()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = super().__getstate__()
+        del state["process_record"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        super().__setstate__(state)
+        self.process_record = self.row_processor()
+
+    def get_reader(self, stream: BytesIO) -> Iterator[Any]:
+        if self.raw_records:
+            return self.byte_records(stream)
+        return self.text_records(stream)
+
+    def read_record(self, record: bytes) -> Any:
+        if self.record_length is None:
+            record = self.strip_terminator(record)
+        return record if self.raw_records else record.decode(self.encoding)
+
+    def row_processor(
+        self, profiler: "Profiler | None" = None
+    ) -> Callable[[Any, int], RowParsed | RowSkipped | RowFailed]:
+        """Return the function dispatching each record to the processor of its type, found by a dict lookup."""
+        processors = dict[Any, Callable[[Any, int], RowParsed | RowSkipped | RowFailed]]()
+        for record_type, schema in self.record_schemas.items():
+            discriminator = record_type.encode(self.encoding) if self.raw_records else record_type
+            processors[discriminator] = self.record_processor(schema, profiler)
+        start = self.discriminator.column_start
+        end = self.discriminator.column_end
+        unknown_record_type = self.unknown_record_type
+
+        def process_record(record: Any, row_number: int) -> RowParsed | RowSkipped | RowFailed:
+            processor = processors.get(record[start:end])
+            if processor is None:
+                return unknown_record_type(record, row_number)
+            return processor(record, row_number)
+
+        return process_record
+
+    def record_processor(
+        self, schema: ColumnarSchema, profiler: "Profiler | None"
+    ) -> Callable[[Any, int], RowParsed | RowSkipped | RowFailed]:
+        process_row = schema.row_processor(profiler)
+        if not self.raw_records:
+            return process_row
+        if schema.layout is not None:
+            unpack = schema.layout.unpack
+            return lambda record, row_number: process_row(unpack(record), row_number)
+        encoding = self.encoding
+        return lambda record, row_number: process_row(record.decode(encoding), row_number)
+
+    def unknown_record_type(self, record: Any, row_number: int) -> RowFailed:
+        record_type = record[self.discriminator.column_start : self.discriminator.column_end]
+        if self.raw_records:
+            record_type = record_type.decode(self.encoding)
+        error = ValueError(f"unknown record type '{record_type}'")
+        return RowFailed(row_number, [self.discriminator.error(error)])
+
+    def process_row(self, row: Any, row_number: int) -> RowParsed | RowSkipped | RowFailed:
+        return self.process_record(row, row_number)
+
+    def compile(self) -> CompiledRow:
+        for schema in self.record_schemas.values():
+            schema.compile()
+        # Dispatch to the compiled processors of the record types from now on.
+        self.process_record = self.row_processor()
+        return super().compile()
+
+    def project(self, keys: tuple[str, ...]) -> "MultiRecordSchema":
+        declared = {
+            field.key for schema in self.record_schemas.values() for field in [*schema.fields, *schema.computed_fields]
+        }
+        unknown = [key for key in keys if key not in declared]
+        if unknown:
+            raise ValueError(f"cannot select unknown fields: {', '.join(unknown)}")
+
+        # Rows keep their record type, whatever the selected fields.
+        tag = self.discriminator.key
+        projected = copy.copy(self)
+        projected.record_schemas = {
+            record_type: schema.select(
+                [tag]
+                + [
+                    key
+                    for key in keys
+                    if key != tag and any(field.key == key for field in [*schema.fields, *schema.computed_fields])
+                ]
+            )
+            for record_type, schema in self.record_schemas.items()
+        }
+        projected.selections = {}
+        projected.compiled = None
+        projected.process_record = projected.row_processor()
+        return projected
+
+    def stream_parse_arrays(
+        self,
+        data: Source,
+        batch_size: int = DEFAULT_ARRAY_BATCH_SIZE,
+        select: Sequence[str] | None = None,
+        exact_decimals: bool = False,
+    ) -> Iterator["ColumnBatch"]:
+        raise self.columns_error()
+
+    def stream_parse_batches(self, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        raise self.columns_error()
+
+    def write_parquet(self, *args: Any, **kwargs: Any) -> int:
+        raise self.columns_error()
+
+    @staticmethod
+    def columns_error() -> ValueError:
+        return ValueError(
+            "rows of several record types do not share their columns, parse them with one of 'record_schemas'"
+        )
+
+    @staticmethod
+    def key() -> str:
+        return "multi-record"
+
+
+builtins = [ColumnarSchema, CsvSchema, MultiRecordSchema]
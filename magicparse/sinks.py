@@ -0,0 +1,321 @@
+"""Sinks writing parsed, failed and skipped rows to files as they are parsed."""
+
+import csv
+import io
+import json
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from pathlib import Path
+from types import TracebackType
+from typing import IO, TYPE_CHECKING, Any, Self
+
+from .rows import Row, RowParsed, RowSkipped
+from .schema import DEFAULT_ARRAY_BATCH_SIZE
+
+if TYPE_CHECKING:
+    from .schema import Schema
+
+DEFAULT_BUFFER_SIZE = 1000
+
+
+class Sink(ABC):
+    """A destination of rows, used as a context manager: rows are only guaranteed written once closed."""
+
+    @abstractmethod
+    def write(self, row: Row) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+
+@dataclass(frozen=True, slots=True)
+class WrittenRows:
+    parsed: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+def write_rows(
+    rows: Iterable[Row], parsed: Sink | None = None, failed: Sink | None = None, skipped: Sink | None = None
+) -> WrittenRows:
+    """Write each of `rows` to the sink of its kind, dropping the rows without one, then flush the sinks."""
+    parsed_count = failed_count = skipped_count = 0
+    for row in rows:
+        if row.__class__ is RowParsed:
+            sink = parsed
+            parsed_count += 1
+        elif row.__class__ is RowSkipped:
+            sink = skipped
+            skipped_count += 1
+        else:
+            sink = failed
+            failed_count += 1
+        if sink is not None:
+            sink.write(row)
+
+    for sink in (parsed, failed, skipped):
+        if sink is not None:
+            sink.flush()
+    return WrittenRows(parsed_count, failed_count, skipped_count)
+
+
+def row_record(row: Row) -> Mapping[str, Any]:
+    """The values of a parsed row, or the row number and errors of a failed or skipped one."""
+    if isinstance(row, RowParsed):
+        return row.values
+    return {"row_number": row.row_number, "errors": row.errors}
+
+
+class RotatingSink(Sink):
+    """A sink buffering records, written to a new file every `max_rows` rows or `max_bytes` bytes.
+
+    With a rotation, `path` must hold an `{index}` placeholder, replaced by the
+    number of the file starting from 0, such as `rows-{index}.ndjson`. The
+    size is checked after each buffered write, so a file may go over
+    `max_bytes` by up to `buffer_size` rows.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        self.path = os.fspath(path)
+        if (max_rows is not None or max_bytes is not None) and "{index}" not in self.path:
+            raise ValueError("a rotating sink's path must contain an '{index}' placeholder")
+        if max_rows is not None and max_rows <= 0:
+            raise ValueError("'max_rows' must be a positive integer")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("'max_bytes' must be a positive integer")
+        if buffer_size <= 0:
+            raise ValueError("'buffer_size' must be a positive integer")
+
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.buffer_size = buffer_size
+        self.paths = list[Path]()
+        self.buffer = list[Mapping[str, Any]]()
+        self.file_rows = 0
+        self.is_open = False
+
+    def write(self, row: Row) -> None:
+        self.buffer.append(row_record(row))
+        if len(self.buffer) >= self.buffer_size or (
+            self.max_rows is not None and self.file_rows + len(self.buffer) >= self.max_rows
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+
+        if not self.is_open:
+            path = Path(self.path.replace("{index}", str(len(self.paths))))
+            self.open(path)
+            self.paths.append(path)
+            self.is_open = True
+            self.file_rows = 0
+
+        self.write_records(self.buffer)
+        self.file_rows += len(self.buffer)
+        self.buffer = []
+        if (self.max_rows is not None and self.file_rows >= self.max_rows) or (
+            self.max_bytes is not None and self.size() >= self.max_bytes
+        ):
+            self.close_file()
+
+    def close(self) -> None:
+        self.flush()
+        if self.is_open:
+            self.close_file()
+
+    def close_file(self) -> None:
+        self.finish()
+        self.is_open = False
+
+    @abstractmethod
+    def open(self, path: Path) -> None:
+        pass
+
+    @abstractmethod
+    def write_records(self, records: Sequence[Mapping[str, Any]]) -> None:
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        """Bytes written to the current file."""
+
+    @abstractmethod
+    def finish(self) -> None:
+        """Close the current file."""
+
+
+class _TextSink(RotatingSink):
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        encoding: str = "utf-8",
+    ) -> None:
+        super().__init__(path, max_rows, max_bytes, buffer_size)
+        self.encoding = encoding
+        self.file: IO[bytes] | None = None
+
+    def open(self, path: Path) -> None:
+        self.file = open(path, "wb")
+
+    def write_text(self, text: str) -> None:
+        assert self.file is not None
+        self.file.write(text.encode(self.encoding))
+
+    def size(self) -> int:
+        assert self.file is not None
+        return self.file.tell()
+
+    def finish(self) -> None:
+        assert self.file is not None
+        self.file.close()
+        self.file = None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"values of type {type(value).__name__} cannot be written as JSON")
+
+
+class NdjsonSink(_TextSink):
+    """Write rows as JSON lines: decimals as strings, to keep them exact, and dates in ISO 8601."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        encoding: str = "utf-8",
+    ) -> None:
+        super().__init__(path, max_rows, max_bytes, buffer_size, encoding)
+        self.encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_json_default).encode
+
+    def write_records(self, records: Sequence[Mapping[str, Any]]) -> None:
+        encode = self.encode
+        lines = [encode(record if record.__class__ is dict else dict(record)) for record in records]
+        lines.append("")
+        self.write_text("\n".join(lines))
+
+
+class CsvSink(_TextSink):
+    """Write rows as CSV, each file starting with a header.
+
+    Columns are `fieldnames`, by default the keys of the first row. Dates are
+    written in ISO 8601, and the errors of failed and skipped rows as JSON.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        fieldnames: Sequence[str] | None = None,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        encoding: str = "utf-8",
+        **dialect: Any,
+    ) -> None:
+        super().__init__(path, max_rows, max_bytes, buffer_size, encoding)
+        self.fieldnames = list(fieldnames) if fieldnames is not None else None
+        self.dialect = dialect
+        self.text = io.StringIO()
+        self.writer = csv.writer(self.text, **dialect)
+        self.header = True
+
+    def open(self, path: Path) -> None:
+        super().open(path)
+        self.header = True
+
+    def write_records(self, records: Sequence[Mapping[str, Any]]) -> None:
+        if self.fieldnames is None:
+            self.fieldnames = list(records[0])
+        if self.header:
+            self.writer.writerow(self.fieldnames)
+            self.header = False
+
+        keys = self.fieldnames
+        self.writer.writerows([[_csv_value(record.get(key)) for key in keys] for record in records])
+        self.write_text(self.text.getvalue())
+        self.text.seek(0)
+        self.text.truncate()
+
+
+def _csv_value(value: Any) -> Any:
+    if value.__class__ in (datetime, date, time):
+        return value.isoformat()
+    if value.__class__ is list:
+        return _json(value)
+    return value
+
+
+class ParquetSink(RotatingSink):
+    """Write rows to Parquet files, one row group per buffered batch.
+
+    Parsed rows are written with the Arrow schema of `schema`, see
+    `arrow.arrow_schema`. Without a `schema`, the sink is meant for failed and
+    skipped rows: their row number and their errors as JSON. Requires pyarrow.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        schema: "Schema | None" = None,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        buffer_size: int = DEFAULT_ARRAY_BATCH_SIZE,
+        types: dict[str, Any] | None = None,
+        timezone: str = "UTC",
+        **options: Any,
+    ) -> None:
+        from .arrow import ParquetBatchWriter
+
+        super().__init__(path, max_rows, max_bytes, buffer_size)
+        self.writer = ParquetBatchWriter(schema, types, timezone, options)
+
+    def open(self, path: Path) -> None:
+        self.writer.open(path)
+
+    def write_records(self, records: Sequence[Mapping[str, Any]]) -> None:
+        if self.writer.rejected:
+            records = [{"row_number": record["row_number"], "errors": _json(record["errors"])} for record in records]
+        self.writer.write(records)
+
+    def size(self) -> int:
+        return self.writer.size()
+
+    def finish(self) -> None:
+        self.writer.close()
+
+
+def _json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
@@ -0,0 +1,315 @@
+import bz2
+import io
+import lzma
+import mmap
+import os
+import queue
+import re
+import stat
+import threading
+import zlib
+from collections.abc import Buffer, Generator, Iterator
+from contextlib import contextmanager
+from io import BytesIO
+from typing import BinaryIO, Protocol, cast
+
+type Source = bytes | BytesIO | str | os.PathLike[str] | int
+"""Raw content, a binary stream, a file path or an open file descriptor."""
+
+DECOMPRESSION_BLOCK_SIZE = 256 * 1024
+"""Bytes of compressed data decompressed at once."""
+DECOMPRESSED_BUFFER_SIZE = 64 * 1024
+PREFETCHED_BLOCKS = 2
+"""Decompressed blocks a background thread gets ahead of the parsing by."""
+
+# bzip2 streams start with the magic of their first block, or of their end when empty.
+_COMPRESSION_MAGIC = re.compile(
+    rb"(?P<gzip>\x1f\x8b\x08)|(?P<bz2>BZh[1-9](?:1AY&SY|\x17rE8P\x90))|(?P<xz>\xfd7zXZ\x00)|(?P<zstd>\x28\xb5\x2f\xfd)"
+)
+_MAGIC_SIZE = 10
+
+
+@contextmanager
+def open_stream(data: Source, background_decompression: bool = False) -> Generator[BytesIO]:
+    """Open `data` as a binary stream, decompressed when gzip, bzip2, xz or zstd compressed.
+
+    Paths and file descriptors of regular files are memory-mapped so records
+    are read straight from the page cache instead of being loaded upfront;
+    pipes and sockets are read as they come. A given file descriptor is left
+    open. Compressed content is recognized by its magic
+    bytes and decompressed block by block while being read, on a background
+    thread with `background_decompression`.
+    """
+    with _open(data) as source, _decompressed(source, background_decompression) as stream:
+        yield stream
+
+
+@contextmanager
+def _open(data: Source) -> Generator[BytesIO]:
+    match data:
+        case bytes():
+            yield BytesIO(data)
+        case int():
+            with _map(data) as stream:
+                yield stream
+        case str() | os.PathLike():
+            with open(data, "rb") as file, _map(file.fileno()) as stream:
+                yield stream
+        case _:
+            yield data
+
+
+@contextmanager
+def _map(fileno: int) -> Generator[BytesIO]:
+    status = os.fstat(fileno)
+    if not stat.S_ISREG(status.st_mode):
+        # Pipes and sockets report no size and cannot be mapped.
+        with os.fdopen(fileno, "rb", closefd=False) as file:
+            yield cast(BytesIO, file)
+        return
+    if status.st_size == 0:
+        # Empty files cannot be mapped.
+        yield BytesIO()
+        return
+
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapping:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapping.madvise(mmap.MADV_SEQUENTIAL)
+        # A read-only mapping provides the read/readline/seek/tell interface readers rely on.
+        yield cast(BytesIO, mapping)
+
+
+def detect_compression(head: bytes) -> str | None:
+    """The compression of content starting with `head`: `gzip`, `bz2`, `xz`, `zstd`, or `None`."""
+    match = _COMPRESSION_MAGIC.match(head)
+    return match.lastgroup if match else None
+
+
+@contextmanager
+def _decompressed(stream: BytesIO, background: bool) -> Generator[BytesIO]:
+    head = stream.read(_MAGIC_SIZE)
+    if stream.seekable():
+        stream.seek(-len(head), os.SEEK_CUR)
+    else:
+        stream = cast(BytesIO, io.BufferedReader(_Prefixed(head, stream)))
+    compression = detect_compression(head)
+    if compression is None:
+        yield stream
+        return
+
+    raw = DecompressedStream(stream, compression, background)
+    with io.BufferedReader(raw, DECOMPRESSED_BUFFER_SIZE) as buffered:
+        yield cast(BytesIO, buffered)
+
+
+class _Prefixed(io.RawIOBase):
+    """A stream which cannot seek back to its first bytes, `head`, already read from it."""
+
+    def __init__(self, head: bytes, stream: BinaryIO) -> None:
+        self.head = memoryview(head)
+        self.stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        data = self.head if self.head else self.stream.read(len(view))
+        size = min(len(view), len(data))
+        view[:size] = data[:size]
+        self.head = self.head[size:]
+        return size
+
+
+def is_decompressed(stream: BinaryIO) -> bool:
+    """Whether `stream` is the decompressed content of a compressed source, opened by `open_stream`."""
+    return isinstance(getattr(stream, "raw", None), DecompressedStream)
+
+
+class Decompressor(Protocol):
+    @property
+    def eof(self) -> bool: ...
+
+    @property
+    def unused_data(self) -> bytes: ...
+
+    def decompress(self, data: bytes, /) -> bytes: ...
+
+
+def _decompressor(compression: str) -> Decompressor:
+    match compression:
+        case "gzip":
+            return zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        case "bz2":
+            return bz2.BZ2Decompressor()
+        case "xz":
+            return lzma.LZMADecompressor(lzma.FORMAT_XZ)
+        case _:
+            try:
+                import zstandard
+            except ImportError as error:
+                raise ImportError(
+                    "zstd content requires zstandard, install magicparse with the 'zstd' extra"
+                ) from error
+            return zstandard.ZstdDecompressor().decompressobj()
+
+
+def _decompress(source: BinaryIO, compression: str, block_size: int) -> Generator[bytes]:
+    """Decompress `source` one block of compressed data at a time, across concatenated members."""
+    decompressor: Decompressor | None = None
+    while data := source.read(block_size):
+        while data:
+            if decompressor is None or decompressor.eof:
+                # Members may be followed by null padding.
+                data = data.lstrip(b"\0")
+                if not data:
+                    break
+                decompressor = _decompressor(compression)
+
+            if block := decompressor.decompress(data):
+                yield block
+            data = decompressor.unused_data if decompressor.eof else b""
+
+    if decompressor is not None and not decompressor.eof:
+        raise ValueError(f"{compression} content ended before the end of its last member")
+
+
+class DecompressedStream(io.RawIOBase):
+    """The decompressed content of a compressed `source`, from its current position.
+
+    Seeking forward decompresses up to the new position and seeking backward
+    starts over from the beginning, as offsets in the decompressed content
+    cannot be mapped to the compressed one.
+    """
+
+    def __init__(
+        self,
+        source: BinaryIO,
+        compression: str,
+        background: bool = False,
+        block_size: int = DECOMPRESSION_BLOCK_SIZE,
+    ) -> None:
+        self.source = source
+        self.compression = compression
+        self.background = background
+        self.block_size = block_size
+        self.start = source.tell() if source.seekable() else None
+        self.blocks: Iterator[bytes] = iter(())
+        self.block = memoryview(b"")
+        self.position = 0
+        self.rewind()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Buffer) -> int:
+        if not self.block and not self.next_block():
+            return 0
+
+        view = memoryview(buffer).cast("B")
+        size = min(len(view), len(self.block))
+        view[:size] = self.block[:size]
+        self.block = self.block[size:]
+        self.position += size
+        return size
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            # The decompressed size is only known once decompressed.
+            self.position += len(self.block)
+            while self.next_block():
+                self.position += len(self.block)
+            offset += self.position
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+
+        if offset < self.position:
+            self.rewind()
+        while self.position < offset and (self.block or self.next_block()):
+            size = min(offset - self.position, len(self.block))
+            self.block = self.block[size:]
+            self.position += size
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def next_block(self) -> bool:
+        """Load the next decompressed block, if any."""
+        block = next(self.blocks, None)
+        self.block = memoryview(block if block is not None else b"")
+        return block is not None
+
+    def rewind(self) -> None:
+        self.stop()
+        if self.start is not None:
+            self.source.seek(self.start)
+        elif self.position:
+            raise io.UnsupportedOperation("the decompressed content of a pipe cannot be read again")
+        blocks = _decompress(self.source, self.compression, self.block_size)
+        self.blocks = _Prefetcher(blocks, PREFETCHED_BLOCKS) if self.background else blocks
+        self.block = memoryview(b"")
+        self.position = 0
+
+    def stop(self) -> None:
+        if isinstance(self.blocks, _Prefetcher):
+            self.blocks.stop()
+
+    def close(self) -> None:
+        self.stop()
+        super().close()
+
+
+class _Prefetcher(Iterator[bytes]):
+    """Iterate over `blocks` produced ahead on a background thread.
+
+    Compressed data is decompressed without holding the GIL, so decompression
+    overlaps with the processing of the previous blocks.
+    """
+
+    def __init__(self, blocks: Generator[bytes], depth: int) -> None:
+        self.queue = queue.Queue[bytes | BaseException | None](depth)
+        self.stopped = threading.Event()
+        self.done = False
+        self.thread = threading.Thread(target=self.run, args=(blocks,), name="magicparse-decompression", daemon=True)
+        self.thread.start()
+
+    def run(self, blocks: Generator[bytes]) -> None:
+        try:
+            for block in blocks:
+                if self.stopped.is_set():
+                    return
+                self.queue.put(block)
+            self.queue.put(None)
+        except BaseException as error:
+            self.queue.put(error)
+        finally:
+            blocks.close()
+
+    def __next__(self) -> bytes:
+        if self.done:
+            raise StopIteration
+        item = self.queue.get()
+        if item is None or isinstance(item, BaseException):
+            self.done = True
+            if item is None:
+                raise StopIteration
+            raise item
+        return item
+
+    def stop(self) -> None:
+        """Stop the thread, for it to no longer read the source."""
+        self.stopped.set()
+        self.done = True
+        # Make room for the block the thread may be putting, after which it sees it is stopped.
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+        self.thread.join()
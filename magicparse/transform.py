@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Collection, Sequence
+from collections.abc import Callable, Collection, Mapping, Sequence
 from dataclasses import dataclass
 from decimal import Decimal
 from enum import StrEnum
+from types import MappingProxyType
 from typing import Any, NoReturn, Self
 from jsonata import Jsonata  # pyright: ignore[reportMissingTypeStubs]
 
@@ -12,14 +13,47 @@ class Ok:
     value: Any
 
 
+@dataclass(frozen=True, slots=True)
+class Failure:
+    """An invalid value, reported without raising.
+
+    `code` identifies the error; its message is only formatted from
+    `template` and `params` when needed. Failures are shared, between rows
+    and through memoized fields, so `params` is read-only.
+    """
+
+    code: str
+    template: str
+    params: Mapping[str, Any]
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "params", MappingProxyType(self.params))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (Failure, (self.code, self.template, dict(self.params)))
+
+    def message(self) -> str:
+        return self.template.format_map(self.params)
+
+    def exception(self) -> ValueError:
+        return ValueError(self.message())
+
+
 @dataclass(frozen=True, slots=True)
 class SkipRow:
-    exception: Exception
+    exception: Exception | Failure
 
 
 type Result = Ok | SkipRow
 
 
+def unwrap[T](result: T | Failure) -> T:
+    """Return `result`, or raise the error of a `Failure`."""
+    if isinstance(result, Failure):
+        raise result.exception()
+    return result
+
+
 class OnError(StrEnum):
     RAISE = "raise"
     SKIP_ROW = "skip-row"
@@ -40,6 +74,10 @@ class ParsingTransform(ABC):
     def apply(self, value: Any) -> Any:
         pass
 
+    def check(self, value: Any) -> Any:
+        """Like `apply`, but return a `Failure` instead of raising when `value` is invalid."""
+        return self.apply(value)
+
     @staticmethod
     @abstractmethod
     def key() -> str:
@@ -50,6 +88,17 @@ class ParsingTransform(ABC):
         cls.registry[transform.key()] = transform
 
 
+def checker(transform: ParsingTransform) -> Callable[[Any], Any]:
+    """Return the function applying `transform` without raising on invalid values, when it has one.
+
+    A `check` is only trusted from the class defining it: a subclass
+    overriding `apply` keeps being applied through `apply`.
+    """
+    if "check" in vars(type(transform)):
+        return transform.check
+    return transform.apply
+
+
 class TransformError(Exception):
     def __init__(self, message: str, params: Sequence[Any] | dict[str, Any]) -> None:
         super().__init__(message)
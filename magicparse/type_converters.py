@@ -3,9 +3,11 @@ from datetime import datetime, time
 from decimal import Decimal
 from typing import Any, cast
 
-from .transform import ParsingTransform
+from .transform import Failure, ParsingTransform, unwrap
 from .transform import OnError
 
+NON_NULLABLE = Failure("non-nullable", "type is non nullable", {})
+
 
 class TypeConverter(ParsingTransform):
     registry = dict[str, type["TypeConverter"]]()
@@ -19,10 +21,13 @@ class TypeConverter(ParsingTransform):
             if self.nullable:
                 return None
             else:
-                raise ValueError("type is non nullable")
+                raise NON_NULLABLE.exception()
 
         return self.convert(value)
 
+    def check_null(self) -> Failure | None:
+        return None if self.nullable else NON_NULLABLE
+
     @abstractmethod
     def convert(self, value: str) -> Any:
         pass
@@ -51,6 +56,9 @@ class StrConverter(TypeConverter):
     def convert(self, value: str) -> str:
         return value
 
+    def check(self, value: str | None) -> str | Failure | None:
+        return self.check_null() if value is None else value
+
     @staticmethod
     def key() -> str:
         return "str"
@@ -58,10 +66,16 @@ class StrConverter(TypeConverter):
 
 class IntConverter(TypeConverter):
     def convert(self, value: str) -> int:
+        return unwrap(self.check_value(value))
+
+    def check(self, value: str | None) -> int | Failure | None:
+        return self.check_null() if value is None else self.check_value(value)
+
+    def check_value(self, value: str) -> int | Failure:
         try:
             return int(value)
         except:
-            raise ValueError(f"value '{value}' is not a valid integer")
+            return Failure("invalid-integer", "value '{value}' is not a valid integer", {"value": value})
 
     @staticmethod
     def key() -> str:
@@ -70,10 +84,16 @@ class IntConverter(TypeConverter):
 
 class DecimalConverter(TypeConverter):
     def convert(self, value: str) -> Decimal:
+        return unwrap(self.check_value(value))
+
+    def check(self, value: str | None) -> Decimal | Failure | None:
+        return self.check_null() if value is None else self.check_value(value)
+
+    def check_value(self, value: str) -> Decimal | Failure:
         try:
             return Decimal(value)
         except:
-            raise ValueError(f"value '{value}' is not a valid decimal")
+            return Failure("invalid-decimal", "value '{value}' is not a valid decimal", {"value": value})
 
     @staticmethod
     def key() -> str:
@@ -82,13 +102,20 @@ class DecimalConverter(TypeConverter):
 
 class TimeConverter(TypeConverter):
     def convert(self, value: str) -> time:
+        return unwrap(self.check_value(value))
+
+    def check(self, value: str | None) -> time | Failure | None:
+        return self.check_null() if value is None else self.check_value(value)
+
+    def check_value(self, value: str) -> time | Failure:
         try:
             parsed = time.fromisoformat(value)
-            if parsed.tzinfo is None:
-                raise ValueError(f"value '{value}' is a naïve time reprensentation")
-            return parsed
         except:
-            raise ValueError(f"value '{value}' is not a valid time representation")
+            parsed = None
+        # Naïve times are not valid either.
+        if parsed is None or parsed.tzinfo is None:
+            return Failure("invalid-time", "value '{value}' is not a valid time representation", {"value": value})
+        return parsed
 
     @staticmethod
     def key() -> str:
@@ -97,13 +124,22 @@ class TimeConverter(TypeConverter):
 
 class DateTimeConverter(TypeConverter):
     def convert(self, value: str) -> datetime:
+        return unwrap(self.check_value(value))
+
+    def check(self, value: str | None) -> datetime | Failure | None:
+        return self.check_null() if value is None else self.check_value(value)
+
+    def check_value(self, value: str) -> datetime | Failure:
         try:
             parsed = datetime.fromisoformat(value)
-            if parsed.tzinfo is None:
-                raise ValueError(f"value '{value}' is a naïve datetime reprensentation")
-            return parsed
         except:
-            raise ValueError(f"value '{value}' is not a valid datetime representation")
+            parsed = None
+        # Naïve datetimes are not valid either.
+        if parsed is None or parsed.tzinfo is None:
+            return Failure(
+                "invalid-datetime", "value '{value}' is not a valid datetime representation", {"value": value}
+            )
+        return parsed
 
     @staticmethod
     def key() -> str:
@@ -1,8 +1,10 @@
 from decimal import Decimal
 from typing import Any
-from .transform import ParsingTransform, OnError
+from .transform import Failure, ParsingTransform, OnError, unwrap
 import re
 
+NULL_OR_EMPTY = Failure("null-or-empty", "value must not be null or empty", {})
+
 
 class Validator(ParsingTransform):
     registry = dict[str, type["Validator"]]()
@@ -34,10 +36,13 @@ class RegexMatches(Validator):
         self.pattern = re.compile(pattern)
 
     def apply(self, value: str) -> str | None:
-        if re.match(self.pattern, value):
+        return unwrap(self.check(value))
+
+    def check(self, value: str) -> str | Failure:
+        if self.pattern.match(value):
             return value
 
-        raise ValueError(f"string does not match regex '{self.pattern.pattern}'")
+        return Failure("regex-mismatch", "string does not match regex '{pattern}'", {"pattern": self.pattern.pattern})
 
     @staticmethod
     def key() -> str:
@@ -50,9 +55,12 @@ class GreaterThan(Validator):
         self.threshold = Decimal(threshold)
 
     def apply(self, value: Decimal) -> Decimal:
+        return unwrap(self.check(value))
+
+    def check(self, value: Decimal) -> Decimal | Failure:
         if value > self.threshold:
             return value
-        raise ValueError(f"value must be greater than {self.threshold}")
+        return Failure("not-greater-than", "value must be greater than {threshold}", {"threshold": self.threshold})
 
     @staticmethod
     def key() -> str:
@@ -61,8 +69,11 @@ class GreaterThan(Validator):
 
 class NotNullOrEmpty(Validator):
     def apply(self, value: str) -> str:
+        return unwrap(self.check(value))
+
+    def check(self, value: str) -> str | Failure:
         if not value:
-            raise ValueError("value must not be null or empty")
+            return NULL_OR_EMPTY
         return value
 
     @staticmethod
@@ -0,0 +1,84 @@
+import asyncio
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from unittest import IsolatedAsyncioTestCase
+
+from magicparse import Schema
+from magicparse.schema import RowFailed, RowParsed, RowSkipped
+
+
+async def chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        await asyncio.sleep(0)
+        yield data[start : start + size]
+
+
+async def collect(rows: AsyncIterator[RowParsed | RowSkipped | RowFailed]) -> list[RowParsed | RowSkipped | RowFailed]:
+    return [row async for row in rows]
+
+
+def build_schema(**options: Any) -> Schema:
+    return Schema.build(
+        {
+            "file_type": "csv",
+            "fields": [
+                {"key": "id", "type": "int", "column-number": 1},
+                {"key": "name", "type": "str", "column-number": 2},
+            ],
+        }
+        | options
+    )
+
+
+class TestAstreamParse(IsolatedAsyncioTestCase):
+    async def test_same_rows_as_stream_parse(self):
+        schema = build_schema(has_header=True, quotechar='"')
+        data = 'id,name\n1,"Jo\nsé"\n2,李\nx,💩\n3,end'.encode("utf-8")
+
+        rows = await collect(schema.astream_parse(chunks(data, 3), batch_size=2))
+
+        assert rows == schema.parse(data)
+        assert rows[0] == RowParsed(row_number=2, values={"id": 1, "name": "Jo\nsé"})
+        assert rows[-1] == RowParsed(row_number=5, values={"id": 3, "name": "end"})
+
+    async def test_column_names(self):
+        schema = build_schema(has_header=True, fields=[{"key": "name", "type": "str", "column-name": "name"}])
+        data = b"id,name\n1,a\n2,b\n"
+
+        assert await collect(schema.astream_parse(chunks(data, 3), batch_size=1)) == schema.parse(data)
+
+    async def test_stream_reader(self):
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"1,a\n2,b\n")
+        reader.feed_eof()
+
+        rows = await collect(build_schema().astream_parse(reader, read_size=3))
+
+        assert rows == [
+            RowParsed(row_number=1, values={"id": 1, "name": "a"}),
+            RowParsed(row_number=2, values={"id": 2, "name": "b"}),
+        ]
+
+    async def test_custom_executor(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            rows = await collect(build_schema().astream_parse(chunks(b"1,a\n", 2), executor=executor))
+        assert rows == [RowParsed(row_number=1, values={"id": 1, "name": "a"})]
+
+    async def test_reading_waits_for_the_consumer(self):
+        read = list[int]()
+
+        async def source() -> AsyncIterator[bytes]:
+            for index in range(10):
+                read.append(index)
+                yield f"{index},a\n".encode()
+
+        rows = build_schema().astream_parse(source(), batch_size=2)
+        first = await anext(rows)
+
+        assert first.row_number == 1
+        assert read == [0, 1]
+        await rows.aclose()  # type: ignore[reportAttributeAccessIssue]
+
+    async def test_empty_source(self):
+        assert await collect(build_schema(has_header=True).astream_parse(chunks(b"", 1))) == []
@@ -0,0 +1,194 @@
+from typing import Any
+from unittest import TestCase
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import magicparse  # noqa: E402
+from magicparse import Schema  # noqa: E402
+from magicparse.arrays import ColumnBatch, parse_numbers  # noqa: E402
+from magicparse.schema import RowFailed, RowParsed, RowSkipped  # noqa: E402
+
+
+def build_schema(fields: list[dict[str, Any]], **options: Any) -> Schema:
+    return Schema.build({"file_type": "csv", "delimiter": ";", "fields": fields} | options)
+
+
+def batches_of(schema: Schema, data: bytes, batch_size: int = 3) -> list[ColumnBatch]:
+    return list(schema.stream_parse_arrays(data, batch_size=batch_size))
+
+
+PRICE = {
+    "key": "price",
+    "column-number": 1,
+    "type": "decimal",
+    "validators": [{"name": "greater-than", "parameters": {"threshold": 0}}],
+    "post-processors": [{"name": "divide", "parameters": {"denominator": 100}}],
+}
+QUANTITY = {"key": "quantity", "column-number": 2, "type": "int"}
+NAME = {"key": "name", "column-number": 3, "type": "str"}
+
+
+def without_position(field: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in field.items() if key != "column-number"}
+
+
+class TestParseNumbers(TestCase):
+    def test_plain_notation(self):
+        units, scales, valid = parse_numbers(["12", " -3 ", "+4.50", "0.125", ".5"], decimal=True)
+
+        assert units.tolist() == [12, -3, 450, 125, 5]
+        assert scales.tolist() == [0, 0, 2, 3, 1]
+        assert valid.tolist() == [True, True, True, True, True]
+
+    def test_fixed_width_digits(self):
+        units, scales, valid = parse_numbers(["00012", "12345", "00000"], decimal=False)
+
+        assert units.tolist() == [12, 12345, 0]
+        assert scales.tolist() == [0, 0, 0]
+        assert valid.all()
+
+    def test_left_to_the_caller(self):
+        values = ["1e3", "1_000", "", "1 2", "--1", "5-", ".", "1.5", "1234567890123456789", "١٢"]
+
+        _, _, valid = parse_numbers(values, decimal=False)
+
+        assert not valid.any()
+
+
+class TestStreamParseArrays(TestCase):
+    def test_numeric_columns(self):
+        schema = build_schema([PRICE, QUANTITY, NAME])
+
+        [batch] = batches_of(schema, b"1250;3;apple\n399;12;pear\n", batch_size=10)
+
+        assert batch.row_numbers.tolist() == [1, 2]
+        assert batch.columns["price"].dtype == np.float64
+        assert batch.columns["price"].tolist() == [12.5, 3.99]
+        assert batch.columns["quantity"].dtype == np.int64
+        assert batch.columns["quantity"].tolist() == [3, 12]
+        assert batch.columns["name"].tolist() == ["apple", "pear"]
+        assert batch.rejected == []
+
+    def test_batches(self):
+        schema = build_schema([QUANTITY | {"column-number": 1}])
+
+        batches = batches_of(schema, b"1\n2\n\n3\n4\n", batch_size=2)
+
+        assert [batch.row_numbers.tolist() for batch in batches] == [[1, 2], [4, 5]]
+        assert [batch.columns["quantity"].tolist() for batch in batches] == [[1, 2], [3, 4]]
+        assert [len(batch) for batch in batches] == [2, 2]
+
+    def test_errors_are_reported_per_row(self):
+        schema = build_schema([PRICE, QUANTITY, NAME])
+        data = b"100;1;a\n-5;2;b\nx;y;c\n200;1e3;\n300;4;d\n"
+
+        rows = schema.parse(data)
+        batches = batches_of(schema, data)
+
+        assert [row for batch in batches for row in batch.rejected] == [
+            row for row in rows if not isinstance(row, RowParsed)
+        ]
+        assert [row.row_number for batch in batches for row in batch.rejected] == [2, 3, 4]
+        assert [batch.columns["price"].tolist() for batch in batches] == [[1.0], [3.0]]
+
+    def test_skip_row(self):
+        price = PRICE | {
+            "validators": [{"name": "greater-than", "parameters": {"threshold": 0}, "on-error": "skip-row"}]
+        }
+        schema = build_schema([price, QUANTITY])
+
+        [batch] = batches_of(schema, b"100;1\n-5;2\n", batch_size=10)
+
+        assert batch.row_numbers.tolist() == [1]
+        assert [type(row) for row in batch.rejected] == [RowSkipped]
+        assert batch.rejected[0].errors == [
+            {"column-number": 1, "field-key": "price", "error": "value must be greater than 0"}
+        ]
+
+    def test_values_converted_one_by_one(self):
+        schema = build_schema([QUANTITY | {"column-number": 1}])
+
+        [batch] = batches_of(schema, b"1e0\n99999999999999999999\n", batch_size=10)
+
+        assert [type(row) for row in batch.rejected] == [RowFailed]
+        assert batch.columns["quantity"].dtype == object
+        assert batch.columns["quantity"].tolist() == [99999999999999999999]
+
+    def test_other_fields(self):
+        quantity = QUANTITY | {"column-number": 1, "optional": True}
+        name = NAME | {"column-number": 2, "pre-processors": [{"name": "strip-whitespaces"}]}
+        schema = build_schema([quantity, name])
+
+        [batch] = batches_of(schema, b";  apple \n2;\n", batch_size=10)
+
+        assert batch.columns["quantity"].tolist() == [None]
+        assert batch.columns["name"].tolist() == ["apple"]
+        assert batch.rejected == [
+            RowFailed(
+                2,
+                [{"column-number": 2, "field-key": "name", "error": "name field is required but the value was empty"}],
+            )
+        ]
+
+    def test_columnar(self):
+        schema = Schema.build(
+            {
+                "file_type": "columnar",
+                "encoding": "iso8859_5",
+                "fields": [
+                    {"key": "ean", "column-start": 0, "column-length": 4, "type": "str"},
+                    without_position(PRICE) | {"column-start": 4, "column-length": 6},
+                ],
+            }
+        )
+
+        [batch] = batches_of(schema, b"0001000150\n0002000000\n0003001999\n", batch_size=10)
+
+        assert batch.columns["ean"].tolist() == ["0001", "0003"]
+        assert batch.columns["price"].tolist() == [1.5, 19.99]
+        assert [row.row_number for row in batch.rejected] == [2]
+
+    def test_header_and_computed_fields(self):
+        schema = build_schema(
+            [
+                without_position(PRICE) | {"column-name": "price"},
+                QUANTITY,
+            ],
+            has_header=True,
+            **{
+                "computed-fields": [
+                    {
+                        "key": "total",
+                        "type": "decimal",
+                        "builder": {
+                            "name": "multiply",
+                            "parameters": {"x_factor": "price", "y_factor": "quantity"},
+                        },
+                        "validators": [{"name": "greater-than", "parameters": {"threshold": 10}}],
+                    }
+                ]
+            },
+        )
+
+        [batch] = batches_of(schema, b"price;qty\n1250;3\n100;2\n", batch_size=10)
+
+        assert batch.row_numbers.tolist() == [2]
+        assert batch.columns["total"].tolist() == [37.5]
+        assert [row.row_number for row in batch.rejected] == [3]
+
+    def test_select(self):
+        options = {"file_type": "csv", "delimiter": ";", "fields": [PRICE, QUANTITY, NAME]}
+
+        [batch] = magicparse.stream_parse_arrays(b"1250;x;apple\n", options, select=["name", "price"])
+
+        assert list(batch.columns) == ["price", "name"]
+        assert batch.columns["name"].tolist() == ["apple"]
+        assert batch.rejected == []
+
+    def test_invalid_batch_size(self):
+        schema = build_schema([QUANTITY])
+
+        with pytest.raises(ValueError, match="'batch_size' must be a positive integer"):
+            batches_of(schema, b"1;2\n", batch_size=0)
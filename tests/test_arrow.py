@@ -0,0 +1,207 @@
+from datetime import UTC, datetime, time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+from unittest import TestCase
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+import magicparse  # noqa: E402
+from magicparse import Schema, TypeConverter  # noqa: E402
+from magicparse.arrow import arrow_schema  # noqa: E402
+from magicparse.schema import CsvSchema, RowFailed, RowParsed, RowSkipped  # noqa: E402
+
+
+def build_schema(fields: list[dict[str, Any]], **options: Any) -> Schema:
+    return Schema.build({"file_type": "csv", "delimiter": ";", "fields": fields} | options)
+
+
+FIELDS: list[dict[str, Any]] = [
+    {"key": "ean", "column-number": 1, "type": "str"},
+    {
+        "key": "price",
+        "column-number": 2,
+        "type": "decimal",
+        "post-processors": [{"name": "round", "parameters": {"precision": 2}}],
+    },
+    {"key": "quantity", "column-number": 3, "type": "int", "optional": True},
+]
+
+
+class TestArrowSchema(TestCase):
+    def test_field_types(self):
+        schema = build_schema(
+            [
+                *FIELDS,
+                {"key": "rate", "column-number": 4, "type": "decimal"},
+                {
+                    "key": "unit-price",
+                    "column-number": 5,
+                    "type": "int",
+                    "post-processors": [{"name": "divide", "parameters": {"denominator": 100}}],
+                },
+                {"key": "sold-at", "column-number": 6, "type": "datetime"},
+                {"key": "opens-at", "column-number": 7, "type": "time"},
+            ]
+        )
+
+        assert arrow_schema(schema, timezone="Europe/Paris") == pa.schema(
+            [
+                pa.field("ean", pa.string()),
+                pa.field("price", pa.decimal128(38, 2)),
+                pa.field("quantity", pa.int64()),
+                pa.field("rate", pa.decimal128(38, 9)),
+                pa.field("unit-price", pa.float64()),
+                pa.field("sold-at", pa.timestamp("us", tz="Europe/Paris")),
+                pa.field("opens-at", pa.time64("us")),
+            ]
+        )
+
+    def test_custom_type(self):
+        class Guid(TypeConverter):
+            def convert(self, value: str) -> str:
+                return value
+
+            @staticmethod
+            def key() -> str:
+                return "guid"
+
+        TypeConverter.register(Guid)
+        schema = build_schema([{"key": "id", "column-number": 1, "type": "guid"}])
+
+        with pytest.raises(ValueError, match="field 'id' has no Arrow type, give it in 'types'"):
+            arrow_schema(schema)
+        assert arrow_schema(schema, types={"id": pa.string()}) == pa.schema([pa.field("id", pa.string())])
+
+
+class TestStreamParseBatches(TestCase):
+    def test_batches(self):
+        schema = build_schema(FIELDS)
+
+        batches = list(schema.stream_parse_batches(b"a;1.5;1\nb;2;\nc;3.125;3\n", batch_size=2))
+
+        assert [batch.num_rows for batch in batches] == [2, 1]
+        assert pa.Table.from_batches(batches).to_pylist() == [
+            {"ean": "a", "price": Decimal("1.50"), "quantity": 1},
+            {"ean": "b", "price": Decimal("2.00"), "quantity": None},
+            {"ean": "c", "price": Decimal("3.12"), "quantity": 3},
+        ]
+
+    def test_rejected_rows(self):
+        schema = build_schema(
+            [
+                FIELDS[0],
+                FIELDS[1]
+                | {"validators": [{"name": "greater-than", "parameters": {"threshold": 0}, "on-error": "skip-row"}]},
+                FIELDS[2],
+            ]
+        )
+        rejected = list[RowSkipped | RowFailed]()
+
+        [batch] = schema.stream_parse_batches(b"a;1;1\nb;x;2\nc;-1;3\n", on_rejected=rejected.append)
+
+        assert batch.column("ean").to_pylist() == ["a"]
+        assert [(type(row), row.row_number) for row in rejected] == [(RowFailed, 2), (RowSkipped, 3)]
+
+    def test_decimals_rounded_to_the_scale(self):
+        schema = build_schema([{"key": "rate", "column-number": 1, "type": "decimal"}])
+
+        [batch] = schema.stream_parse_batches(b"0.1234567891\n2\n")
+
+        assert batch.column("rate").to_pylist() == [Decimal("0.123456789"), Decimal("2.000000000")]
+
+    def test_datetimes_and_times(self):
+        schema = build_schema(
+            [
+                {"key": "sold-at", "column-number": 1, "type": "datetime"},
+                {"key": "opens-at", "column-number": 2, "type": "time"},
+            ]
+        )
+
+        [batch] = schema.stream_parse_batches(b"2024-03-01T10:00:00+02:00;09:30:00+02:00\n")
+
+        assert batch.column("sold-at").to_pylist() == [datetime(2024, 3, 1, 8, tzinfo=UTC)]
+        assert batch.column("opens-at").to_pylist() == [time(7, 30)]
+
+    def test_select(self):
+        options = {"file_type": "csv", "delimiter": ";", "fields": FIELDS}
+
+        [batch] = magicparse.stream_parse_batches(b"a;1.5;1\n", options, select=["quantity", "ean"])
+
+        assert batch.schema.names == ["ean", "quantity"]
+
+    def test_compact_rows(self):
+        schema = build_schema(FIELDS, **{"row-format": "compact"})
+
+        [batch] = schema.stream_parse_batches(b"a;1.5;1\n")
+
+        assert batch.to_pylist() == [{"ean": "a", "price": Decimal("1.50"), "quantity": 1}]
+
+    def test_built_from_column_batches(self):
+        schema = build_schema(
+            [
+                FIELDS[0],
+                FIELDS[1] | {"validators": [{"name": "greater-than", "parameters": {"threshold": 0}}]},
+                {
+                    "key": "unit-price",
+                    "column-number": 3,
+                    "type": "int",
+                    "post-processors": [{"name": "divide", "parameters": {"denominator": 100}}],
+                },
+            ],
+            **{
+                "computed-fields": [
+                    {
+                        "key": "code",
+                        "type": "str",
+                        "builder": {"name": "concat", "parameters": {"fields": ["ean", "ean"]}},
+                    }
+                ]
+            },
+        )
+        rejected = list[RowSkipped | RowFailed]()
+
+        batches = list(
+            schema.stream_parse_batches(b"a;1.005;150\nb;-1;2\nc;0.1;3\n", batch_size=2, on_rejected=rejected.append)
+        )
+
+        # Batches hold the rows parsed out of each `batch_size` rows read.
+        assert [batch.num_rows for batch in batches] == [1, 1]
+        assert pa.Table.from_batches(batches).to_pylist() == [
+            {"ean": "a", "price": Decimal("1.00"), "unit-price": 1.5, "code": "aa"},
+            {"ean": "c", "price": Decimal("0.10"), "unit-price": 0.03, "code": "cc"},
+        ]
+        assert [row.row_number for row in rejected] == [2]
+
+    def test_custom_row_processing(self):
+        class UpperCsvSchema(CsvSchema):
+            def process_row(self, row: Any, row_number: int) -> RowParsed | RowSkipped | RowFailed:
+                return super().process_row([value.upper() for value in row], row_number)
+
+        schema = UpperCsvSchema({"file_type": "csv", "delimiter": ";", "fields": FIELDS})
+
+        [batch] = schema.stream_parse_batches(b"a;1.5;1\n")
+
+        assert batch.column("ean").to_pylist() == ["A"]
+
+
+def test_write_parquet(tmp_path: Path):
+    schema = build_schema(FIELDS)
+    path = tmp_path / "rows.parquet"
+    rejected = list[RowSkipped | RowFailed]()
+
+    written = schema.write_parquet(
+        b"a;1.5;1\nb;x;2\nc;3;\n", path, batch_size=1, on_rejected=rejected.append, compression="zstd"
+    )
+
+    assert written == 2
+    assert [row.row_number for row in rejected] == [2]
+    table = pq.read_table(path)
+    assert table.schema == arrow_schema(schema)
+    assert table.to_pylist() == [
+        {"ean": "a", "price": Decimal("1.50"), "quantity": 1},
+        {"ean": "c", "price": Decimal("3.00"), "quantity": None},
+    ]
@@ -0,0 +1,62 @@
+import json
+
+from benchmarks import TRANSFORM_CASES, compare, generate, run, synthetic_schema
+from magicparse import RowFailed, RowParsed, Schema
+from magicparse import builders, post_processors, pre_processors, type_converters, validators
+
+
+def test_generate_is_deterministic():
+    schema = synthetic_schema("csv", width=6)
+
+    assert generate(schema, 50, error_ratio=0.2, seed=1) == generate(schema, 50, error_ratio=0.2, seed=1)
+    assert generate(schema, 50, seed=1) != generate(schema, 50, seed=2)
+
+
+def test_generate_csv_rows_parse():
+    schema = synthetic_schema("csv", width=9, has_header=True)
+
+    rows = Schema.build(schema).parse(generate(schema, 100))
+
+    assert len(rows) == 100
+    assert all(isinstance(row, RowParsed) for row in rows)
+
+
+def test_generate_columnar_rows_parse():
+    schema = synthetic_schema("columnar", width=9, encoding="iso8859_5")
+
+    data = generate(schema, 100)
+    rows = Schema.build(schema).parse(data)
+
+    assert len(rows) == 100
+    assert all(isinstance(row, RowParsed) for row in rows)
+
+
+def test_generate_error_ratio():
+    schema = synthetic_schema("csv", width=4)
+
+    rows = Schema.build(schema).parse(generate(schema, 1000, error_ratio=0.1))
+
+    failed = sum(isinstance(row, RowFailed) for row in rows)
+    assert 50 < failed < 150
+
+
+def test_transform_cases_cover_builtins():
+    modules = [pre_processors, type_converters, validators, post_processors, builders]
+    builtins = {transform for module in modules for transform in module.builtins}
+
+    covered = set[type]()
+    for case in TRANSFORM_CASES:
+        case.apply()(case.value)
+        covered.add(type(case.build()))
+
+    assert builtins <= covered
+
+
+def test_run_results_are_json():
+    results = json.loads(json.dumps(run(rows=20, width=4, error_ratio=0.1, calls=10, repeat=1)))
+
+    names = [result["name"] for result in results["results"]]
+    assert "parse/csv" in names
+    assert "stream_parse/columnar/compiled" in names
+    assert all(result["rows_per_second"] > 0 for result in results["results"])
+    assert {result["name"] for result in compare(results, results)} == set(names)
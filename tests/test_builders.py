@@ -50,6 +50,19 @@ class TestBuild(TestCase):
         with pytest.raises(ValueError, match="builder must have a 'name' key"):
             Builder.build({})
 
+    def test_dependencies(self):
+        assert Builder.build({"name": "concat", "parameters": {"fields": ["a", "b"]}}).dependencies() == ["a", "b"]
+        assert Builder.build({"name": "coalesce", "parameters": {"fields": ["a", "b"]}}).dependencies() == ["a", "b"]
+        divide = Builder.build({"name": "divide", "parameters": {"numerator": "a", "denominator": "b"}})
+        assert divide.dependencies() == ["a", "b"]
+        multiply = Builder.build({"name": "multiply", "parameters": {"x_factor": "a", "y_factor": "b"}})
+        assert multiply.dependencies() == ["a", "b"]
+
+    def test_unknown_dependencies(self):
+        Builder.register(self.WithoutParamBuilder)
+
+        assert Builder.build({"name": "without-param"}).dependencies() is None
+
 
 class TestConcat(TestCase):
     def test_no_params(self):
@@ -0,0 +1,133 @@
+from typing import Any
+from unittest import TestCase
+
+import pytest
+
+import magicparse
+from magicparse.cache import CacheInfo, SchemaCache
+from magicparse.schema import RowParsed
+
+
+def build_options(key: str = "age") -> dict[str, Any]:
+    return {
+        "file_type": "csv",
+        "fields": [{"key": key, "type": {"key": "int", "nullable": True}, "column-number": 1}],
+    }
+
+
+class TestSchemaCache(TestCase):
+    def test_same_options_hit_the_cache(self):
+        cache = SchemaCache()
+        schema = cache.get(build_options())
+        assert cache.get(build_options()) is schema
+        assert cache.info() == CacheInfo(hits=1, misses=1, maxsize=128, currsize=1)
+
+    def test_key_does_not_depend_on_dict_ordering(self):
+        options = build_options()
+        reordered = {"fields": options["fields"], "file_type": "csv"}
+        assert SchemaCache.key(options) == SchemaCache.key(reordered)
+
+    def test_different_options_miss_the_cache(self):
+        cache = SchemaCache()
+        assert cache.get(build_options("age")) is not cache.get(build_options("size"))
+        assert cache.info().misses == 2
+
+    def test_given_options_are_not_altered(self):
+        cache = SchemaCache()
+        options = build_options()
+        cache.get(options)
+        assert options == build_options()
+        cache.get(options)
+        assert cache.info().hits == 1
+
+    def test_least_recently_used_is_evicted(self):
+        cache = SchemaCache(maxsize=2)
+        first = cache.get(build_options("a"))
+        cache.get(build_options("b"))
+        cache.get(build_options("a"))
+        cache.get(build_options("c"))
+
+        assert cache.info().currsize == 2
+        assert cache.get(build_options("a")) is first
+        cache.get(build_options("b"))
+        assert cache.info().misses == 4
+
+    def test_invalidate_one_entry(self):
+        cache = SchemaCache()
+        schema = cache.get(build_options("a"))
+        cache.get(build_options("b"))
+
+        cache.invalidate(build_options("a"))
+
+        assert cache.info().currsize == 1
+        assert cache.get(build_options("a")) is not schema
+
+    def test_invalidate_all(self):
+        cache = SchemaCache()
+        cache.get(build_options("a"))
+        cache.get(build_options("b"))
+        cache.invalidate()
+        assert cache.info().currsize == 0
+
+    def test_resize_evicts_entries(self):
+        cache = SchemaCache()
+        cache.get(build_options("a"))
+        cache.get(build_options("b"))
+        cache.resize(1)
+        assert cache.info() == CacheInfo(hits=0, misses=2, maxsize=1, currsize=1)
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError, match="must be a positive integer"):
+            SchemaCache(maxsize=0)
+
+
+class TestParseUsesCache(TestCase):
+    def setUp(self) -> None:
+        magicparse.schema_cache.invalidate()
+        magicparse.schema_cache.reset_stats()
+
+    def test_parse(self):
+        assert magicparse.parse(b"1", build_options()) == [RowParsed(row_number=1, values={"age": 1})]
+        assert magicparse.parse(b"2", build_options()) == [RowParsed(row_number=1, values={"age": 2})]
+        assert magicparse.schema_cache.info().hits == 1
+
+    def test_stream_parse(self):
+        list(magicparse.stream_parse(b"1", build_options()))
+        list(magicparse.stream_parse(b"1", build_options()))
+        assert magicparse.schema_cache.info().hits == 1
+
+    def test_register_invalidates_the_cache(self):
+        magicparse.parse(b"1", build_options())
+        magicparse.register(magicparse.schema.CsvSchema)
+        assert magicparse.schema_cache.info().currsize == 0
+
+
+class TestCacheKey:
+    def test_keys_of_other_types_are_not_cached(self):
+        # JSON turns the key 1 into "1", both would share a key.
+        options = build_options() | {"mapping": {1: "x"}}
+
+        assert SchemaCache.key(options) is None
+        assert SchemaCache.key(build_options() | {"mapping": {"1": "x"}}) is not None
+
+    def test_non_json_values_are_not_cached(self):
+        class Value:
+            def __repr__(self) -> str:
+                return "same"
+
+        assert SchemaCache.key(build_options() | {"value": Value()}) is None
+        assert SchemaCache.key(build_options() | {"value": ("a",)}) is None
+
+    def test_no_collision(self):
+        def map_options(values: dict[Any, str]) -> dict[str, Any]:
+            pre_processor = {"name": "map", "parameters": {"values": values}}
+            return {
+                "file_type": "csv",
+                "fields": [{"key": "code", "type": "str", "column-number": 1, "pre-processors": [pre_processor]}],
+            }
+
+        cache = SchemaCache()
+
+        assert cache.get(map_options({"1": "one"})).parse(b"1") == [RowParsed(row_number=1, values={"code": "one"})]
+        assert cache.get(map_options({1: "uno"})) is not cache.get(map_options({"1": "one"}))
+        assert cache.info().currsize == 1
@@ -0,0 +1,92 @@
+from typing import Any
+from unittest import TestCase
+
+import pytest
+
+from magicparse import Checkpoint, Schema
+from magicparse.schema import RowParsed
+
+
+def build_schema(**options: Any) -> Schema:
+    return Schema.build(
+        {
+            "file_type": "csv",
+            "has_header": True,
+            "quotechar": '"',
+            "fields": [
+                {"key": "id", "type": "int", "column-number": 1},
+                {"key": "name", "type": "str", "column-number": 2},
+            ],
+        }
+        | options
+    )
+
+
+class TestOffsets(TestCase):
+    def test_rows_carry_their_record_offset(self):
+        data = b'id,name\n1,"a\nb"\n\n2,c'
+        rows = list(build_schema().stream_parse(data, with_offsets=True))
+
+        assert rows == [
+            RowParsed(row_number=2, values={"id": 1, "name": "a\nb"}),
+            RowParsed(row_number=4, values={"id": 2, "name": "c"}),
+        ]
+        assert [row.offset for row in rows] == [8, 17]
+
+    def test_same_rows_as_without_offsets(self):
+        schema = build_schema()
+        data = b'id,name\n1,"a\r\nb"\r\n2,c\r\nx,d\r\n'
+
+        assert list(schema.stream_parse(data, with_offsets=True)) == list(schema.stream_parse(data))
+
+    def test_columnar(self):
+        schema = Schema.build(
+            {"file_type": "columnar", "fields": [{"key": "id", "type": "int", "column-start": 0, "column-length": 3}]}
+        )
+        data = b"001\r\n\r\n002\r\n"
+
+        rows = list(schema.stream_parse(data, with_offsets=True))
+
+        assert rows == list(schema.stream_parse(data))
+        assert [row.offset for row in rows] == [0, 7]
+
+    def test_offset_is_not_part_of_row_equality(self):
+        assert RowParsed(row_number=1, values={}, offset=10) == RowParsed(row_number=1, values={})
+
+
+class TestResume(TestCase):
+    def test_resume_from_checkpoint(self):
+        schema = build_schema()
+        data = b"id,name\n1,a\n2,b\n3,c\n"
+        rows = list(schema.stream_parse(data, with_offsets=True))
+
+        checkpoint = Checkpoint.at(rows[1])
+
+        assert checkpoint == Checkpoint(offset=12, row_number=3)
+        assert list(schema.stream_parse(data, resume_from=checkpoint)) == rows[1:]
+        assert [row.offset for row in schema.stream_parse(data, resume_from=checkpoint, with_offsets=True)] == [12, 16]
+
+    def test_resume_from_start_skips_header(self):
+        schema = build_schema()
+        data = b"id,name\n1,a\n"
+
+        assert list(schema.stream_parse(data, resume_from=Checkpoint(offset=0, row_number=1))) == [
+            RowParsed(row_number=2, values={"id": 1, "name": "a"})
+        ]
+
+    def test_resume_binds_column_names(self):
+        schema = build_schema(fields=[{"key": "name", "type": "str", "column-name": "name"}])
+        data = b"id,name\n1,a\n2,b\n"
+
+        assert list(schema.stream_parse(data, resume_from=Checkpoint(offset=12, row_number=3))) == [
+            RowParsed(row_number=3, values={"name": "b"})
+        ]
+
+    def test_checkpoint_without_offset(self):
+        with pytest.raises(ValueError, match="row has no offset"):
+            Checkpoint.at(RowParsed(row_number=1, values={}))
+
+    def test_serialization(self):
+        checkpoint = Checkpoint(offset=1024, row_number=12)
+
+        assert Checkpoint.loads(checkpoint.dumps()) == checkpoint
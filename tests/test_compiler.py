@@ -0,0 +1,166 @@
+import copy
+from decimal import Decimal
+from typing import Any
+from unittest import TestCase
+
+from magicparse import Schema
+from magicparse.compiler import CompiledRow
+from magicparse.schema import RowFailed, RowParsed, RowSkipped
+from magicparse.validators import Validator
+
+
+def parse_both(options: dict[str, Any], data: bytes) -> list[RowParsed | RowSkipped | RowFailed]:
+    interpreted = Schema.build(copy.deepcopy(options)).parse(data)
+    compiled_schema = Schema.build(copy.deepcopy(options))
+    compiled_schema.compile()
+    compiled = compiled_schema.parse(data)
+    assert compiled == interpreted
+    return compiled
+
+
+class TestCompile(TestCase):
+    def test_compile_is_cached_on_the_schema(self):
+        schema = Schema.build({"file_type": "csv", "fields": [{"key": "name", "type": "str", "column-number": 1}]})
+        assert schema.compiled is None
+
+        compiled = schema.compile()
+
+        assert isinstance(compiled, CompiledRow)
+        assert schema.compile() is compiled
+        assert "def process_row(row, row_number):" in compiled.source
+
+    def test_compile_option(self):
+        schema = Schema.build(
+            {"file_type": "csv", "compile": True, "fields": [{"key": "name", "type": "str", "column-number": 1}]}
+        )
+        assert schema.compiled is not None
+        assert schema.parse(b"a") == [RowParsed(row_number=1, values={"name": "a"})]
+
+    def test_csv_builtin_transforms(self):
+        rows = parse_both(
+            {
+                "file_type": "csv",
+                "delimiter": ";",
+                "fields": [
+                    {
+                        "key": "ean",
+                        "type": "str",
+                        "column-number": 1,
+                        "pre-processors": [
+                            {"name": "strip-whitespaces"},
+                            {"name": "left-strip", "parameters": {"characters": "0"}},
+                        ],
+                        "validators": [{"name": "regex-matches", "parameters": {"pattern": "^\\d{3}$"}}],
+                    },
+                    {
+                        "key": "price",
+                        "type": "decimal",
+                        "column-number": 2,
+                        "pre-processors": [{"name": "replace", "parameters": {"pattern": ",", "replacement": "."}}],
+                        "validators": [{"name": "greater-than", "parameters": {"threshold": 0}}],
+                        "post-processors": [
+                            {"name": "divide", "parameters": {"denominator": 100}},
+                            {"name": "round", "parameters": {"precision": 2}},
+                        ],
+                    },
+                    {
+                        "key": "unit",
+                        "type": "int",
+                        "column-number": 3,
+                        "pre-processors": [{"name": "map", "parameters": {"values": {"K": "0", "A": "1"}}}],
+                    },
+                    {
+                        "key": "code",
+                        "type": "str",
+                        "column-number": 4,
+                        "optional": True,
+                        "pre-processors": [
+                            {"name": "regex-extract", "parameters": {"pattern": "^x(?P<value>\\d+)$"}},
+                            {"name": "left-pad-zeroes", "parameters": {"width": 4}},
+                        ],
+                        "validators": [{"name": "not-null-or-empty"}],
+                    },
+                ],
+            },
+            b" 0123 ;1250,5;K;x12\n12;-1;Z;y\n123;1;A;\n",
+        )
+
+        assert rows[0] == RowParsed(
+            row_number=1, values={"ean": "123", "price": Decimal("12.50"), "unit": 0, "code": "0012"}
+        )
+        assert isinstance(rows[1], RowFailed) and len(rows[1].errors) == 4
+        assert rows[2] == RowParsed(
+            row_number=3, values={"ean": "123", "price": Decimal("0.01"), "unit": 1, "code": None}
+        )
+
+    def test_columnar_required_and_skip_row(self):
+        rows = parse_both(
+            {
+                "file_type": "columnar",
+                "fields": [
+                    {"key": "id", "type": "int", "column-start": 0, "column-length": 2},
+                    {
+                        "key": "qty",
+                        "type": {"key": "int", "on-error": "skip-row"},
+                        "column-start": 2,
+                        "column-length": 2,
+                    },
+                ],
+            },
+            b"0102\n  03\n04xx\n",
+        )
+
+        assert rows[0] == RowParsed(row_number=1, values={"id": 1, "qty": 2})
+        assert rows[1] == RowFailed(
+            row_number=2,
+            errors=[
+                {
+                    "column-start": 0,
+                    "column-length": 2,
+                    "field-key": "id",
+                    "error": "value '  ' is not a valid integer",
+                }
+            ],
+        )
+        assert isinstance(rows[2], RowSkipped)
+
+    def test_custom_transform_falls_back_to_apply(self):
+        class IsEven(Validator):
+            def apply(self, value: int) -> int:
+                if value % 2:
+                    raise ValueError("value is odd")
+                return value
+
+            @staticmethod
+            def key() -> str:
+                return "is-even"
+
+        Validator.register(IsEven)
+        rows = parse_both(
+            {
+                "file_type": "csv",
+                "fields": [{"key": "n", "type": "int", "column-number": 1, "validators": [{"name": "is-even"}]}],
+            },
+            b"2\n3\n",
+        )
+        assert rows == [
+            RowParsed(row_number=1, values={"n": 2}),
+            RowFailed(row_number=2, errors=[{"column-number": 1, "field-key": "n", "error": "value is odd"}]),
+        ]
+
+    def test_computed_fields(self):
+        rows = parse_both(
+            {
+                "file_type": "csv",
+                "delimiter": ";",
+                "fields": [
+                    {"key": "a", "type": "str", "column-number": 1},
+                    {"key": "b", "type": "str", "column-number": 2},
+                ],
+                "computed-fields": [
+                    {"key": "ab", "type": "str", "builder": {"name": "concat", "parameters": {"fields": ["a", "b"]}}}
+                ],
+            },
+            b"x;y\n",
+        )
+        assert rows == [RowParsed(row_number=1, values={"a": "x", "b": "y", "ab": "xy"})]
@@ -92,3 +92,64 @@ class TestExoticEncoding(TestCase):
             RowParsed(row_number=2, values={"name": "Да здравствует Карл Маркс        "}),
             RowParsed(row_number=3, values={"name": "Да здравствует Россия            "}),
         ]
+
+
+class TestEbcdicLineEnds(TestCase):
+    # Records end with LF (0x25), CR LF, a lone CR and NEL (0x15), the last one without any.
+    DATA = "0001abcd\n0002efgh\r\n0003ijkl\r0004mnop\x85\n0005qrst".encode("cp500")
+    ROWS = [
+        RowParsed(row_number=1, values={"id": 1, "name": "abcd"}),
+        RowParsed(row_number=2, values={"id": 2, "name": "efgh"}),
+        RowParsed(row_number=3, values={"id": 3, "name": "ijkl"}),
+        RowParsed(row_number=4, values={"id": 4, "name": "mnop"}),
+        RowParsed(row_number=6, values={"id": 5, "name": "qrst"}),
+    ]
+
+    def build_schema(self, byte_records: bool) -> Schema:
+        return Schema.build(
+            {
+                "file_type": "columnar",
+                "encoding": "cp500",
+                "byte-records": byte_records,
+                "fields": [
+                    {"key": "id", "type": "int", "column-start": 0, "column-length": 4},
+                    {"key": "name", "type": "str", "column-start": 4, "column-length": 4},
+                ],
+            }
+        )
+
+    def test_columnar(self):
+        for byte_records in (True, False):
+            schema = self.build_schema(byte_records)
+
+            assert schema.parse(self.DATA) == self.ROWS
+            assert schema.parse(self.DATA, start_row=3) == self.ROWS[2:]
+            assert schema.fetch_rows(self.DATA, [4, 6], schema.build_index(self.DATA, step=2)) == [
+                self.ROWS[3],
+                self.ROWS[4],
+            ]
+            assert list(schema.parallel_parse(self.DATA * 50, parallel=2, chunk_size=64)) == schema.parse(
+                self.DATA * 50
+            )
+
+    def test_csv(self):
+        schema = Schema.build(
+            {
+                "file_type": "csv",
+                "encoding": "cp500",
+                "quotechar": '"',
+                "fields": [
+                    {"key": "id", "type": "int", "column-number": 1},
+                    {"key": "name", "type": "str", "column-number": 2},
+                ],
+            }
+        )
+        data = '1,"a\nb"\x852,c\r3,d'.encode("cp500")
+        rows = [
+            RowParsed(row_number=1, values={"id": 1, "name": "a\nb"}),
+            RowParsed(row_number=2, values={"id": 2, "name": "c"}),
+            RowParsed(row_number=3, values={"id": 3, "name": "d"}),
+        ]
+
+        assert schema.parse(data) == rows
+        assert schema.parse(data, start_row=2) == rows[1:]
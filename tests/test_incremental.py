@@ -0,0 +1,66 @@
+from typing import Any
+from unittest import TestCase
+
+import pytest
+
+from magicparse import Schema
+from magicparse.schema import RowFailed, RowParsed
+
+
+def build_schema(**options: Any) -> Schema:
+    return Schema.build(
+        {
+            "file_type": "csv",
+            "fields": [
+                {"key": "id", "type": "int", "column-number": 1},
+                {"key": "name", "type": "str", "column-number": 2},
+            ],
+        }
+        | options
+    )
+
+
+class TestIncrementalParser(TestCase):
+    def test_feed_returns_completed_rows(self):
+        parser = build_schema().incremental_parser()
+
+        assert parser.feed(b"1,a\n2,") == [RowParsed(row_number=1, values={"id": 1, "name": "a"})]
+        assert parser.pending == 2
+        assert parser.feed(b"b") == []
+        assert parser.close() == [RowParsed(row_number=2, values={"id": 2, "name": "b"})]
+
+    def test_multi_bytes_character_split_across_chunks(self):
+        parser = build_schema().incremental_parser()
+        data = "1,José\n".encode("utf-8")
+
+        assert parser.feed(data[:5]) == []
+        assert parser.feed(data[5:]) == [RowParsed(row_number=1, values={"id": 1, "name": "José"})]
+
+    def test_quoted_newline_split_across_chunks(self):
+        parser = build_schema(quotechar='"', has_header=True).incremental_parser()
+
+        assert parser.feed(b'id,name\n1,"a\n') == []
+        assert parser.feed(b'b"\nx,c\n') == [
+            RowParsed(row_number=2, values={"id": 1, "name": "a\nb"}),
+            RowFailed(
+                row_number=3,
+                errors=[{"column-number": 1, "field-key": "id", "error": "value 'x' is not a valid integer"}],
+            ),
+        ]
+        assert parser.close() == []
+
+    def test_byte_by_byte_matches_stream_parse(self):
+        schema = build_schema(quotechar='"')
+        data = '1,"Jo\nsé"\n\n2,李\n3,💩'.encode("utf-8")
+        parser = schema.incremental_parser()
+
+        rows = [row for byte in data for row in parser.feed(bytes([byte]))] + parser.close()
+
+        assert rows == schema.parse(data)
+
+    def test_feed_after_close(self):
+        parser = build_schema().incremental_parser()
+        parser.close()
+        with pytest.raises(ValueError, match="cannot feed a closed parser"):
+            parser.feed(b"1,a\n")
+        assert parser.close() == []
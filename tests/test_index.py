@@ -0,0 +1,133 @@
+import gzip
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import magicparse
+from magicparse import RowIndex, Schema
+from magicparse.records import RecordSplitter
+from magicparse.schema import RowParsed
+
+
+def build_schema(**options: Any) -> Schema:
+    return Schema.build(
+        {
+            "file_type": "csv",
+            "delimiter": ";",
+            "quotechar": '"',
+            "fields": [
+                {"key": "name", "column-number": 1, "type": "str"},
+                {"key": "quantity", "column-number": 2, "type": "int"},
+            ],
+        }
+        | options
+    )
+
+
+DATA = b'a;1\n"b\nc";2\n\nd;x\ne;5\n"f;""g""";6\nh;7'
+
+
+class TestBuild:
+    def test_every_record(self):
+        index = RowIndex.build(BytesIO(DATA), RecordSplitter(quotechar=b'"'), step=1)
+
+        assert index.offsets.tolist() == [0, 4, 12, 13, 17, 21, 33]
+        assert (index.records, index.size) == (7, len(DATA))
+
+    def test_every_nth_record(self):
+        index = RowIndex.build(BytesIO(DATA), RecordSplitter(quotechar=b'"'), step=3, block_size=5)
+
+        assert index.offsets.tolist() == [0, 13, 33]
+
+    def test_terminated_last_record(self):
+        index = RowIndex.build(BytesIO(b"a\nb\n"), RecordSplitter(), step=1)
+
+        assert index.offsets.tolist() == [0, 2]
+        assert index.records == 2
+
+    def test_invalid_step(self):
+        with pytest.raises(ValueError, match="index 'step' must be a positive integer"):
+            RowIndex.build(BytesIO(DATA), RecordSplitter(), step=0)
+
+
+@pytest.mark.parametrize("has_header", [False, True])
+@pytest.mark.parametrize("step", [1, 2, 1024])
+def test_same_rows_as_a_full_parse(has_header: bool, step: int):
+    schema = build_schema(has_header=has_header)
+    index = schema.build_index(DATA, step)
+    rows = schema.parse(DATA)
+
+    for start_row in range(1, 10):
+        expected = [row for row in rows if row.row_number >= start_row]
+
+        assert list(schema.stream_parse(DATA, start_row=start_row, index=index)) == expected, start_row
+        assert schema.fetch_rows(DATA, [start_row], index) == [
+            row for row in expected if row.row_number == start_row
+        ], start_row
+
+
+def test_fetch_rows():
+    schema = build_schema(has_header=True)
+    index = schema.build_index(DATA, step=2)
+    rows = {row.row_number: row for row in schema.parse(DATA)}
+
+    fetched = schema.fetch_rows(DATA, [7, 1, 2, 3, 6, 100, 2], index)
+
+    assert fetched == [rows[2], rows[6], rows[7]]
+    assert schema.fetch_rows(DATA, [6, 7]) == [rows[6], rows[7]]
+
+
+def test_sidecar(tmp_path: Path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(DATA)
+    schema = build_schema()
+    schema.build_index(path, step=2).save(tmp_path / "data.csv.index")
+
+    index = RowIndex.load(tmp_path / "data.csv.index")
+
+    assert index == schema.build_index(path, step=2)
+    assert schema.fetch_rows(path, [6], index) == [RowParsed(6, {"name": 'f;"g"', "quantity": 6})]
+
+
+def test_module_level():
+    options = {"file_type": "csv", "delimiter": ";", "fields": [{"key": "name", "column-number": 1, "type": "str"}]}
+    index = RowIndex.build(BytesIO(b"a\nb\nc\nd\n"), RecordSplitter(), step=2)
+
+    rows = magicparse.stream_parse(b"a\nb\nc\nd\n", options, start_row=3, index=index)
+
+    assert list(rows) == [RowParsed(3, {"name": "c"}), RowParsed(4, {"name": "d"})]
+
+
+def test_not_an_index(tmp_path: Path):
+    (tmp_path / "data.csv").write_bytes(DATA)
+
+    with pytest.raises(ValueError, match="is not a row index"):
+        RowIndex.load(tmp_path / "data.csv")
+
+
+def test_stale_index():
+    schema = build_schema()
+    index = schema.build_index(DATA)
+
+    with pytest.raises(ValueError, match=f"the index was built for a file of {len(DATA)} bytes, not 3"):
+        schema.fetch_rows(b"a;1", [1], index)
+
+
+def test_index_of_another_file_of_the_same_size():
+    schema = build_schema()
+    index = schema.build_index(DATA)
+
+    with pytest.raises(ValueError, match="the index was built for a file starting with other content"):
+        schema.fetch_rows(DATA.replace(b"a;1", b"z;9"), [1], index)
+
+
+def test_compressed_file():
+    schema = build_schema()
+    data = gzip.compress(DATA)
+    index = schema.build_index(data, step=2)
+
+    assert schema.fetch_rows(data, [6, 7], index) == schema.fetch_rows(DATA, [6, 7], schema.build_index(DATA, step=2))
+    with pytest.raises(ValueError, match="the index was built for a file starting with other content"):
+        schema.fetch_rows(gzip.compress(b"z" + DATA[1:]), [6], index)
@@ -0,0 +1,102 @@
+from typing import Any
+from unittest import TestCase
+
+from magicparse import Schema
+from magicparse.fields import ColumnarField
+from magicparse.layouts import ColumnarLayout, is_byte_splittable_encoding, is_single_byte_encoding
+from magicparse.schema import ColumnarSchema, RowFailed, RowParsed
+
+
+def columnar_field(key: str, start: int, length: int) -> ColumnarField:
+    return ColumnarField(key, {"type": "str", "column-start": start, "column-length": length})
+
+
+def test_single_byte_encodings():
+    assert is_single_byte_encoding("latin-1")
+    assert is_single_byte_encoding("cp1252")
+    assert is_single_byte_encoding("cp037")
+    assert not is_single_byte_encoding("utf-8")
+    assert not is_single_byte_encoding("utf-16")
+    assert not is_single_byte_encoding("unknown-encoding")
+
+
+def test_byte_splittable_encodings():
+    assert is_byte_splittable_encoding("UTF-8")
+    assert is_byte_splittable_encoding("cp037")
+    assert is_byte_splittable_encoding("euc-jp")
+    assert not is_byte_splittable_encoding("cp932")
+    assert not is_byte_splittable_encoding("big5")
+    assert not is_byte_splittable_encoding("unknown-encoding")
+
+
+class TestColumnarLayout(TestCase):
+    def test_filler_is_skipped(self):
+        layout = ColumnarLayout([columnar_field("a", 2, 3), columnar_field("b", 7, 2)], "latin-1")
+        assert layout.struct is not None and layout.struct.format == "=2x3s2x2s"
+        assert layout.unpack(b"..abc..de..") == ("abc", "de", b"..abc..de..")
+
+    def test_fields_in_any_order(self):
+        layout = ColumnarLayout([columnar_field("b", 3, 2), columnar_field("a", 0, 3)], "latin-1")
+        row = layout.unpack(b"abcde")
+        assert [field.parse(row).value for field in layout.fields] == ["de", "abc"]  # type: ignore[reportAttributeAccessIssue]
+
+    def test_overlapping_columns_are_sliced(self):
+        layout = ColumnarLayout([columnar_field("a", 0, 3), columnar_field("b", 1, 3)], "latin-1")
+        assert layout.struct is None
+        assert layout.unpack(b"abcd") == ("abc", "bcd", b"abcd")
+
+    def test_short_record(self):
+        layout = ColumnarLayout([columnar_field("a", 0, 2), columnar_field("b", 4, 2)], "latin-1")
+        assert layout.unpack(b"abc") == ("ab", "", b"abc")
+
+    def test_decoding(self):
+        layout = ColumnarLayout([columnar_field("a", 0, 3)], "cp037")
+        assert layout.unpack("Joe".encode("cp037")) == ("Joe", "Joe".encode("cp037"))
+
+
+class TestByteRecords(TestCase):
+    def build(self, **options: Any) -> Schema:
+        return Schema.build(
+            {
+                "file_type": "columnar",
+                "encoding": "cp1252",
+                "fields": [
+                    {"key": "id", "type": "int", "column-start": 0, "column-length": 3},
+                    {"key": "label", "type": "str", "column-start": 10, "column-length": 4},
+                ],
+            }
+            | options
+        )
+
+    def test_layout_for_single_byte_encoding(self):
+        schema = self.build()
+        assert isinstance(schema, ColumnarSchema) and schema.layout is not None
+
+    def test_layout_can_be_disabled(self):
+        schema = self.build(**{"byte-records": False})
+        assert isinstance(schema, ColumnarSchema) and schema.layout is None
+
+    def test_no_layout_for_multi_byte_encoding(self):
+        schema = self.build(encoding="utf-8")
+        assert isinstance(schema, ColumnarSchema) and schema.layout is None
+
+    def test_same_rows_as_decoded_lines(self):
+        data = "001.......Café\r\n\n002.......€uro\nabc.......xxxx\n003\n".encode("cp1252")
+        rows = self.build().parse(data)
+        assert rows == self.build(**{"byte-records": False}, compile=True).parse(data)
+        assert rows == self.build(compile=True).parse(data)
+        assert rows[:2] == [
+            RowParsed(row_number=1, values={"id": 1, "label": "Café"}),
+            RowParsed(row_number=3, values={"id": 2, "label": "€uro"}),
+        ]
+        assert rows[2] == RowFailed(
+            row_number=4,
+            errors=[
+                {
+                    "column-start": 0,
+                    "column-length": 3,
+                    "field-key": "id",
+                    "error": "value 'abc' is not a valid integer",
+                }
+            ],
+        )
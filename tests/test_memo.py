@@ -0,0 +1,193 @@
+import pickle
+from decimal import Decimal
+from typing import Any
+from unittest import TestCase
+
+import pytest
+
+from magicparse import PreProcessor, Schema
+from magicparse.fields import Field
+from magicparse.memo import MIN_REVIEW_INTERVAL, Memo
+from magicparse.schema import RowFailed, RowParsed, RowSkipped
+from magicparse.transform import OnError
+
+
+def build_schema(memoize: Any = True, **options: Any) -> Schema:
+    return Schema.build(
+        {
+            "file_type": "csv",
+            "delimiter": ";",
+            "fields": [
+                {
+                    "key": "rate",
+                    "type": "decimal",
+                    "column-number": 1,
+                    "pre-processors": [{"name": "replace", "parameters": {"pattern": ",", "replacement": "."}}],
+                    "validators": [{"name": "greater-than", "parameters": {"threshold": 0}}],
+                    "memoize": memoize,
+                },
+            ],
+        }
+        | options
+    )
+
+
+def memo_of(schema: Schema) -> Memo:
+    memo = schema.fields[0].memo
+    assert memo is not None
+    return memo
+
+
+class TestMemoize(TestCase):
+    def test_same_rows(self):
+        data = b"5,5\n20,0\n5,5\nx\n0\nx\n"
+        expected = build_schema(memoize=False).parse(data)
+
+        assert build_schema().parse(data) == expected
+        assert build_schema(compile=True).parse(data) == expected
+
+    def test_repeated_values_hit_the_cache(self):
+        for compile in (False, True):
+            schema = build_schema(compile=compile)
+
+            rows = schema.parse(b"5,5\n20,0\n5,5\n5,5\n")
+
+            assert [row.values["rate"] for row in rows if isinstance(row, RowParsed)] == [
+                Decimal("5.5"),
+                Decimal("20.0"),
+                Decimal("5.5"),
+                Decimal("5.5"),
+            ]
+            assert (memo_of(schema).hits, memo_of(schema).misses) == (2, 2)
+
+    def test_failures_are_cached(self):
+        schema = build_schema()
+
+        rows = schema.parse(b"x\nx\n0\n0\n")
+
+        assert all(isinstance(row, RowFailed) for row in rows)
+        assert [failure.code for row in rows if isinstance(row, RowFailed) for failure in row.failures] == [
+            "invalid-decimal",
+            "invalid-decimal",
+            "not-greater-than",
+            "not-greater-than",
+        ]
+        assert memo_of(schema).hits == 2
+
+    def test_skipped_rows_are_cached(self):
+        schema = Schema.build(
+            {
+                "file_type": "csv",
+                "fields": [
+                    {
+                        "key": "rate",
+                        "type": {"key": "decimal", "on-error": "skip-row"},
+                        "column-number": 1,
+                        "memoize": True,
+                    }
+                ],
+            }
+        )
+
+        for compile in (False, True):
+            if compile:
+                schema.compile()
+            rows = schema.parse(b"x\nx\n")
+
+            assert [type(row) for row in rows] == [RowSkipped, RowSkipped]
+            assert isinstance(rows[0], RowSkipped)
+            assert rows[0].errors == [
+                {"column-number": 1, "field-key": "rate", "error": "value 'x' is not a valid decimal"}
+            ]
+
+    def test_parse_field(self):
+        field = Field.build({"key": "rate", "type": "int", "column-number": 1, "memoize": True})
+
+        assert field.parse(["1"]).value == 1  # type: ignore[union-attr]
+        assert field.parse(["1"]).value == 1  # type: ignore[union-attr]
+        with pytest.raises(ValueError, match="value 'x' is not a valid integer"):
+            field.parse(["x"])
+        with pytest.raises(ValueError, match="value 'x' is not a valid integer"):
+            field.parse(["x"])
+
+    def test_disabled_when_hit_rate_is_low(self):
+        schema = build_schema({"max-size": 16, "min-hit-rate": 0.5})
+        data = "".join(f"{value}\n" for value in range(1, MIN_REVIEW_INTERVAL + 11)).encode()
+
+        rows = schema.parse(data)
+
+        assert all(isinstance(row, RowParsed) for row in rows)
+        memo = memo_of(schema)
+        assert not memo.enabled
+        assert memo.cached.cache_info().currsize == 0
+
+    def test_kept_when_hit_rate_is_high(self):
+        schema = build_schema({"max-size": 16})
+        data = b"".join(b"%d\n" % (value % 8 + 1) for value in range(MIN_REVIEW_INTERVAL * 2))
+
+        schema.parse(data)
+
+        memo = memo_of(schema)
+        assert memo.enabled
+        assert memo.misses == 8
+
+    def test_pickling(self):
+        schema = pickle.loads(pickle.dumps(build_schema(compile=True)))
+
+        assert schema.parse(b"1\n1\n") == [
+            RowParsed(row_number=1, values={"rate": Decimal(1)}),
+            RowParsed(row_number=2, values={"rate": Decimal(1)}),
+        ]
+        assert memo_of(schema).hits == 1
+
+    def test_custom_transform(self):
+        class Upper(PreProcessor):
+            def apply(self, value: str) -> str:
+                return value.upper()
+
+            @staticmethod
+            def key() -> str:
+                return "upper"
+
+        PreProcessor.register(Upper)
+        assert Upper(OnError.RAISE).apply("a") == "A"
+
+        with pytest.raises(ValueError, match="field 'code' cannot be memoized: only built-in transforms can be"):
+            Field.build(
+                {
+                    "key": "code",
+                    "type": "str",
+                    "column-number": 1,
+                    "pre-processors": [{"name": "upper"}],
+                    "memoize": True,
+                },
+            )
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError, match="'memoize' must be a boolean or a dict"):
+            build_schema(memoize="yes")
+        with pytest.raises(ValueError, match="unknown memoize options: size"):
+            build_schema(memoize={"size": 3})
+        with pytest.raises(ValueError, match="memoize 'max-size' must be a positive integer"):
+            build_schema(memoize={"max-size": 0})
+        with pytest.raises(ValueError, match="memoize 'min-hit-rate' must be between 0 and 1"):
+            build_schema(memoize={"min-hit-rate": 2})
+
+    def test_equal_values_of_other_types_are_not_shared(self):
+        memo = Memo(repr)
+
+        assert [memo.lookup(value) for value in (Decimal("1.00"), Decimal("1"), 1, True)] == [
+            "Decimal('1.00')",
+            "Decimal('1')",
+            "1",
+            "True",
+        ]
+        assert memo.lookup("1") == "'1'"
+        assert memo.lookup(1.0) == "1.0"
+
+    def test_unhashable_values_are_computed(self):
+        memo = Memo(len)
+
+        assert memo.lookup(["a", "b"]) == 2
+        assert memo.lookup({"a": 1}) == 1
+        assert (memo.hits, memo.misses) == (0, 0)
@@ -0,0 +1,107 @@
+from io import BytesIO
+from typing import Any
+from unittest import TestCase
+
+import magicparse
+from magicparse import Schema
+from magicparse.parallel import iter_chunks
+from magicparse.records import RecordBuffer, RecordSplitter
+from magicparse.schema import RowFailed, RowParsed
+
+
+def csv_options(**options: Any) -> dict[str, Any]:
+    return {
+        "file_type": "csv",
+        "fields": [
+            {"key": "id", "type": "int", "column-number": 1},
+            {"key": "label", "type": "str", "column-number": 2},
+        ],
+    } | options
+
+
+class TestIterChunks(TestCase):
+    def test_chunks_end_at_record_boundaries(self):
+        chunks = list(iter_chunks(BytesIO(b"1,a\n2,b\n3,c\n4,d"), RecordBuffer(RecordSplitter(), False), 5))
+        assert chunks == [(b"1,a\n", 0, 1), (b"2,b\n", 1, 1), (b"3,c\n", 2, 1), (b"4,d", 3, 1)]
+
+    def test_header_is_skipped(self):
+        chunks = list(iter_chunks(BytesIO(b"id\n1\n2\n"), RecordBuffer(RecordSplitter(), True), 100))
+        assert chunks == [(b"1\n2\n", 1, 2)]
+
+    def test_quoted_terminators_are_kept_in_chunk(self):
+        chunks = list(iter_chunks(BytesIO(b'1,"a\nb"\n2,c\n'), RecordBuffer(RecordSplitter(quotechar=b'"'), False), 4))
+        assert chunks == [(b'1,"a\nb"\n', 0, 1), (b"2,c\n", 1, 1)]
+
+
+class TestParallelParse(TestCase):
+    def test_same_rows_as_stream_parse(self):
+        data = b"id,label\n" + b"".join(f'{i},"line\n{i}"\n'.encode() for i in range(200)) + b"x,bad\n"
+        schema = Schema.build(csv_options(has_header=True, quotechar='"'))
+
+        rows = list(schema.parallel_parse(data, parallel=2, chunk_size=64))
+
+        assert rows == schema.parse(data)
+        assert rows[0] == RowParsed(row_number=2, values={"id": 0, "label": "line\n0"})
+        assert isinstance(rows[-1], RowFailed) and rows[-1].row_number == 202
+
+    def test_unordered(self):
+        data = b"".join(f"{i},a\n".encode() for i in range(500))
+        schema = Schema.build(csv_options())
+
+        rows = list(schema.parallel_parse(data, parallel=3, ordered=False, chunk_size=100))
+
+        assert sorted(rows, key=lambda row: row.row_number) == schema.parse(data)
+
+    def test_columnar(self):
+        schema = Schema.build(
+            {"file_type": "columnar", "fields": [{"key": "id", "type": "int", "column-start": 0, "column-length": 3}]}
+        )
+        data = b"001\n002\n003\n004\n"
+        assert list(schema.parallel_parse(BytesIO(data), parallel=2, chunk_size=4)) == schema.parse(data)
+
+    def test_column_names(self):
+        schema = Schema.build(
+            {
+                "file_type": "csv",
+                "has_header": True,
+                "fields": [{"key": "id", "type": "int", "column-name": "id"}],
+            }
+        )
+        data = b"label,id\na,1\nb,2\nc,3\n"
+        assert list(schema.parallel_parse(data, parallel=2, chunk_size=4)) == schema.parse(data)
+
+    def test_worker_error_does_not_lose_other_chunks(self):
+        schema = Schema.build(csv_options())
+
+        rows = list(schema.parallel_parse(b"1,a\n2,\xff\n3,c\n", parallel=2, chunk_size=4))
+
+        assert rows[0] == RowParsed(row_number=1, values={"id": 1, "label": "a"})
+        assert isinstance(rows[1], RowFailed) and rows[1].row_number == 2
+        assert rows[1].errors[0]["error"].startswith("cannot parse the record: 'utf-8' codec can't decode")
+        assert rows[2] == RowParsed(row_number=3, values={"id": 3, "label": "c"})
+
+    def test_worker_error_only_fails_its_records(self):
+        schema = Schema.build(csv_options(has_header=True))
+
+        rows = list(schema.parallel_parse(b"id,label\n1,a\n\n2,\xff\nx,b\n3,c", parallel=2))
+
+        assert [(type(row), row.row_number) for row in rows] == [
+            (RowParsed, 2),
+            (RowFailed, 4),
+            (RowFailed, 5),
+            (RowParsed, 6),
+        ]
+        assert isinstance(rows[2], RowFailed)
+        assert rows[2].errors == schema.parse(b"id,label\nx,b\n")[0].errors  # type: ignore[union-attr]
+
+    def test_compiled_schema(self):
+        schema = Schema.build(csv_options(compile=True))
+        data = b"1,a\n2,b\n"
+        assert list(schema.parallel_parse(data, parallel=2, chunk_size=4)) == schema.parse(data)
+
+    def test_top_level_parallel_parse(self):
+        rows = list(magicparse.parallel_parse(b"1,a\n2,b\n", csv_options(), parallel=2))
+        assert rows == [
+            RowParsed(row_number=1, values={"id": 1, "label": "a"}),
+            RowParsed(row_number=2, values={"id": 2, "label": "b"}),
+        ]
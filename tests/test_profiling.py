@@ -0,0 +1,144 @@
+import json
+from typing import Any
+from unittest import TestCase
+
+import magicparse
+from magicparse import Profiler, Schema
+from magicparse.schema import RowFailed, RowParsed, RowSkipped
+
+
+def build_schema(**options: Any) -> Schema:
+    return Schema.build(
+        {
+            "file_type": "csv",
+            "fields": [
+                {
+                    "key": "code",
+                    "type": "int",
+                    "column-number": 1,
+                    "pre-processors": [{"name": "regex-extract", "parameters": {"pattern": "^x(?P<value>.+)$"}}],
+                },
+                {
+                    "key": "price",
+                    "type": {"key": "decimal", "on-error": "skip-row"},
+                    "column-number": 2,
+                },
+            ],
+            "computed-fields": [
+                {
+                    "key": "total",
+                    "type": "decimal",
+                    "builder": {"name": "multiply", "parameters": {"x_factor": "code", "y_factor": "price"}},
+                }
+            ],
+        }
+        | options
+    )
+
+
+DATA = b"x1,1.5\nx2,abc\ny3,2\nxa,3\n"
+
+
+class TestProfiler(TestCase):
+    def test_rows_are_unchanged(self):
+        schema = build_schema()
+
+        assert schema.parse(DATA, profiler=Profiler()) == schema.parse(DATA)
+
+    def test_field_stats(self):
+        profiler = Profiler()
+        rows = build_schema().parse(DATA, profiler=profiler)
+
+        assert [type(row) for row in rows] == [RowParsed, RowSkipped, RowFailed, RowFailed]
+        assert profiler.rows == 4
+        code, price, total = profiler.fields.values()
+        assert (code.name, code.calls, code.failures, code.skips) == ("code", 4, 2, 0)
+        assert (price.name, price.calls, price.failures, price.skips) == ("price", 4, 0, 1)
+        assert (total.name, total.calls, total.failures, total.skips) == ("total", 1, 0, 0)
+
+    def test_transform_stats(self):
+        profiler = Profiler()
+        build_schema().parse(DATA, profiler=profiler)
+
+        code, price, total = profiler.fields.values()
+        assert [(stats.name, stats.calls, stats.failures) for stats in code.transforms] == [
+            ("regex-extract", 4, 1),
+            ("int", 3, 1),
+        ]
+        assert [(stats.name, stats.calls, stats.skips) for stats in price.transforms] == [("decimal", 4, 1)]
+        assert [(stats.name, stats.calls) for stats in total.transforms] == [("multiply", 1), ("decimal", 1)]
+        assert code.time_ns >= sum(stats.time_ns for stats in code.transforms)
+
+    def test_reader_stats(self):
+        profiler = Profiler()
+        build_schema().parse(DATA, profiler=profiler)
+
+        assert profiler.reader.calls == 4
+        assert profiler.reader.time_ns > 0
+
+    def test_with_offsets(self):
+        profiler = Profiler()
+        rows = list(build_schema().stream_parse(DATA, with_offsets=True, profiler=profiler))
+
+        assert len(rows) == 4
+        assert profiler.reader.calls == 4
+        assert profiler.fields["code"].calls == 4
+
+    def test_compiled_schema(self):
+        schema = build_schema(compile=True)
+        profiler = Profiler()
+
+        assert schema.parse(DATA, profiler=profiler) == schema.parse(DATA)
+        assert profiler.fields["code"].calls == 4
+
+    def test_stats_accumulate(self):
+        profiler = Profiler()
+        schema = build_schema()
+        schema.parse(DATA, profiler=profiler)
+        schema.parse(DATA, profiler=profiler)
+
+        assert profiler.rows == 8
+        assert profiler.fields["price"].transforms[0].skips == 2
+
+    def test_named_columns(self):
+        schema = Schema.build(
+            {"file_type": "csv", "has_header": True, "fields": [{"key": "id", "type": "int", "column-name": "id"}]}
+        )
+        profiler = Profiler()
+
+        rows = schema.parse(b"name,id\na,1\n", profiler=profiler)
+
+        assert rows == [RowParsed(row_number=2, values={"id": 1})]
+        assert profiler.reader.calls == 2
+        assert profiler.fields["id"].calls == 1
+
+    def test_report(self):
+        profiler = Profiler()
+        magicparse.parse(
+            DATA,
+            {"file_type": "csv", "fields": [{"key": "code", "type": "str", "column-number": 1}]},
+            profiler=profiler,
+        )
+
+        report = json.loads(json.dumps(profiler.report()))
+
+        assert report["rows"] == 4
+        assert report["reader"]["calls"] == 4
+        assert report["fields"] == [
+            {
+                "key": "code",
+                "seconds": report["fields"][0]["seconds"],
+                "calls": 4,
+                "failures": 0,
+                "skips": 0,
+                "transforms": [
+                    {
+                        "name": "str",
+                        "seconds": report["fields"][0]["transforms"][0]["seconds"],
+                        "calls": 4,
+                        "failures": 0,
+                        "skips": 0,
+                    }
+                ],
+            }
+        ]
@@ -0,0 +1,151 @@
+from io import BytesIO
+
+import pytest
+
+from magicparse.records import (
+    FixedLengthSplitter,
+    LineSplitter,
+    RecordSplitter,
+    decode_blocks,
+    ends_quoted,
+    read_fixed_length_records,
+    split_lines,
+    split_records,
+)
+
+
+def test_boundaries():
+    assert list(RecordSplitter().boundaries(b"a\nbb\nc")) == [2, 5]
+
+
+def test_boundaries_with_multi_bytes_terminator():
+    assert list(RecordSplitter(b"\r\n").boundaries(b"a\r\nb\r\n")) == [3, 6]
+
+
+def test_boundaries_ignore_quoted_terminators():
+    splitter = RecordSplitter(quotechar=b'"')
+    assert list(splitter.boundaries(b'a,"b\nc"\nd,"e""\nf"\ng')) == [8, 18]
+
+
+def test_boundaries_stop_on_unclosed_quote():
+    splitter = RecordSplitter(quotechar=b'"')
+    assert list(splitter.boundaries(b'a\n"b\nc')) == [2]
+
+
+def test_boundaries_only_open_quotes_at_field_start():
+    splitter = RecordSplitter(quotechar=b'"', delimiter=b";")
+    assert list(splitter.boundaries(b'a"b;1\nc;"d\ne"x"\nf')) == [6, 16]
+
+
+def test_scan():
+    assert RecordSplitter().scan(b"a\nb\nc") == (2, 4)
+    assert RecordSplitter().scan(b"abc") == (0, 0)
+    assert RecordSplitter(quotechar=b"'").scan(b"'a\nb'\nc") == (1, 6)
+
+
+def test_count():
+    assert RecordSplitter().count(b"a\nb\nc") == 3
+    assert RecordSplitter().count(b"a\nb\n") == 2
+    assert RecordSplitter().count(b"") == 0
+
+
+def test_skip():
+    splitter = RecordSplitter()
+    assert splitter.skip(b"a\nb\nc\n", 2) == (2, 4)
+    assert splitter.skip(b"a\nb\nc\n", 5) == (3, 6)
+    assert splitter.skip(b"a\nb\nc\n", 0) == (0, 0)
+
+
+def blocks_of[T: (bytes, str)](data: T, size: int) -> list[T]:
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+def test_split_records():
+    assert list(split_records([b"a\nb", b"b\n\nc"], b"\n")) == [b"a", b"bb", b"", b"c"]
+    assert list(split_records(["a\x1eb", "\x1e"], "\x1e")) == ["a", "b"]
+
+
+def test_split_records_strip():
+    assert list(split_records(["a\r\nb\r", "\n\r\nc\r"], "\n", strip="\r")) == ["a", "b", "", "c"]
+
+
+def test_split_records_ignore_quoted_terminators():
+    data = b'a,"b\nc"\nd,"e""\nf"\n"g\n\nh"\ni\n"j'
+
+    for size in range(1, len(data) + 1):
+        records = list(split_records(blocks_of(data, size), b"\n", b'"'))
+
+        assert records == [b'a,"b\nc"', b'd,"e""\nf"', b'"g\n\nh"', b"i", b'"j'], size
+
+
+def test_split_records_like_record_splitter():
+    data = b'a,"b\r\nc"\r\n\r\n"""d"""\r\ne'
+    splitter = RecordSplitter(b"\r\n", b'"')
+    ends = [0, *splitter.boundaries(data), len(data)]
+
+    expected = [data[start:end].removesuffix(b"\r\n") for start, end in zip(ends, ends[1:])]
+    assert list(split_records(blocks_of(data, 3), b"\r\n", b'"')) == expected
+
+
+def test_split_records_stray_quote():
+    assert list(split_records(['a"b,1\nc,"d', '\n"""e",2\n'], "\n", '"')) == ['a"b,1', 'c,"d\n"""e",2']
+
+
+def test_ends_quoted():
+    assert not ends_quoted('a"b,c', ",", '"')
+    assert ends_quoted('a,"b""', ",", '"')
+    assert not ends_quoted('a,"b"c"', ",", '"')
+    assert not ends_quoted('b",c', ",", '"', quoted=True)
+    assert ends_quoted(b'x,"a,b', b",", b'"', start=2, end=5)
+
+
+@pytest.mark.parametrize("keepends", [False, True])
+def test_split_lines(keepends: bool):
+    data = "a\nb\r\nc\rd\r\r\ne\x85f"
+    expected = ["a\n", "b\r\n", "c\r", "d\r", "\r\n", "e\x85f"]
+
+    for size in range(1, len(data) + 1):
+        lines = list(split_lines(blocks_of(data, size), "\r\n", keepends))
+
+        assert lines == (expected if keepends else [line.rstrip("\r\n") for line in expected]), size
+    assert list(split_lines([b"a\r\nb\r\n"], b"\r\n")) == [b"a", b"b"]
+    assert list(split_lines([b"a\x15b\x25"], b"\x0d\x25\x15")) == [b"a", b"b"]
+
+
+def test_decode_blocks():
+    data = "José 李 💩".encode()
+
+    assert "".join(decode_blocks(BytesIO(data), "utf-8", block_size=1)) == "José 李 💩"
+    assert "".join(decode_blocks(BytesIO("ab".encode("utf-16")), "utf-16", block_size=3)) == "ab"
+
+
+def test_fixed_length_splitter():
+    splitter = FixedLengthSplitter(3)
+
+    assert list(splitter.boundaries(b"abcdefgh")) == [3, 6]
+    assert list(splitter.boundaries(b"abcdefgh", 1, 7)) == [4, 7]
+    assert splitter.scan(b"abcdefgh", 1) == (2, 7)
+    assert splitter.count(b"abcdefgh") == 3
+    assert splitter.skip(b"abcdefgh", 5) == (2, 6)
+
+
+def test_read_fixed_length_records():
+    stream = BytesIO(b"abcdefgh")
+
+    assert list(read_fixed_length_records(stream, 3, block_size=4)) == [b"abc", b"def", b"gh"]
+
+
+def test_line_splitter():
+    splitter = LineSplitter()
+
+    assert list(splitter.boundaries(b"a\nb\r\nc\rd\r")) == [2, 5, 7]
+    assert splitter.scan(b"a\nb\r\nc\rd\r") == (3, 7)
+    assert splitter.scan(b"a\nb\r\nc") == (2, 5)
+    assert splitter.count(b"a\rb\r") == 2
+    assert splitter.skip(b"a\rb\rc\r", 2) == (2, 4)
+
+
+def test_line_splitter_ebcdic():
+    splitter = LineSplitter(b"\x0d\x25\x15", quotechar=b"\x7f", delimiter=b"\x6b")
+
+    assert list(splitter.boundaries(b"a\x25b\x0d\x25c\x15\x7fd\x15e\x7f\x25f")) == [2, 5, 7, 13]
@@ -0,0 +1,114 @@
+from io import BytesIO
+from typing import Any
+
+import pytest
+
+import magicparse
+from magicparse import Schema
+from magicparse.records import RecordSplitter, skip_records
+from magicparse.schema import RowParsed
+
+
+def build_schema(**options: Any) -> Schema:
+    return Schema.build(
+        {
+            "file_type": "csv",
+            "delimiter": ";",
+            "quotechar": '"',
+            "fields": [
+                {"key": "name", "column-number": 1, "type": "str"},
+                {"key": "quantity", "column-number": 2, "type": "int"},
+            ],
+        }
+        | options
+    )
+
+
+DATA = b'a;1\n"b\nc";2\n\nd;x\ne;5\n"f;""g""";6\nh;7'
+
+
+@pytest.mark.parametrize("has_header", [False, True])
+@pytest.mark.parametrize("with_offsets", [False, True])
+def test_same_rows_as_a_full_parse(has_header: bool, with_offsets: bool):
+    schema = build_schema(has_header=has_header)
+    rows = schema.parse(DATA)
+
+    for start_row in range(1, 10):
+        for stop_row in range(start_row, 10):
+            expected = [row for row in rows if start_row <= row.row_number < stop_row]
+
+            assert (
+                list(schema.stream_parse(DATA, with_offsets=with_offsets, start_row=start_row, stop_row=stop_row))
+                == expected
+            ), (start_row, stop_row)
+
+
+def test_quoted_records_are_skipped_whole():
+    [row] = build_schema().parse(DATA, start_row=6, limit=1)
+
+    assert row == RowParsed(6, {"name": 'f;"g"', "quantity": 6})
+
+
+def test_limit():
+    schema = build_schema()
+
+    assert [row.row_number for row in schema.parse(DATA, limit=2)] == [1, 2]
+    assert [row.row_number for row in schema.parse(DATA, start_row=3, limit=2)] == [4, 5]
+    assert schema.parse(DATA, limit=0) == []
+
+
+def test_beyond_the_last_row():
+    assert build_schema().parse(DATA, start_row=100) == []
+
+
+def test_module_level():
+    options = {"file_type": "csv", "delimiter": ";", "fields": [{"key": "name", "column-number": 1, "type": "str"}]}
+
+    rows = magicparse.parse(b"a\nb\nc\nd\n", options, start_row=2, stop_row=4)
+
+    assert rows == [RowParsed(2, {"name": "b"}), RowParsed(3, {"name": "c"})]
+
+
+def test_columnar():
+    schema = Schema.build(
+        {"file_type": "columnar", "fields": [{"key": "id", "column-start": 0, "column-length": 2, "type": "int"}]}
+    )
+
+    rows = schema.parse(b"01\n02\n03\n04\n", start_row=3)
+
+    assert rows == [RowParsed(3, {"id": 3}), RowParsed(4, {"id": 4})]
+
+
+@pytest.mark.parametrize(
+    ("options", "message"),
+    [
+        ({"start_row": 0}, "'start_row' must be a positive integer"),
+        ({"stop_row": 0}, "'stop_row' must be a positive integer"),
+        ({"limit": -1}, "'limit' must be a positive integer or zero"),
+    ],
+)
+def test_invalid_range(options: dict[str, Any], message: str):
+    with pytest.raises(ValueError, match=message):
+        build_schema().parse(DATA, **options)
+
+
+def test_resume_from_and_start_row():
+    with pytest.raises(ValueError, match="'start_row' and 'resume_from' cannot be combined"):
+        list(build_schema().stream_parse(DATA, resume_from=magicparse.Checkpoint(4, 2), start_row=2))
+
+
+class TestSkipRecords:
+    def test_across_blocks(self):
+        stream = BytesIO(b"a\nbb\nccc\ndddd\n")
+
+        assert skip_records(stream, RecordSplitter(), 3, block_size=3) == (3, 9)
+
+    def test_quoted_across_blocks(self):
+        stream = BytesIO(b'"a\nb"\n"c\n"\nd\n')
+
+        assert skip_records(stream, RecordSplitter(quotechar=b'"'), 2, block_size=4) == (2, 11)
+
+    def test_unterminated_last_record(self):
+        stream = BytesIO(b"a\nb")
+
+        assert skip_records(stream, RecordSplitter(), 5) == (2, 3)
@@ -1,12 +1,24 @@
+import copy
+import dataclasses
+import pickle
 from collections.abc import Iterator
 from decimal import Decimal
 from io import BytesIO
 from typing import Any
 
-from magicparse import Schema
+from magicparse import Builder, Schema
 from magicparse.post_processors import PostProcessor
 from magicparse.pre_processors import PreProcessor
-from magicparse.schema import ColumnarSchema, CsvSchema, RowParsed, RowFailed, RowSkipped
+from magicparse.rows import CompactValues
+from magicparse.schema import (
+    MAX_BOUND_SCHEMAS,
+    ColumnarSchema,
+    CsvSchema,
+    MultiRecordSchema,
+    RowParsed,
+    RowFailed,
+    RowSkipped,
+)
 from magicparse.fields import ColumnarField, CsvField
 import pytest
 from unittest import TestCase
@@ -452,6 +464,86 @@ class TestSteamParse(TestCase):
         assert rows[0].row_number == 1
 
 
+class TestColumnName(TestCase):
+    def build_schema(self, **options: Any) -> Schema:
+        return Schema.build(
+            {
+                "file_type": "csv",
+                "has_header": True,
+                "fields": [
+                    {"key": "id", "type": "int", "column-name": "ID"},
+                    {"key": "name", "type": "str", "column-name": "Name"},
+                    {"key": "note", "type": "str", "column-name": "Note", "optional": True},
+                ],
+            }
+            | options
+        )
+
+    def test_columns_are_found_by_name(self):
+        schema = self.build_schema()
+
+        assert schema.parse(b"Name,ID\na,1\n") == [RowParsed(row_number=2, values={"id": 1, "name": "a", "note": None})]
+        assert schema.parse(b"Note,ID,Name\nn,2,b\n") == [
+            RowParsed(row_number=2, values={"id": 2, "name": "b", "note": "n"})
+        ]
+
+    def test_compiled(self):
+        schema = self.build_schema(compile=True)
+        data = b"ID,Other,Name\n1,x,a\n"
+
+        assert schema.parse(data) == self.build_schema().parse(data)
+
+    def test_header_is_resolved_once(self):
+        schema = self.build_schema()
+        assert isinstance(schema, CsvSchema)
+        schema.parse(b"Name,ID\na,1\n")
+        schema.parse(b"Name,ID\nb,2\n")
+        schema.parse(b"Name,ID,Extra\nb,2,x\n")
+
+        assert list(schema.bound_schemas) == [(1, 0, None)]
+
+    def test_bound_schemas_are_bounded(self):
+        schema = self.build_schema()
+        assert isinstance(schema, CsvSchema)
+
+        for width in range(MAX_BOUND_SCHEMAS + 5):
+            header = ",".join(["x"] * width + ["ID", "Name"])
+            assert schema.parse(f"{header}\n{'y,' * width}1,a\n".encode()) == [
+                RowParsed(2, {"id": 1, "name": "a", "note": None})
+            ]
+
+        assert len(schema.bound_schemas) == MAX_BOUND_SCHEMAS
+        assert next(reversed(schema.bound_schemas)) == (MAX_BOUND_SCHEMAS + 4, MAX_BOUND_SCHEMAS + 5, None)
+
+    def test_missing_required_column(self):
+        schema = self.build_schema()
+        with pytest.raises(ValueError, match="column 'ID' of field 'id' is missing from the header"):
+            schema.parse(b"Name\na\n")
+
+    def test_error_reports_column_name(self):
+        schema = self.build_schema()
+        rows = schema.parse(b"ID,Name\nx,a\n")
+        assert rows == [
+            RowFailed(
+                row_number=2,
+                errors=[{"column-name": "ID", "field-key": "id", "error": "value 'x' is not a valid integer"}],
+            )
+        ]
+
+    def test_requires_header(self):
+        with pytest.raises(ValueError, match="fields with a 'column-name' require 'has_header'"):
+            self.build_schema(has_header=False)
+
+    def test_every_reader(self):
+        schema = self.build_schema()
+        data = b"Name,ID\na,1\nb,2\n"
+        expected = schema.parse(data)
+        parser = schema.incremental_parser()
+
+        assert list(schema.stream_parse(data, with_offsets=True)) == expected
+        assert parser.feed(data) + parser.close() == expected
+
+
 class TestComputedFields(TestCase):
     def test_concat(self):
         schema = Schema.build(
@@ -539,6 +631,35 @@ class TestComputedFields(TestCase):
             )
         ]
 
+    def test_computed_field_replacing_a_field_keeps_its_position(self):
+        schema = Schema.build(
+            {
+                "file_type": "csv",
+                "delimiter": ";",
+                "fields": [
+                    {"key": "price", "type": "int", "column-number": 1},
+                    {"key": "unit", "type": "int", "column-number": 2},
+                ],
+                "computed-fields": [
+                    {
+                        "key": "price",
+                        "type": "int",
+                        "builder": {"name": "multiply", "parameters": {"x_factor": "price", "y_factor": "unit"}},
+                    },
+                    {
+                        "key": "total",
+                        "type": "int",
+                        "builder": {"name": "multiply", "parameters": {"x_factor": "price", "y_factor": "unit"}},
+                    },
+                ],
+            }
+        )
+
+        rows = schema.parse(b"3;2")
+
+        assert rows == [RowParsed(row_number=1, values={"price": 6, "unit": 2, "total": 12})]
+        assert isinstance(rows[0], RowParsed) and list(rows[0].values) == ["price", "unit", "total"]
+
 
 class TestHandleTypeError(TestCase):
     def test_default_behavior_raise(self):
@@ -813,3 +934,551 @@ class TestHandlePreProcessorError(TestCase):
                 ],
             )
         ]
+
+
+class TestCompactRowFormat(TestCase):
+    def build_schema(self, **options: Any) -> Schema:
+        return Schema.build(
+            {
+                "file_type": "csv",
+                "row-format": "compact",
+                "fields": [
+                    {"key": "id", "type": "int", "column-number": 1},
+                    {"key": "name", "type": "str", "column-number": 2, "optional": True},
+                ],
+            }
+            | options
+        )
+
+    def test_same_rows_as_dict_format(self):
+        data = b"1,a\n2,\nx,c\n"
+        expected = self.build_schema(**{"row-format": "dict"}).parse(data)
+
+        assert self.build_schema().parse(data) == expected
+        assert self.build_schema(compile=True).parse(data) == expected
+
+    def test_values_share_their_key_index(self):
+        rows = self.build_schema(compile=True).parse(b"1,a\n2,b\n")
+
+        assert all(isinstance(row, RowParsed) and isinstance(row.values, CompactValues) for row in rows)
+        first, second = [row.values for row in rows if isinstance(row, RowParsed)]
+        assert isinstance(first, CompactValues) and isinstance(second, CompactValues)
+        assert first.key_index is second.key_index
+        assert first["name"] == "a" and dict(second) == {"id": 2, "name": "b"}
+
+    def test_computed_fields(self):
+        schema = self.build_schema(
+            **{
+                "computed-fields": [
+                    {
+                        "key": "double",
+                        "type": "int",
+                        "builder": {"name": "multiply", "parameters": {"x_factor": "id", "y_factor": "id"}},
+                    }
+                ]
+            }
+        )
+
+        rows = schema.parse(b"3,a\n")
+
+        assert rows == [RowParsed(row_number=1, values={"id": 3, "name": "a", "double": 9})]
+        assert isinstance(rows[0], RowParsed) and list(rows[0].values) == ["id", "name", "double"]
+
+    def test_unknown_row_format(self):
+        with pytest.raises(ValueError, match="unknown row format 'tuple'"):
+            self.build_schema(**{"row-format": "tuple"})
+
+
+class TestLazyErrors(TestCase):
+    def build_schema(self, **options: Any) -> Schema:
+        return Schema.build(
+            {
+                "file_type": "csv",
+                "fields": [
+                    {"key": "id", "type": "int", "column-number": 1},
+                    {
+                        "key": "code",
+                        "type": "str",
+                        "column-number": 2,
+                        "validators": [{"name": "regex-matches", "parameters": {"pattern": "^[A-Z]+$"}}],
+                    },
+                ],
+            }
+            | options
+        )
+
+    def test_failures_carry_codes_and_params(self):
+        for schema in (self.build_schema(), self.build_schema(compile=True)):
+            [row] = schema.parse(b"x,abc\n")
+
+            assert isinstance(row, RowFailed)
+            assert [(failure.field.key, failure.code, failure.params) for failure in row.failures] == [
+                ("id", "invalid-integer", {"value": "x"}),
+                ("code", "regex-mismatch", {"pattern": "^[A-Z]+$"}),
+            ]
+            assert row.errors == [
+                {"column-number": 1, "field-key": "id", "error": "value 'x' is not a valid integer"},
+                {"column-number": 2, "field-key": "code", "error": "string does not match regex '^[A-Z]+$'"},
+            ]
+
+    def test_errors_are_formatted_once(self):
+        [row] = self.build_schema().parse(b"x,ABC\n")
+
+        assert isinstance(row, RowFailed)
+        assert row.errors is row.errors
+
+    def test_rows_given_their_errors(self):
+        row = RowFailed(row_number=1, errors=[{"error": "boom"}])
+
+        assert row.failures == []
+        assert row == RowFailed(1, [{"error": "boom"}])
+        assert repr(row) == "RowFailed(row_number=1, errors=[{'error': 'boom'}])"
+        with pytest.raises(AttributeError):
+            row.row_number = 2  # type: ignore[misc]
+
+    def test_rows_are_dataclasses(self):
+        [row] = self.build_schema().parse(b"x,ABC\n")
+        assert isinstance(row, RowFailed)
+        errors = [{"column-number": 1, "field-key": "id", "error": "value 'x' is not a valid integer"}]
+
+        moved = copy.replace(row, offset=12)
+        assert (moved.offset, len(moved.failures)) == (12, 1)
+        assert dataclasses.is_dataclass(row)
+        assert dataclasses.asdict(row) == {"row_number": 1, "errors": errors, "offset": None}
+        assert dataclasses.replace(row, row_number=2) == RowFailed(2, errors)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            row.errors = []  # type: ignore[misc]
+
+    def test_pickling_formats_errors(self):
+        [row] = self.build_schema().parse(b"x,ABC\n")
+
+        assert pickle.loads(pickle.dumps(row)) == row
+
+
+class TestSelect(TestCase):
+    def build_schema(self, options: dict[str, Any] | None = None, file_type: str = "csv") -> Schema:
+        if file_type == "csv":
+            positions = [{"column-number": number} for number in (1, 2, 3, 4)]
+        else:
+            positions = [{"column-start": start, "column-length": 3} for start in (0, 3, 6, 9)]
+        return Schema.build(
+            {
+                "file_type": file_type,
+                "fields": [
+                    {"key": "id", "type": "int"} | positions[0],
+                    {"key": "price", "type": "decimal"} | positions[1],
+                    {"key": "quantity", "type": "int"} | positions[2],
+                    {"key": "code", "type": "int"} | positions[3],
+                ],
+                "computed-fields": [
+                    {
+                        "key": "total",
+                        "type": "decimal",
+                        "builder": {"name": "multiply", "parameters": {"x_factor": "price", "y_factor": "quantity"}},
+                    },
+                    {
+                        "key": "label",
+                        "type": "str",
+                        "builder": {"name": "concat", "parameters": {"fields": ["total", "label_suffix"]}},
+                        "optional": True,
+                    },
+                ],
+            }
+            | (options or {})
+        )
+
+    def test_only_selected_fields_are_parsed(self):
+        schema = self.build_schema()
+
+        rows = schema.parse(b"1,1.5,2,xxx\n", select=["id", "price"])
+
+        assert rows == [RowParsed(row_number=1, values={"id": 1, "price": Decimal("1.5")})]
+
+    def test_computed_field_dependencies(self):
+        for compile in (False, True):
+            schema = self.build_schema({"compile": compile})
+
+            rows = schema.parse(b"1,1.5,2,xxx\n", select=["total"])
+
+            assert rows == [RowParsed(row_number=1, values={"total": Decimal("3.0")})]
+
+    def test_failing_dependency(self):
+        [row] = self.build_schema().parse(b"1,1.5,x,1\n", select=["id", "total"])
+
+        assert isinstance(row, RowFailed)
+        assert [failure.field.key for failure in row.failures] == ["quantity"]
+
+    def test_columnar(self):
+        for compile in (False, True):
+            schema = self.build_schema({"compile": compile, "encoding": "latin-1"}, "columnar")
+
+            rows = schema.parse(b"  11.5  2xxx\n", select=["quantity", "total"])
+
+            assert rows == [RowParsed(row_number=1, values={"quantity": 2, "total": Decimal("3.0")})]
+            selected = schema.select(["quantity", "total"])
+            assert isinstance(selected, ColumnarSchema)
+            assert selected.layout is not None and selected.layout.spans == [(3, 6), (6, 9)]
+
+    def test_compact_rows(self):
+        schema = self.build_schema({"row-format": "compact"})
+
+        [row] = schema.parse(b"1,1.5,2,1\n", select=["total", "id"])
+
+        assert isinstance(row, RowParsed) and isinstance(row.values, CompactValues)
+        assert list(row.values.items()) == [("id", 1), ("total", Decimal("3.0"))]
+
+    def test_selection_is_resolved_once(self):
+        schema = self.build_schema()
+
+        assert schema.select(["id"]) is schema.select(["id"])
+        assert schema.select(None) is schema
+
+    def test_named_columns(self):
+        schema = Schema.build(
+            {
+                "file_type": "csv",
+                "has_header": True,
+                "fields": [
+                    {"key": "id", "type": "int", "column-name": "id"},
+                    {"key": "name", "type": "str", "column-name": "name"},
+                ],
+            }
+        )
+
+        rows = schema.parse(b"name,id\na,1\n", select=["id"])
+
+        assert rows == [RowParsed(row_number=2, values={"id": 1})]
+
+    def test_unknown_builder_dependencies(self):
+        class Upper(Builder):
+            def apply(self, value: dict[str, Any]) -> str:
+                return value["code"].upper()
+
+            @staticmethod
+            def key() -> str:
+                return "upper"
+
+        Builder.register(Upper)
+        schema = self.build_schema(
+            {"computed-fields": [{"key": "upper", "type": "str", "builder": {"name": "upper"}}]},
+        )
+
+        selected = schema.select(["upper"])
+
+        assert [field.key for field in selected.fields] == ["id", "price", "quantity", "code"]
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError, match="cannot select unknown fields: name"):
+            self.build_schema().parse(b"1,1.5,2,1\n", select=["id", "name"])
+
+
+class TestRecordTerminator:
+    def build_schema(self, file_type: str, **options: Any) -> Schema:
+        if file_type == "csv":
+            fields = [
+                {"key": "name", "column-number": 1, "type": "str"},
+                {"key": "id", "column-number": 2, "type": "int"},
+            ]
+            options = {"quotechar": '"'} | options
+        else:
+            fields = [
+                {"key": "name", "column-start": 0, "column-length": 3, "type": "str"},
+                {"key": "id", "column-start": 3, "column-length": 1, "type": "int"},
+            ]
+        return Schema.build({"file_type": file_type, "fields": fields} | options)
+
+    @pytest.mark.parametrize("file_type", ["csv", "columnar"])
+    def test_line_ends(self, file_type: str):
+        data = b"ab1,1\r\nbc2,2\n\r\ncd3,3" if file_type == "csv" else b"ab11\r\nbc22\n\r\ncd33"
+
+        rows = self.build_schema(file_type).parse(data)
+
+        assert rows == [
+            RowParsed(1, {"name": "ab1", "id": 1}),
+            RowParsed(2, {"name": "bc2", "id": 2}),
+            RowParsed(4, {"name": "cd3", "id": 3}),
+        ]
+
+    @pytest.mark.parametrize("file_type", ["csv", "columnar"])
+    @pytest.mark.parametrize("encoding", ["utf-8", "latin-1"])
+    def test_custom_terminator(self, file_type: str, encoding: str):
+        schema = self.build_schema(file_type, **{"record-terminator": "\x1e", "encoding": encoding})
+        data = b'"ab\n",1\x1e"cd\n",2\x1e' if file_type == "csv" else b"ab\n1\x1ecd\n2\x1e"
+        expected = [RowParsed(1, {"name": "ab\n", "id": 1}), RowParsed(2, {"name": "cd\n", "id": 2})]
+
+        assert schema.parse(data) == expected
+        assert list(schema.stream_parse(data, with_offsets=True)) == expected
+        assert schema.parse(data, start_row=2) == expected[1:]
+
+    @pytest.mark.parametrize("quotechar", ['"', None])
+    def test_unquoted_line_ends_in_fields(self, quotechar: str | None):
+        schema = self.build_schema("csv", **{"record-terminator": "\x1e", "quotechar": quotechar})
+        data = b"multi\nline,1\x1ey\r\nz\r,2\x1e"
+        expected = [RowParsed(1, {"name": "multi\nline", "id": 1}), RowParsed(2, {"name": "y\r\nz\r", "id": 2})]
+
+        assert schema.parse(data) == expected
+        assert list(schema.stream_parse(data, with_offsets=True)) == expected
+        assert schema.parse(data, start_row=2) == expected[1:]
+        assert schema.parse("a\ue000\nb,3".encode()) == [RowParsed(1, {"name": "a\ue000\nb", "id": 3})]
+
+    def test_terminator_inside_characters(self):
+        # b"\x81|" is a single character in cp932: records cannot be split at the byte level.
+        schema = self.build_schema("csv", **{"record-terminator": "|", "encoding": "cp932"})
+        data = b"x\x81|,1|y,2"
+        name = b"x\x81|".decode("cp932")
+
+        assert schema.parse(data) == [RowParsed(1, {"name": name, "id": 1}), RowParsed(2, {"name": "y", "id": 2})]
+        with pytest.raises(ValueError, match="encoding 'cp932' cannot be split into records at the byte level"):
+            list(schema.stream_parse(data, with_offsets=True))
+
+    def test_quoted_terminator(self):
+        schema = self.build_schema("csv", **{"record-terminator": "\r\n", "has_header": True})
+
+        rows = schema.parse(b'name,id\r\n"a\r\nb\nc",1\r\n"d""",2')
+
+        assert rows == [RowParsed(2, {"name": "a\r\nb\nc", "id": 1}), RowParsed(3, {"name": 'd"', "id": 2})]
+        assert schema.parse(b'name,id\r\n"a\r\nb\nc",1\r\n"d""",2', start_row=3) == rows[1:]
+
+    @pytest.mark.parametrize("terminator", ["\n", "\x1e"])
+    def test_stray_quote(self, terminator: str):
+        schema = self.build_schema("csv", **{"record-terminator": terminator})
+        data = f'a"b,1{terminator}c,2{terminator}"d{terminator}e",3'.encode()
+        expected = [
+            RowParsed(1, {"name": 'a"b', "id": 1}),
+            RowParsed(2, {"name": "c", "id": 2}),
+            RowParsed(3, {"name": f"d{terminator}e", "id": 3}),
+        ]
+
+        assert schema.parse(data) == expected
+        assert schema.parse(data, start_row=2) == expected[1:]
+
+    @pytest.mark.parametrize("file_type", ["csv", "columnar"])
+    def test_carriage_return_line_ends(self, file_type: str):
+        data = b'ab1,1\r"b\rc",2\rcd3,3\r' if file_type == "csv" else b"ab11\rbc22\r\r\ncd33\r"
+
+        rows = self.build_schema(file_type).parse(data)
+
+        assert [row.row_number for row in rows] == [1, 2, 4] if file_type == "columnar" else [1, 2, 3]
+        assert rows[0] == RowParsed(1, {"name": "ab1", "id": 1})
+        assert rows[-1] == RowParsed(rows[-1].row_number, {"name": "cd3", "id": 3})
+
+    def test_empty_terminator(self):
+        with pytest.raises(ValueError, match="'record-terminator' must not be empty"):
+            self.build_schema("csv", **{"record-terminator": ""})
+
+
+class TestRecordLength:
+    def build_schema(self, **options: Any) -> Schema:
+        return Schema.build(
+            {
+                "file_type": "columnar",
+                "encoding": "cp037",
+                "record-length": 6,
+                "fields": [
+                    {"key": "id", "column-start": 0, "column-length": 2, "type": "int"},
+                    {"key": "name", "column-start": 2, "column-length": 3, "type": "str"},
+                ],
+            }
+            | options
+        )
+
+    DATA = "01abc\n02def\r03ghi 04jkl ".encode("cp037")
+    ROWS = [
+        RowParsed(1, {"id": 1, "name": "abc"}),
+        RowParsed(2, {"id": 2, "name": "def"}),
+        RowParsed(3, {"id": 3, "name": "ghi"}),
+        RowParsed(4, {"id": 4, "name": "jkl"}),
+    ]
+
+    @pytest.mark.parametrize("byte_records", [True, False])
+    def test_parse(self, byte_records: bool):
+        schema = self.build_schema(**{"byte-records": byte_records})
+
+        assert schema.parse(self.DATA) == self.ROWS
+        assert list(schema.stream_parse(self.DATA, with_offsets=True)) == self.ROWS
+
+    def test_utf_8(self):
+        schema = self.build_schema(encoding="utf-8", **{"record-length": 7})
+
+        assert schema.parse("01çà\n02éè\n".encode()) == [
+            RowParsed(1, {"id": 1, "name": "çà\n"}),
+            RowParsed(2, {"id": 2, "name": "éè\n"}),
+        ]
+
+    def test_row_ranges_and_index(self):
+        schema = self.build_schema()
+
+        assert schema.parse(self.DATA, start_row=3) == self.ROWS[2:]
+        assert schema.fetch_rows(self.DATA, [2, 4], schema.build_index(self.DATA, step=3)) == [
+            self.ROWS[1],
+            self.ROWS[3],
+        ]
+        assert list(schema.parallel_parse(self.DATA, parallel=2, chunk_size=7)) == self.ROWS
+
+    def test_header(self):
+        schema = self.build_schema(has_header=True)
+
+        assert schema.parse("ID NM ".encode("cp037") + self.DATA) == [
+            RowParsed(row.row_number + 1, row.values) for row in self.ROWS
+        ]
+
+    def test_short_last_record(self):
+        data = self.DATA + "05m".encode("cp037")
+
+        assert self.build_schema().parse(data)[-1] == RowParsed(5, {"id": 5, "name": "m"})
+        with pytest.raises(ValueError, match="the last record is 3 bytes long, records are 6 bytes long"):
+            self.build_schema(**{"strict-record-length": True}).parse(data)
+
+    @pytest.mark.parametrize(
+        ("options", "message"),
+        [
+            ({"record-length": 0}, "'record-length' must be a positive integer"),
+            ({"record-length": "6"}, "'record-length' must be a positive integer"),
+            ({"record-terminator": "\n"}, "'record-length' and 'record-terminator' cannot be combined"),
+        ],
+    )
+    def test_invalid(self, options: dict[str, Any], message: str):
+        with pytest.raises(ValueError, match=message):
+            self.build_schema(**options)
+
+
+class TestMultiRecord:
+    def build_schema(self, **options: Any) -> Schema:
+        return Schema.build(
+            {
+                "file_type": "multi-record",
+                "discriminator": {"column-start": 0, "column-length": 1},
+                "record-types": {
+                    "H": {"fields": [{"key": "date", "column-start": 1, "column-length": 8, "type": "str"}]},
+                    "D": {
+                        "fields": [
+                            {"key": "code", "column-start": 1, "column-length": 3, "type": "str"},
+                            {"key": "quantity", "column-start": 4, "column-length": 3, "type": "int"},
+                        ],
+                        "computed-fields": [
+                            {
+                                "key": "total",
+                                "type": "int",
+                                "builder": {
+                                    "name": "multiply",
+                                    "parameters": {"x_factor": "quantity", "y_factor": "quantity"},
+                                },
+                            }
+                        ],
+                    },
+                    "T": {"fields": [{"key": "count", "column-start": 1, "column-length": 4, "type": "int"}]},
+                },
+            }
+            | options
+        )
+
+    DATA = b"H20240131\nDabc002\nDdef003\nT0002\n"
+    ROWS = [
+        RowParsed(1, {"record-type": "H", "date": "20240131"}),
+        RowParsed(2, {"record-type": "D", "code": "abc", "quantity": 2, "total": 4}),
+        RowParsed(3, {"record-type": "D", "code": "def", "quantity": 3, "total": 9}),
+        RowParsed(4, {"record-type": "T", "count": 2}),
+    ]
+
+    @pytest.mark.parametrize("byte_records", [True, False])
+    @pytest.mark.parametrize("compile", [False, True])
+    def test_parse(self, byte_records: bool, compile: bool):
+        schema = self.build_schema(**{"byte-records": byte_records, "compile": compile})
+
+        assert isinstance(schema, MultiRecordSchema)
+        assert schema.parse(self.DATA) == self.ROWS
+        ebcdic = self.build_schema(**{"byte-records": byte_records, "encoding": "cp037", "record-terminator": "\n"})
+        assert ebcdic.parse(self.DATA.decode().encode("cp037")) == self.ROWS
+        assert list(schema.parallel_parse(self.DATA * 20, parallel=2, chunk_size=16)) == schema.parse(self.DATA * 20)
+
+    def test_unknown_record_type(self):
+        rows = self.build_schema().parse(b"X123\nT0000\nDabcxyz\n")
+
+        assert rows == [
+            RowFailed(
+                1,
+                [
+                    {
+                        "column-start": 0,
+                        "column-length": 1,
+                        "field-key": "record-type",
+                        "error": "unknown record type 'X'",
+                    }
+                ],
+            ),
+            RowParsed(2, {"record-type": "T", "count": 0}),
+            RowFailed(
+                3,
+                [
+                    {
+                        "column-start": 4,
+                        "column-length": 3,
+                        "field-key": "quantity",
+                        "error": "value 'xyz' is not a valid integer",
+                    }
+                ],
+            ),
+        ]
+
+    def test_record_length_and_row_ranges(self):
+        schema = self.build_schema(
+            **{"record-length": 9, "discriminator": {"key": "type", "column-start": 0, "column-length": 1}}
+        )
+        data = b"H20240131Dabc002  Ddef003  T0002    "
+
+        rows = schema.parse(data)
+
+        assert rows == [
+            RowParsed(1, {"type": "H", "date": "20240131"}),
+            RowParsed(2, {"type": "D", "code": "abc", "quantity": 2, "total": 4}),
+            RowParsed(3, {"type": "D", "code": "def", "quantity": 3, "total": 9}),
+            RowParsed(4, {"type": "T", "count": 2}),
+        ]
+        assert schema.parse(data, start_row=3) == rows[2:]
+        assert schema.fetch_rows(data, [2, 4], schema.build_index(data, step=2)) == [rows[1], rows[3]]
+
+    def test_select(self):
+        rows = self.build_schema().parse(self.DATA, select=["record-type", "total", "count"])
+
+        assert rows == [
+            RowParsed(1, {"record-type": "H"}),
+            RowParsed(2, {"record-type": "D", "total": 4}),
+            RowParsed(3, {"record-type": "D", "total": 9}),
+            RowParsed(4, {"record-type": "T", "count": 2}),
+        ]
+        assert self.build_schema().parse(self.DATA, select=["count"]) == [
+            RowParsed(1, {"record-type": "H"}),
+            RowParsed(2, {"record-type": "D"}),
+            RowParsed(3, {"record-type": "D"}),
+            RowParsed(4, {"record-type": "T", "count": 2}),
+        ]
+        with pytest.raises(ValueError, match="cannot select unknown fields: price"):
+            self.build_schema().parse(self.DATA, select=["price"])
+
+    def test_compact_rows(self):
+        rows = self.build_schema(**{"row-format": "compact"}).parse(self.DATA)
+
+        assert [row.values for row in rows if isinstance(row, RowParsed)] == [row.values for row in self.ROWS]
+
+    def test_pickle(self):
+        schema = self.build_schema(compile=True)
+
+        assert pickle.loads(pickle.dumps(schema)).parse(self.DATA) == self.ROWS
+
+    def test_process_row(self):
+        schema = self.build_schema()
+        selected = schema.select(["total"])
+        detail, trailer = schema.read_record(b"Dabc002"), schema.read_record(b"T0002")
+
+        assert [schema.process_row(detail, 2), schema.process_row(trailer, 4)] == self.ROWS[1::2]
+        assert selected.process_row(detail, 2) == RowParsed(2, {"record-type": "D", "total": 4})
+        schema.compile()
+        assert schema.process_row(detail, 2) == self.ROWS[1]
+
+    def test_invalid_record_type(self):
+        with pytest.raises(ValueError, match="record type 'HD' is not 1 characters long"):
+            self.build_schema(**{"record-types": {"HD": {"fields": []}}})
+
+    def test_no_column_batches(self):
+        with pytest.raises(ValueError, match="rows of several record types do not share their columns"):
+            next(self.build_schema().stream_parse_arrays(self.DATA))
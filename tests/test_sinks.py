@@ -0,0 +1,149 @@
+import json
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import magicparse
+from magicparse import CsvSink, NdjsonSink, ParquetSink, Schema, WrittenRows
+from magicparse.schema import RowFailed, RowParsed, RowSkipped
+
+
+FIELDS: list[dict[str, Any]] = [
+    {"key": "ean", "column-number": 1, "type": "str"},
+    {
+        "key": "price",
+        "column-number": 2,
+        "type": "decimal",
+        "validators": [{"name": "greater-than", "parameters": {"threshold": 0}, "on-error": "skip-row"}],
+    },
+    {"key": "sold-at", "column-number": 3, "type": "datetime", "optional": True},
+]
+DATA = b"a;1.50;2024-03-01T10:00:00+02:00\nb;x;\nc;-1;\nd;3;\n"
+
+
+def build_schema(**options: Any) -> Schema:
+    return Schema.build({"file_type": "csv", "delimiter": ";", "fields": FIELDS} | options)
+
+
+def read_lines(path: Path) -> list[Any]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_convert_to_ndjson(tmp_path: Path):
+    with (
+        NdjsonSink(tmp_path / "parsed.ndjson") as parsed,
+        NdjsonSink(tmp_path / "failed.ndjson") as failed,
+        NdjsonSink(tmp_path / "skipped.ndjson") as skipped,
+    ):
+        written = build_schema().convert(DATA, parsed, failed, skipped)
+
+    assert written == WrittenRows(parsed=2, failed=1, skipped=1)
+    assert read_lines(tmp_path / "parsed.ndjson") == [
+        {"ean": "a", "price": "1.50", "sold-at": "2024-03-01T10:00:00+02:00"},
+        {"ean": "d", "price": "3", "sold-at": None},
+    ]
+    assert read_lines(tmp_path / "failed.ndjson") == [
+        {
+            "row_number": 2,
+            "errors": [{"column-number": 2, "field-key": "price", "error": "value 'x' is not a valid decimal"}],
+        }
+    ]
+    assert read_lines(tmp_path / "skipped.ndjson") == [
+        {
+            "row_number": 3,
+            "errors": [{"column-number": 2, "field-key": "price", "error": "value must be greater than 0"}],
+        }
+    ]
+
+
+def test_compact_rows(tmp_path: Path):
+    with NdjsonSink(tmp_path / "parsed.ndjson") as parsed:
+        build_schema(**{"row-format": "compact"}).convert(DATA, parsed)
+
+    assert [row["ean"] for row in read_lines(tmp_path / "parsed.ndjson")] == ["a", "d"]
+
+
+def test_convert_to_csv(tmp_path: Path):
+    options = {"file_type": "csv", "delimiter": ";", "fields": FIELDS}
+
+    with CsvSink(tmp_path / "parsed.csv") as parsed, CsvSink(tmp_path / "failed.csv", delimiter="|") as failed:
+        written = magicparse.convert(DATA, options, parsed, failed)
+
+    assert written == WrittenRows(parsed=2, failed=1, skipped=1)
+    assert (tmp_path / "parsed.csv").read_bytes() == (
+        b"ean,price,sold-at\r\na,1.50,2024-03-01T10:00:00+02:00\r\nd,3,\r\n"
+    )
+    assert (tmp_path / "failed.csv").read_bytes() == (
+        b"row_number|errors\r\n"
+        b'2|"[{""column-number"": 2, ""field-key"": ""price"", ""error"": ""value \'x\' is not a valid decimal""}]"\r\n'
+    )
+
+
+def test_csv_fieldnames(tmp_path: Path):
+    with CsvSink(tmp_path / "parsed.csv", fieldnames=["price", "ean"]) as parsed:
+        build_schema().convert(DATA, parsed)
+
+    assert (tmp_path / "parsed.csv").read_bytes() == b"price,ean\r\n1.50,a\r\n3,d\r\n"
+
+
+def numbered_rows(count: int) -> list[RowParsed]:
+    return [RowParsed(number, {"number": number}) for number in range(1, count + 1)]
+
+
+class TestRotation:
+    def test_by_row_count(self, tmp_path: Path):
+        with NdjsonSink(tmp_path / "rows-{index}.ndjson", max_rows=2, buffer_size=10) as sink:
+            for row in numbered_rows(5):
+                sink.write(row)
+
+        assert [path.name for path in sink.paths] == ["rows-0.ndjson", "rows-1.ndjson", "rows-2.ndjson"]
+        assert [len(read_lines(path)) for path in sink.paths] == [2, 2, 1]
+
+    def test_by_size(self, tmp_path: Path):
+        with CsvSink(tmp_path / "rows-{index}.csv", max_bytes=20, buffer_size=2) as sink:
+            for row in numbered_rows(7):
+                sink.write(row)
+
+        assert [path.read_text().split() for path in sink.paths] == [
+            ["number", "1", "2", "3", "4"],
+            ["number", "5", "6", "7"],
+        ]
+
+    def test_no_empty_file(self, tmp_path: Path):
+        with NdjsonSink(tmp_path / "rows-{index}.ndjson", max_rows=2) as sink:
+            for row in numbered_rows(4):
+                sink.write(row)
+
+        assert len(sink.paths) == 2
+
+    def test_index_required(self, tmp_path: Path):
+        with pytest.raises(ValueError, match="a rotating sink's path must contain an '{index}' placeholder"):
+            NdjsonSink(tmp_path / "rows.ndjson", max_rows=10)
+
+
+def test_parquet(tmp_path: Path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    schema = build_schema()
+
+    with (
+        ParquetSink(tmp_path / "parsed-{index}.parquet", schema, max_rows=1) as parsed,
+        ParquetSink(tmp_path / "rejected.parquet") as rejected,
+    ):
+        schema.convert(DATA, parsed, rejected, rejected)
+
+    assert [pq.read_table(path).column("price").to_pylist() for path in parsed.paths] == [
+        [Decimal("1.500000000")],
+        [Decimal("3.000000000")],
+    ]
+    assert pq.read_table(tmp_path / "rejected.parquet").column("row_number").to_pylist() == [2, 3]
+
+
+def test_rows_without_sink_are_dropped(tmp_path: Path):
+    with NdjsonSink(tmp_path / "skipped.ndjson") as skipped:
+        written = build_schema().convert(DATA, skipped=skipped)
+
+    assert written == WrittenRows(parsed=2, failed=1, skipped=1)
+    assert [row["row_number"] for row in read_lines(tmp_path / "skipped.ndjson")] == [3]
+    assert [type(row) for row in build_schema().parse(DATA)] == [RowParsed, RowFailed, RowSkipped, RowParsed]
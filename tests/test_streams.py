@@ -0,0 +1,179 @@
+import bz2
+import gzip
+import lzma
+import os
+import threading
+from collections.abc import Callable
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import magicparse
+from magicparse import Schema
+from magicparse.schema import RowParsed
+from magicparse.streams import DecompressedStream, detect_compression, open_stream
+
+COLUMNAR_OPTIONS: dict[str, Any] = {
+    "file_type": "columnar",
+    "fields": [
+        {"key": "id", "type": "int", "column-start": 0, "column-length": 3},
+        {"key": "label", "type": "str", "column-start": 3, "column-length": 4},
+    ],
+}
+
+
+def test_open_stream_with_bytes():
+    with open_stream(b"abc") as stream:
+        assert stream.read() == b"abc"
+
+
+def test_open_stream_maps_file(tmp_path: Path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"abc\ndef\n")
+    with open_stream(path) as stream:
+        assert stream.readline() == b"abc\n"
+        assert stream.read() == b"def\n"
+
+
+def test_parse_path(tmp_path: Path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"001abcd\n002efgh\n")
+
+    rows = Schema.build(COLUMNAR_OPTIONS).parse(str(path))
+
+    assert rows == [
+        RowParsed(row_number=1, values={"id": 1, "label": "abcd"}),
+        RowParsed(row_number=2, values={"id": 2, "label": "efgh"}),
+    ]
+
+
+def test_parse_file_descriptor_is_left_open(tmp_path: Path):
+    path = tmp_path / "data.csv"
+    path.write_bytes("name\nJosé\n".encode("utf-8"))
+    schema = Schema.build(
+        {"file_type": "csv", "has_header": True, "fields": [{"key": "name", "type": "str", "column-number": 1}]}
+    )
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        assert schema.parse(fd) == [RowParsed(row_number=2, values={"name": "José"})]
+        os.fstat(fd)
+    finally:
+        os.close(fd)
+
+
+def test_parse_empty_file(tmp_path: Path):
+    path = tmp_path / "empty.txt"
+    path.touch()
+    assert Schema.build(COLUMNAR_OPTIONS).parse(path) == []
+
+
+def test_top_level_parse_path(tmp_path: Path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"001abcd\n")
+    assert magicparse.parse(path, COLUMNAR_OPTIONS) == [RowParsed(row_number=1, values={"id": 1, "label": "abcd"})]
+
+
+def test_parallel_parse_path(tmp_path: Path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"".join(f"{i:03}abcd\n".encode() for i in range(50)))
+    schema = Schema.build(COLUMNAR_OPTIONS)
+    assert list(schema.parallel_parse(path, parallel=2, chunk_size=64)) == schema.parse(path)
+
+
+def compress(data: bytes, compression: str) -> bytes:
+    match compression:
+        case "gzip":
+            return gzip.compress(data)
+        case "bz2":
+            return bz2.compress(data)
+        case "xz":
+            return lzma.compress(data)
+        case _:
+            zstandard = pytest.importorskip("zstandard")
+            return zstandard.ZstdCompressor().compress(data)
+
+
+COMPRESSIONS = ["gzip", "bz2", "xz", "zstd"]
+ROWS = b"".join(f"{i:03}abcd\n".encode() for i in range(300))
+
+
+class TestCompressed:
+    @pytest.mark.parametrize("compression", COMPRESSIONS)
+    @pytest.mark.parametrize("background", [False, True])
+    def test_parse(self, tmp_path: Path, compression: str, background: bool):
+        path = tmp_path / "data.txt.compressed"
+        path.write_bytes(compress(ROWS, compression))
+        schema = Schema.build(COLUMNAR_OPTIONS | {"background-decompression": background})
+
+        assert schema.parse(path) == schema.parse(ROWS)
+
+    @pytest.mark.parametrize("compression", COMPRESSIONS)
+    def test_detect_compression(self, compression: str):
+        assert detect_compression(compress(b"", compression)[:10]) == compression
+        assert detect_compression(compress(ROWS, compression)[:10]) == compression
+
+    def test_plain_text_starting_like_bzip2(self):
+        assert detect_compression(b"BZh91;abcd") is None
+
+    def test_blocks_and_members(self):
+        data = gzip.compress(ROWS[:1000]) + b"\0\0\0\0" + gzip.compress(ROWS[1000:])
+        stream = DecompressedStream(BytesIO(data), "gzip", block_size=7)
+
+        assert stream.readall() == ROWS
+
+    @pytest.mark.parametrize("background", [False, True])
+    def test_seek(self, background: bool):
+        stream = DecompressedStream(BytesIO(gzip.compress(ROWS)), "gzip", background, block_size=64)
+
+        assert stream.seek(800) == 800
+        assert stream.read(8) == ROWS[800:808]
+        assert stream.seek(8) == 8
+        assert stream.read(8) == ROWS[8:16]
+        assert stream.seek(-8, os.SEEK_END) == len(ROWS) - 8
+        assert stream.read() == ROWS[-8:]
+        stream.close()
+
+    @pytest.mark.parametrize("background", [False, True])
+    def test_truncated(self, background: bool):
+        schema = Schema.build(COLUMNAR_OPTIONS | {"background-decompression": background})
+
+        with pytest.raises(ValueError, match="gzip content ended before the end of its last member"):
+            schema.parse(gzip.compress(ROWS)[:-20])
+
+    def test_resume_and_row_ranges(self):
+        schema = Schema.build(COLUMNAR_OPTIONS)
+        data = compress(ROWS, "xz")
+        rows = schema.parse(ROWS)
+
+        [*_, row] = schema.stream_parse(data, with_offsets=True, stop_row=101)
+        assert row.offset is not None
+
+        assert list(schema.stream_parse(data, resume_from=magicparse.Checkpoint(row.offset, 100))) == rows[99:]
+        assert schema.parse(data, start_row=250, limit=2) == rows[249:251]
+        assert schema.fetch_rows(data, [3, 299], schema.build_index(data, step=16)) == [rows[2], rows[298]]
+
+    def test_stop_parsing_early(self):
+        schema = Schema.build(COLUMNAR_OPTIONS | {"background-decompression": True})
+        rows = schema.stream_parse(gzip.compress(ROWS * 100))
+
+        assert next(iter(rows)).row_number == 1
+        del rows
+        assert not any(thread.name == "magicparse-decompression" for thread in threading.enumerate())
+
+
+@pytest.mark.parametrize("compress", [bytes, gzip.compress])
+def test_parse_pipe(compress: Callable[[bytes], bytes]):
+    read, write = os.pipe()
+    try:
+        os.write(write, compress(b"001abcd\n002efgh\n"))
+        os.close(write)
+
+        assert Schema.build(COLUMNAR_OPTIONS).parse(read) == [
+            RowParsed(row_number=1, values={"id": 1, "label": "abcd"}),
+            RowParsed(row_number=2, values={"id": 2, "label": "efgh"}),
+        ]
+    finally:
+        os.close(read)
@@ -1,3 +1,5 @@
+import pickle
+from dataclasses import FrozenInstanceError
 from datetime import datetime, time, timedelta, timezone
 from decimal import Decimal
 from typing import Any
@@ -6,6 +8,7 @@ from uuid import UUID
 
 import pytest
 
+from magicparse.transform import Failure, OnError, checker
 from magicparse.type_converters import (
     DateTimeConverter,
     DecimalConverter,
@@ -152,3 +155,45 @@ class TestNullableField(TestCase):
     def test_datetime(self):
         type_converter = TypeConverter.build({"type": {"key": "datetime", "nullable": True}})
         assert type_converter.apply(None) is None
+
+
+class TestCheck(TestCase):
+    def test_valid_value(self):
+        assert TypeConverter.build({"type": "int"}).check("12") == 12
+
+    def test_invalid_value_is_returned_as_failure(self):
+        failure = TypeConverter.build({"type": "int"}).check("x")
+
+        assert failure == Failure("invalid-integer", "value '{value}' is not a valid integer", {"value": "x"})
+        assert isinstance(failure, Failure) and failure.message() == "value 'x' is not a valid integer"
+
+    def test_non_nullable(self):
+        failure = TypeConverter.build({"type": "decimal"}).check(None)
+        assert isinstance(failure, Failure) and failure.code == "non-nullable"
+
+    def test_shared_failures_are_read_only(self):
+        failure = TypeConverter.build({"type": "decimal"}).check(None)
+        assert isinstance(failure, Failure)
+
+        with pytest.raises(FrozenInstanceError):
+            failure.code = "changed"  # type: ignore[misc]
+        with pytest.raises(TypeError):
+            failure.params["key"] = "changed"  # type: ignore[index]
+        assert TypeConverter.build({"type": "int"}).check(None) == Failure("non-nullable", "type is non nullable", {})
+
+    def test_failure_pickling(self):
+        failure = TypeConverter.build({"type": "int"}).check("x")
+
+        assert pickle.loads(pickle.dumps(failure)) == failure
+
+    def test_naive_datetime(self):
+        failure = TypeConverter.build({"type": "datetime"}).check("2022-01-12T10:12:03")
+        assert isinstance(failure, Failure) and failure.code == "invalid-datetime"
+
+    def test_subclass_overriding_convert_is_not_checked(self):
+        class LenientInt(IntConverter):
+            def convert(self, value: str) -> int:
+                return 0
+
+        converter = LenientInt(nullable=False, on_error=OnError.RAISE)
+        assert checker(converter)("x") == 0